@@ -47,11 +47,14 @@ from .model import (
     Model,
     SimpleModel,
     ModelResult,
-    IntegratedModel)
+    IntegratedModel,
+    StreamingModel)
+from .cache import SimulationCache
 from .transition import (
     MultivariateNormalTransition,
     LocalTransition,
     DiscreteRandomWalkTransition,
+    GaussianMixtureTransition,
     GridSearchCV)
 from .populationstrategy import (
     AdaptivePopulationSize,
@@ -96,6 +99,7 @@ __all__ = [
     "MultivariateNormalTransition",
     "LocalTransition",
     "DiscreteRandomWalkTransition",
+    "GaussianMixtureTransition",
     "GridSearchCV",
     # acceptor
     "Acceptor",
@@ -107,6 +111,9 @@ __all__ = [
     "Model",
     "SimpleModel",
     "IntegratedModel",
+    "StreamingModel",
+    # cache
+    "SimulationCache",
     # history
     "History",
     # visualization
@@ -14,6 +14,10 @@ when the distance measure and epsilon criteria develop over
 time.
 """
 
+import inspect
+
+import numpy as np
+
 
 class Acceptor:
     """
@@ -80,7 +84,9 @@ class SimpleAcceptor(Acceptor):
 
     fun: Callable, optional
         Callable with the same signature as the __call__ method. Per default,
-        accept_use_current_time is used.
+        accept_use_current_time is used. If it takes a ``criteria_cache``
+        keyword argument, as accept_use_complete_history, a cache owned by
+        this acceptor is passed.
     """
     def __init__(self, fun=None):
         super().__init__()
@@ -89,7 +95,16 @@ class SimpleAcceptor(Acceptor):
             fun = accept_use_current_time
         self.fun = fun
 
+        try:
+            parameters = inspect.signature(fun).parameters
+        except (TypeError, ValueError):
+            parameters = {}
+        self._criteria_cache = {} if "criteria_cache" in parameters else None
+
     def __call__(self, t, distance_function, eps, x, x_0):
+        if self._criteria_cache is not None:
+            return self.fun(t, distance_function, eps, x, x_0,
+                            criteria_cache=self._criteria_cache)
         return self.fun(t, distance_function, eps, x, x_0)
 
     @staticmethod
@@ -126,7 +141,8 @@ def accept_use_current_time(t, distance_function, eps, x, x_0):
     return d, accept
 
 
-def accept_use_complete_history(t, distance_function, eps, x, x_0):
+def accept_use_complete_history(t, distance_function, eps, x, x_0,
+                                criteria_cache: dict = None):
     """
     Use the acceptance criteria from the complete history to evaluate whether
     to accept or reject.
@@ -137,22 +153,61 @@ def accept_use_complete_history(t, distance_function, eps, x, x_0):
     intercepted and the respective time not used for evaluation. This situation
     can frequently occur when continuing a stopped run. A different behavior
     is easy to implement.
+
+    The previous distances are evaluated at once via
+    ``distance_function.at_times``. The epsilons of the previous time
+    points are stored in ``criteria_cache`` if given, which the
+    :class:`SimpleAcceptor` does, such that they are computed only once
+    per time point t.
     """
 
     # first test current criterion, which is most likely to fail
     d = distance_function(t, x, x_0)
     accept = d <= eps(t)
 
-    if accept:
+    if accept and t > 0:
         # also check against all previous distances and acceptance criteria
-        for t_prev in range(0, t):
-            try:
-                d_prev = distance_function(t_prev, x, x_0)
-                accept = d_prev <= eps(t_prev)
-                if not accept:
-                    break
-            except Exception:
-                # ignore as of now
-                accept = True
+        ts_prev, eps_prev = _previous_criteria(t, eps, criteria_cache)
+        try:
+            d_prev = distance_function.at_times(ts_prev, x, x_0)
+        except Exception:
+            d_prev = np.array(
+                [_distance_or_nan(distance_function, t_prev, x, x_0)
+                 for t_prev in ts_prev], dtype=float)
+        # distances which could not be evaluated are ignored
+        accept = not np.any(d_prev > eps_prev)
 
     return d, accept
+
+
+def _previous_criteria(t, eps, cache: dict = None):
+    """
+    Time points before t for which an epsilon is available, and the
+    corresponding epsilons. If a cache is given, they are stored in it for
+    the last queried combination of time point and epsilon.
+    """
+    if cache is not None and cache.get("t") == t \
+            and cache.get("eps") is eps:
+        return cache["criteria"]
+
+    ts_prev, eps_prev = [], []
+    for t_prev in range(0, t):
+        try:
+            eps_prev.append(eps(t_prev))
+            ts_prev.append(t_prev)
+        except Exception:
+            # ignore as of now
+            pass
+    criteria = ts_prev, np.array(eps_prev, dtype=float)
+
+    if cache is not None:
+        cache.update(t=t, eps=eps, criteria=criteria)
+    return criteria
+
+
+def _distance_or_nan(distance_function, t, x, x_0):
+    try:
+        return distance_function(t, x, x_0)
+    except Exception:
+        # ignore as of now
+        return np.nan
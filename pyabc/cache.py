@@ -0,0 +1,293 @@
+"""
+Simulation cache
+================
+
+Cache of the summary statistics simulated by deterministic models.
+
+With discrete parameters, e.g. when using the
+:class:`pyabc.transition.DiscreteRandomWalkTransition`, or coarse
+parameter grids, the same parameters are proposed many times. For models
+declared deterministic, see :attr:`pyabc.Model.deterministic`, the
+simulations can then be looked up instead of being repeated, by passing
+a :class:`SimulationCache` to :class:`pyabc.ABCSMC`.
+"""
+
+import hashlib
+import numbers
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import List
+
+from .model import Model, ModelResult
+from .parameters import Parameter
+
+
+class SimulationCache:
+    """
+    A bounded least recently used (LRU) cache of summary statistics,
+    indexed by the model index and a hash of the parameter.
+
+    The summary statistics are stored pickled. Once the stored bytes exceed
+    ``max_bytes``, the least recently used entries are evicted.
+
+    Per default, the cache is held in memory. As workers of the
+    multiprocessing samplers are forked from the main process, they then
+    work on copies of the cache, and new entries do not reach the other
+    workers or later generations. Pass a ``path`` to instead store the
+    cache in an SQLite file, which is shared by all processes on the
+    machine, and persists between runs. Do not reuse such a file for
+    different models.
+
+    Parameters
+    ----------
+
+    max_bytes: int, optional (default = 100 MB)
+        The maximum size of the stored summary statistics in bytes.
+
+    path: str, optional
+        The file in which to store the cache. If None, the cache is held
+        in memory.
+    """
+
+    def __init__(self, max_bytes: int = 100 * 2**20, path: str = None):
+        self.max_bytes = max_bytes
+        self.path = path
+        # in-memory storage, key -> pickled summary statistics
+        self._entries = OrderedDict()
+        self._n_bytes = 0
+        # connection to the file, opened per process
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+        return state
+
+    @staticmethod
+    def key(m: int, parameter: dict) -> str:
+        """
+        The key of the parameter of model m. Numeric values are compared as
+        floats, such that e.g. proposals of integer parameters hit the
+        cache irrespective of their type.
+        """
+        items = sorted(
+            (key, float(value)) if isinstance(value, numbers.Real)
+            else (key, value)
+            for key, value in dict(parameter).items())
+        digest = hashlib.sha1(pickle.dumps(items)).hexdigest()
+        return f"{m}:{digest}"
+
+    def get(self, key: str):
+        """
+        The cached summary statistics for the key, or None if there
+        are none.
+        """
+        if self.path is not None:
+            value = self._get_from_file(key)
+        else:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def put(self, key: str, sum_stats: dict):
+        """
+        Store the summary statistics for the key, evicting the least
+        recently used entries if the cache is full. Summary statistics
+        larger than the cache are not stored.
+        """
+        value = pickle.dumps(sum_stats)
+        if len(value) > self.max_bytes:
+            return
+        if self.path is not None:
+            self._put_to_file(key, value)
+            return
+        if key in self._entries:
+            self._n_bytes -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self._n_bytes += len(value)
+        while self._n_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._n_bytes -= len(evicted)
+
+    def __len__(self):
+        if self.path is not None:
+            return self._execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return len(self._entries)
+
+    def _execute(self, *args):
+        # one connection per process, as connections must not be shared
+        # with forked processes
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(
+                self.path, timeout=60, isolation_level=None)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, "
+                "access REAL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_access ON cache (access)")
+            self._pid = os.getpid()
+        return self._connection.execute(*args)
+
+    def _get_from_file(self, key: str):
+        row = self._execute(
+            "SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._execute("UPDATE cache SET access = ? WHERE key = ?",
+                      (time.time(), key))
+        return row[0]
+
+    def _put_to_file(self, key: str, value: bytes):
+        self._execute("BEGIN IMMEDIATE")
+        try:
+            self._execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()))
+            n_bytes = self._execute(
+                "SELECT SUM(size) FROM cache").fetchone()[0]
+            if n_bytes > self.max_bytes:
+                evicted = []
+                for evicted_key, size in self._execute(
+                        "SELECT key, size FROM cache "
+                        "ORDER BY access").fetchall():
+                    if n_bytes <= self.max_bytes:
+                        break
+                    evicted.append((evicted_key,))
+                    n_bytes -= size
+                self._connection.executemany(
+                    "DELETE FROM cache WHERE key = ?", evicted)
+            self._execute("COMMIT")
+        except BaseException:
+            self._execute("ROLLBACK")
+            raise
+
+
+class CachedModel(Model):
+    """
+    Wraps a deterministic model such that its summary statistics are
+    looked up in a :class:`SimulationCache` before simulating.
+
+    The distance and the acceptance are evaluated anew for cached summary
+    statistics. Each evaluation records the counter ``cache_hits`` or
+    ``cache_misses``, see :meth:`pyabc.History.get_population_counters`.
+    Models evaluating the acceptance on their own, e.g. the
+    :class:`pyabc.IntegratedModel`, are only cached where they compute
+    summary statistics.
+
+    Parameters
+    ----------
+
+    model: Model
+        The wrapped model.
+
+    m: int
+        The index of the model, as part of the cache key.
+
+    cache: SimulationCache
+        The cache.
+    """
+
+    def __init__(self, model: Model, m: int, cache: SimulationCache):
+        super().__init__(model.name)
+        self.model = model
+        self.m = m
+        self.cache = cache
+        self.supports_batch = model.supports_batch
+        self.deterministic = model.deterministic
+
+    def sample(self, pars):
+        return self.model.sample(pars)
+
+    def sample_batch(self, pars):
+        return self.model.sample_batch(pars)
+
+    def summary_statistics(self,
+                           t,
+                           pars,
+                           sum_stats_calculator) -> ModelResult:
+        key = self.cache.key(self.m, pars)
+        sum_stats = self.cache.get(key)
+        if sum_stats is not None:
+            return ModelResult(sum_stats=sum_stats,
+                               counters={"cache_hits": 1})
+        result = self.model.summary_statistics(t, pars, sum_stats_calculator)
+        self.cache.put(key, result.sum_stats)
+        result.counters = _with_miss(result.counters)
+        return result
+
+    def summary_statistics_batch(self,
+                                 t,
+                                 pars: List[Parameter],
+                                 sum_stats_calculator) -> List[ModelResult]:
+        keys = [self.cache.key(self.m, par) for par in pars]
+        results = []
+        missing = {}
+        for j, key in enumerate(keys):
+            sum_stats = self.cache.get(key)
+            if sum_stats is not None:
+                results.append(ModelResult(sum_stats=sum_stats,
+                                           counters={"cache_hits": 1}))
+            else:
+                results.append(None)
+                # simulate repeated parameters only once
+                missing.setdefault(key, []).append(j)
+        if missing:
+            simulated = self.model.summary_statistics_batch(
+                t, [pars[indices[0]] for indices in missing.values()],
+                sum_stats_calculator)
+            for (key, indices), result in zip(missing.items(), simulated):
+                self.cache.put(key, result.sum_stats)
+                result.counters = _with_miss(result.counters)
+                results[indices[0]] = result
+                for j in indices[1:]:
+                    results[j] = ModelResult(sum_stats=result.sum_stats,
+                                             counters={"cache_hits": 1})
+        return results
+
+    def accept(self,
+               t,
+               pars,
+               sum_stats_calculator,
+               distance_calculator,
+               eps_calculator,
+               acceptor,
+               x_0):
+        if type(self.model).accept is not Model.accept:
+            # the model does not evaluate via its summary statistics
+            return self.model.accept(t, pars, sum_stats_calculator,
+                                     distance_calculator, eps_calculator,
+                                     acceptor, x_0)
+        return super().accept(t, pars, sum_stats_calculator,
+                              distance_calculator, eps_calculator,
+                              acceptor, x_0)
+
+    def accept_batch(self,
+                     t,
+                     pars: List[Parameter],
+                     sum_stats_calculator,
+                     distance_calculator,
+                     eps_calculator,
+                     acceptor,
+                     x_0) -> List[ModelResult]:
+        if type(self.model).accept_batch is not Model.accept_batch:
+            return self.model.accept_batch(t, pars, sum_stats_calculator,
+                                           distance_calculator,
+                                           eps_calculator, acceptor, x_0)
+        return super().accept_batch(t, pars, sum_stats_calculator,
+                                    distance_calculator, eps_calculator,
+                                    acceptor, x_0)
+
+
+def _with_miss(counters: dict) -> dict:
+    counters = dict(counters) if counters else {}
+    counters["cache_misses"] = counters.get("cache_misses", 0) + 1
+    return counters
@@ -27,6 +27,8 @@ from .scales import (median_absolute_deviation,
                      combined_mean_absolute_deviation,
                      standard_deviation_to_observation)
 
+from .streaming_scales import StreamingScaleEstimator
+
 __all__ = [
     # distances
     "DistanceFunction",
@@ -51,5 +53,7 @@ __all__ = [
     "mean_absolute_deviation_to_observation",
     "combined_median_absolute_deviation",
     "combined_mean_absolute_deviation",
-    "standard_deviation_to_observation"
+    "standard_deviation_to_observation",
+    # streaming scales
+    "StreamingScaleEstimator",
 ]
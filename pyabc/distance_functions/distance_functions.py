@@ -7,15 +7,20 @@ For custom distance functions, either pass a plain function to ABCSMC or
 subclass the DistanceFunction class if finer grained configuration is required.
 """
 
+import functools
 import json
+import operator
 import scipy as sp
 import numpy as np
 from scipy import linalg as la
 from abc import ABC, abstractmethod
 from typing import List
 import logging
+import warnings
 from ..sampler import Sampler
-from .scales import standard_deviation
+from .scales import standard_deviation, COLUMN_WISE_SCALE_FUNCTIONS
+from .streaming_scales import (StreamingScaleEstimator,
+                               STREAMING_SCALE_FUNCTIONS)
 
 
 logger = logging.getLogger("DistanceFunction")
@@ -94,7 +99,8 @@ class DistanceFunction(ABC):
 
     def update(self,  # pylint: disable=R0201
                t: int,
-               all_sum_stats: List[dict]) -> bool:
+               all_sum_stats: List[dict],
+               sum_stats_estimator=None) -> bool:
         """
         Update the distance function. Default: Do nothing.
 
@@ -108,6 +114,12 @@ class DistanceFunction(ABC):
             List of all summary statistics that should be used to update the
             distance (in particular also rejected ones).
 
+        sum_stats_estimator: optional
+            If the distance function configured the sampler to condense
+            the summary statistics into an estimator while sampling (see
+            ``configure_sampler``), the merged estimator of all samples.
+            Only passed in that case.
+
         Returns
         -------
 
@@ -149,6 +161,108 @@ class DistanceFunction(ABC):
             from the measured data.
         """
 
+    def batch(self,
+              t: int,
+              X: List[dict],
+              x_0: dict) -> np.ndarray:
+        """
+        Evaluate, at time point t, the distances of several sampled
+        summary statistics to the measured data at once.
+
+        The default implementation calls the distance function once per
+        summary statistic. Subclasses may override this to compute all
+        distances on a stacked array of the summary statistics.
+
+        Parameters
+        ----------
+
+        t: int
+            Time point at which to evaluate the distances.
+
+        X: List[dict]
+            Summary statistics of the sampled parameters.
+
+        x_0: dict
+            Summary statistics of the measured data.
+
+        Returns
+        -------
+
+        distances: np.ndarray
+            The distances of the summary statistics in X from the measured
+            data, in the order of X.
+        """
+        return np.array([self(t, x, x_0) for x in X], dtype=float)
+
+    def lower_bound(self,
+                    t: int,
+                    x: dict,
+                    x_0: dict) -> float:
+        """
+        Lower bound of the distance at time point t of any summary
+        statistics extending the partial summary statistics x, i.e. which
+        agree with x on the keys of x.
+
+        The bound must be monotone: adding summary statistics to x must
+        not decrease it. This allows to abort simulations producing their
+        summary statistics in chunks, see
+        :class:`pyabc.model.StreamingModel`, as soon as the bound exceeds
+        the acceptance threshold.
+
+        The default implementation returns the trivial bound 0.
+
+        Parameters
+        ----------
+
+        t: int
+            Time point at which to evaluate the bound.
+
+        x: dict
+            The summary statistics available so far.
+
+        x_0: dict
+            Summary statistics of the measured data.
+
+        Returns
+        -------
+
+        bound: float
+            A lower bound of the distance.
+        """
+        return 0.
+
+    def at_times(self,
+                 ts: List[int],
+                 x: dict,
+                 x_0: dict) -> np.ndarray:
+        """
+        Evaluate the distance of a single sampled summary statistic to the
+        measured data at several time points at once, e.g. to check the
+        acceptance criteria of previous generations.
+
+        The default implementation calls the distance function once per
+        time point.
+
+        Parameters
+        ----------
+
+        ts: List[int]
+            Time points at which to evaluate the distance.
+
+        x: dict
+            Summary statistics of the sampled parameter.
+
+        x_0: dict
+            Summary statistics of the measured data.
+
+        Returns
+        -------
+
+        distances: np.ndarray
+            The distances at the time points ts.
+        """
+        return np.array([self(t, x, x_0) for t in ts], dtype=float)
+
     def get_config(self) -> dict:
         """
         Return configuration of the distance function.
@@ -297,10 +411,145 @@ class PNormDistance(DistanceFunction):
 
         self.w = w
 
+        # fixed summary statistic layout per time point, see _compile
+        self._compiled = {}
+        # stacked layout for several time points, see _compile_times
+        self._compiled_times = None
+        # last stacked summary statistics matrix, see batch
+        self._stacked = None
+
+    def __getstate__(self):
+        # the stacked matrix is not sent to the workers
+        state = self.__dict__.copy()
+        state["_stacked"] = None
+        return state
+
     def __call__(self,
                  t: int,
                  x: dict,
                  x_0: dict) -> float:
+        # extract compiled weights and observed data for time point
+        getter, keys, w, x_0_arr = self._compile_for(t, x, x_0)
+
+        # compute distance
+        x_arr = self._to_array(x, getter, keys, x_0)
+        return self._norm(w * (x_arr - x_0_arr))
+
+    def batch(self,
+              t: int,
+              X: List[dict],
+              x_0: dict) -> np.ndarray:
+        if len(X) == 0:
+            return np.empty(0)
+
+        getter, keys, w, x_0_arr = self._compile_for(t, X[0], x_0)
+        # the matrix is kept as long as the same list of summary
+        # statistics, e.g. of a population, is passed in the same layout
+        stacked = self._stacked
+        if stacked is not None and stacked[0] is X and stacked[1] is x_0 \
+                and stacked[2] == keys:
+            X_arr = stacked[3]
+        else:
+            X_arr = self._stack(X, getter, keys, x_0)
+            self._stacked = (X, x_0, keys, X_arr)
+        return self._norm(w * (X_arr - x_0_arr))
+
+    def lower_bound(self,
+                    t: int,
+                    x: dict,
+                    x_0: dict) -> float:
+        """
+        Summary statistics missing in x do not contribute to the p-norm,
+        and every summary statistic adds a non-negative term, thus the
+        distance of the partial summary statistics is a monotone lower
+        bound.
+        """
+        if self.w is None:
+            # do not initialize the weights from the partial keys
+            self._set_default_weights(t, x_0.keys())
+        return self(t, x, x_0)
+
+    @staticmethod
+    def _stack(X: List[dict], getter, keys, x_0: dict) -> np.ndarray:
+        """
+        Stack the summary statistics X into an (n_samples, n_stats) matrix
+        according to the compiled layout.
+        """
+        if getter is not None:
+            # fast path for scalar summary statistics all present
+            try:
+                X_arr = np.array([getter(x) for x in X], dtype=float)
+                if X_arr.shape == (len(X), len(keys)):
+                    return X_arr
+            except (KeyError, TypeError, ValueError):
+                pass
+        X_arr = None
+        for j, x in enumerate(X):
+            x_arr = PNormDistance._to_array(x, getter, keys, x_0)
+            if X_arr is None:
+                X_arr = np.empty((len(X), len(x_arr)))
+            X_arr[j] = x_arr
+        return X_arr
+
+    def at_times(self,
+                 ts: List[int],
+                 x: dict,
+                 x_0: dict) -> np.ndarray:
+        if len(ts) == 0:
+            return np.empty(0)
+        compiled = self._compile_times(ts, x, x_0)
+        if compiled is None:
+            # layouts differ between the time points
+            return super().at_times(ts, x, x_0)
+        getter, keys, w_p, x_0_arr = compiled
+        deviations = np.abs(self._to_array(x, getter, keys, x_0) - x_0_arr)
+
+        # weighted p-norms for all time points via one matrix product
+        if self.p == np.inf:
+            return (w_p * deviations).max(axis=1, initial=0)
+        return (w_p @ deviations**self.p)**(1 / self.p)
+
+    def _compile_times(self, ts: List[int], x: dict, x_0: dict):
+        """
+        Stack the compiled weights of the time points ts into a matrix,
+        of absolute weights to the power p (or absolute weights for
+        p = inf). Returns None if the summary statistic layouts differ
+        between the time points.
+
+        The stacked layout is cached and only recomputed if the time
+        points, weights or x_0 change.
+        """
+        if self.w is None:
+            self._set_default_weights(ts[0], x.keys())
+        ts = [t if t in self.w else max(self.w) for t in ts]
+        ws = [self.w[t] for t in ts]
+
+        compiled = self._compiled_times
+        if compiled is not None and compiled[0] == ts \
+                and all(w is w_c for w, w_c in zip(ws, compiled[1])) \
+                and compiled[2] is x_0:
+            return compiled[3]
+
+        layouts = [self._compile(t, x_0) for t in ts]
+        if any(layout[1] != layouts[0][1] for layout in layouts):
+            result = None
+        else:
+            getter, keys, _, x_0_arr = layouts[0]
+            w_abs = np.array([layout[2] for layout in layouts],
+                             dtype=float).reshape(len(ts), len(x_0_arr))
+            w_abs = np.abs(w_abs)
+            w_p = w_abs if self.p == np.inf else w_abs**self.p
+            result = (getter, keys, w_p, x_0_arr)
+
+        self._compiled_times = (ts, ws, x_0, result)
+        return result
+
+    def _compile_for(self, t: int, x: dict, x_0: dict):
+        """
+        Initialize the weights if necessary, select the time point for
+        which weights exist, and return the compiled layout, see
+        ``_compile``.
+        """
         # make sure weights are initialized
         if self.w is None:
             self._set_default_weights(t, x.keys())
@@ -309,22 +558,88 @@ class PNormDistance(DistanceFunction):
         if t not in self.w:
             t = max(self.w)
 
-        # extract weights for time point
+        return self._compile(t, x_0)
+
+    def _compile(self, t: int, x_0: dict):
+        """
+        Fix an order of the summary statistics used at time t and flatten
+        the weights and the observed data x_0 into arrays accordingly.
+        Array-valued summary statistics are flattened, their entries
+        sharing the weight of the summary statistic.
+
+        The layout is cached and only recomputed if the weights for t or
+        x_0 have been replaced.
+        """
         w = self.w[t]
+        compiled = self._compiled.get(t)
+        if compiled is not None and compiled[0] is w \
+                and compiled[1] is x_0:
+            return compiled[2:]
 
-        # compute distance
-        if self.p == np.inf:
-            d = max(abs(w[key] * (x[key] - x_0[key]))
-                    if key in x and key in x_0 else 0
-                    for key in w)
-        else:
-            d = pow(
-                sum(pow(abs(w[key] * (x[key] - x_0[key])), self.p)
-                    if key in x and key in x_0 else 0
-                    for key in w),
-                1 / self.p)
+        keys = [key for key in w if key in x_0]
+        sizes = [np.size(x_0[key]) for key in keys]
+        x_0_arr = self._flatten(x_0, keys, x_0)
+        w_arr = np.repeat(
+            np.array([w[key] for key in keys], dtype=float), sizes)
+
+        # item getter for the fast path, returning a tuple of all values
+        getter = None
+        if len(keys) > 1 and all(size == 1 for size in sizes):
+            getter = operator.itemgetter(*keys)
+
+        self._compiled[t] = (w, x_0, getter, keys, w_arr, x_0_arr)
+        return getter, keys, w_arr, x_0_arr
+
+    @staticmethod
+    def _to_array(x: dict, getter, keys, x_0: dict) -> np.ndarray:
+        """
+        Flatten the summary statistics `x` according to the compiled
+        layout.
+        """
+        if getter is not None:
+            # fast path for scalar summary statistics all present in x
+            try:
+                return np.fromiter(getter(x), float, len(keys))
+            except (KeyError, TypeError, ValueError):
+                pass
+        return PNormDistance._flatten(x, keys, x_0)
 
-        return d
+    @staticmethod
+    def _flatten(x: dict, keys, x_0: dict) -> np.ndarray:
+        """
+        Flatten the summary statistics `x` into an array in the order of
+        `keys`. Summary statistics missing in `x` are filled with the
+        values in `x_0`, thus not contributing to the distance.
+        """
+        values = [x[key] if key in x else x_0[key] for key in keys]
+        try:
+            x_arr = np.array(values, dtype=float)
+            if x_arr.ndim == 1:
+                return x_arr
+        except (TypeError, ValueError):
+            pass
+        # array-valued summary statistics
+        return np.concatenate(
+            [np.ravel(value) for value in values]).astype(float)
+
+    def _norm(self, weighted_deviations: np.ndarray):
+        """
+        p-norm of the weighted deviations, along the last axis.
+        """
+        if weighted_deviations.shape[-1] == 0:
+            return np.zeros(weighted_deviations.shape[:-1]) \
+                if weighted_deviations.ndim > 1 else 0
+        if self.p == 2:
+            if weighted_deviations.ndim == 1:
+                return np.sqrt(weighted_deviations.dot(weighted_deviations))
+            return np.sqrt(np.einsum("ij,ij->i", weighted_deviations,
+                                     weighted_deviations))
+        if self.p == 1:
+            return np.abs(weighted_deviations).sum(axis=-1)
+        if self.p == np.inf:
+            return np.abs(weighted_deviations).max(axis=-1)
+        return (np.abs(weighted_deviations)**self.p).sum(axis=-1)**(
+            1 / self.p)
 
     def _set_default_weights(self,
                              t: int,
@@ -374,6 +689,20 @@ class AdaptivePNormDistance(PNormDistance):
         smallest non-zero absolute weight. In practice usually not necessary,
         it is theoretically required to ensure convergence.
 
+    streaming: bool, optional (default = False)
+        If True, the scales are not computed from all recorded summary
+        statistics, but from a
+        :class:`pyabc.distance_functions.StreamingScaleEstimator`, which
+        is filled while sampling and merged over the samples. This avoids
+        recording all rejected particles and shipping their summary
+        statistics to the master. The median based scale functions are
+        then approximated. Requires scalar summary statistics and one of
+        the scale functions from the scales module.
+
+    sketch_size: int, optional (default = 1000)
+        Only for streaming. The maximum number of points held per summary
+        statistic for the median based scales.
+
 
     .. [#prangle] Prangle, Dennis. "Adapting the ABC Distance Function".
                 Bayesian Analysis, 2017. doi:10.1214/16-BA1002.
@@ -384,7 +713,9 @@ class AdaptivePNormDistance(PNormDistance):
                  adaptive: bool = True,
                  scale_function=None,
                  normalize_weights: bool = True,
-                 max_weight_ratio: float = None):
+                 max_weight_ratio: float = None,
+                 streaming: bool = False,
+                 sketch_size: int = 1000):
         # call p-norm constructor
         super().__init__(p=p, w=None)
 
@@ -398,6 +729,13 @@ class AdaptivePNormDistance(PNormDistance):
         self.normalize_weights = normalize_weights
         self.max_weight_ratio = max_weight_ratio
 
+        if streaming and scale_function not in STREAMING_SCALE_FUNCTIONS:
+            raise ValueError(
+                f"The scale function {scale_function.__name__} does not "
+                f"support streaming.")
+        self.streaming = streaming
+        self.sketch_size = sketch_size
+
         self.x_0 = None
 
     def handle_x_0(self, x_0: dict):
@@ -415,6 +753,8 @@ class AdaptivePNormDistance(PNormDistance):
         Make the sampler return also rejected particles,
         because these are needed to get a better estimate of the summary
         statistic variabilities, avoiding a bias to accepted ones only.
+        If streaming, instead make the sampler condense all summary
+        statistics into scale estimators.
 
         Parameters
         ----------
@@ -422,7 +762,14 @@ class AdaptivePNormDistance(PNormDistance):
         sampler: Sampler
             The sampler employed.
         """
-        if self.adaptive:
+        if not self.adaptive:
+            return
+        if self.streaming:
+            sampler.sample_factory.sum_stats_estimator_factory = \
+                functools.partial(StreamingScaleEstimator,
+                                  list(self.x_0.keys()), self.x_0,
+                                  self.sketch_size)
+        else:
             sampler.sample_factory.record_rejected = True
 
     def initialize(self,
@@ -436,7 +783,8 @@ class AdaptivePNormDistance(PNormDistance):
 
     def update(self,
                t: int,
-               all_sum_stats: List[dict]):
+               all_sum_stats: List[dict],
+               sum_stats_estimator: StreamingScaleEstimator = None):
         """
         Update weights based on all simulations.
         """
@@ -444,42 +792,37 @@ class AdaptivePNormDistance(PNormDistance):
         if not self.adaptive:
             return False
 
-        self._update(t, all_sum_stats)
+        self._update(t, all_sum_stats, sum_stats_estimator)
 
         return True
 
     def _update(self,
                 t: int,
-                all_sum_stats: List[dict]):
+                all_sum_stats: List[dict],
+                sum_stats_estimator: StreamingScaleEstimator = None):
         """
         Here the real update of weights happens.
         """
 
         # retrieve keys
-        keys = self.x_0.keys()
-
-        # number of samples
-        n_samples = len(all_sum_stats)
+        keys = list(self.x_0.keys())
 
         # make sure w_list is initialized
         if self.w is None:
             self.w = {}
 
+        # compute scales of all summary statistics
+        if sum_stats_estimator is not None:
+            scales = sum_stats_estimator.scales(self.scale_function)
+        else:
+            scales = self._compute_scales(keys, all_sum_stats)
+
         # to-be-filled-and-appended weights dictionary
         w = {}
 
-        for key in keys:
-            # prepare list for key
-            current_list = []
-            for j in range(n_samples):
-                if key in all_sum_stats[j]:
-                    current_list.append(all_sum_stats[j][key])
-
-            # compute scaling
-            scale = self.scale_function(data=current_list, x_0=self.x_0[key])
-
+        for key, scale in zip(keys, scales):
             # compute weight (inverted scale)
-            if np.isclose(scale, 0):
+            if np.isnan(scale) or np.isclose(scale, 0):
                 # This means that either the summary statistic is not in the
                 # samples, or that all simulations were identical. In either
                 # case, it should be safe to ignore this summary statistic.
@@ -499,6 +842,79 @@ class AdaptivePNormDistance(PNormDistance):
         # logging
         logger.debug("update distance weights = {}".format(self.w[t]))
 
+    def _compute_scales(self,
+                        keys: List[str],
+                        all_sum_stats: List[dict]) -> np.ndarray:
+        """
+        Compute the scales of the summary statistics `keys` over the
+        samples `all_sum_stats`.
+
+        The samples are assembled into an (n_samples, n_stats) matrix,
+        with NaN marking summary statistics missing in a sample, on which
+        the scale functions from the scales module are evaluated
+        column-wise. Other scale functions are called per summary
+        statistic on the available values.
+        """
+        data = self._stack_sum_stats(keys, all_sum_stats)
+        if data is None:
+            # non-scalar summary statistics
+            return self._compute_scales_by_key(keys, all_sum_stats)
+        x_0 = np.array([self.x_0[key] for key in keys], dtype=float)
+
+        with warnings.catch_warnings():
+            # all-NaN columns give NaN scales
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            if self.scale_function in COLUMN_WISE_SCALE_FUNCTIONS:
+                return np.asarray(
+                    self.scale_function(data=data, x_0=x_0), dtype=float)
+            return np.array(
+                [self.scale_function(data=column[~np.isnan(column)].tolist(),
+                                     x_0=self.x_0[key])
+                 for key, column in zip(keys, data.T)], dtype=float)
+
+    @staticmethod
+    def _stack_sum_stats(keys: List[str],
+                         all_sum_stats: List[dict]) -> np.ndarray:
+        """
+        Stack the summary statistics into an (n_samples, n_stats) matrix,
+        with missing values set to NaN. Returns None if not all summary
+        statistics are scalar.
+        """
+        try:
+            try:
+                getter = operator.itemgetter(*keys)
+                data = np.array([getter(sum_stat)
+                                 for sum_stat in all_sum_stats], dtype=float)
+            except KeyError:
+                data = np.array([[sum_stat.get(key, np.nan) for key in keys]
+                                 for sum_stat in all_sum_stats], dtype=float)
+            return data.reshape(len(all_sum_stats), len(keys))
+        except (TypeError, ValueError):
+            return None
+
+    def _compute_scales_by_key(self,
+                               keys: List[str],
+                               all_sum_stats: List[dict]) -> np.ndarray:
+        """
+        Compute the scales separately for each summary statistic. This
+        is used for non-scalar summary statistics, the entries of which
+        share one scale.
+        """
+        scales = []
+        for key in keys:
+            current_list = [sum_stat[key] for sum_stat in all_sum_stats
+                            if key in sum_stat]
+            if self.scale_function in COLUMN_WISE_SCALE_FUNCTIONS:
+                # evaluate on all entries jointly
+                data = np.ravel(np.asarray(current_list, dtype=float))
+                x_0 = np.tile(np.ravel(self.x_0[key]), len(current_list))
+                scale = self.scale_function(data=data, x_0=x_0)
+            else:
+                scale = self.scale_function(data=current_list,
+                                            x_0=self.x_0[key])
+            scales.append(scale)
+        return np.array(scales, dtype=float)
+
     def _normalize_weights(self, w):
         """
         Normalize weights to have mean 1.
@@ -546,7 +962,8 @@ class AdaptivePNormDistance(PNormDistance):
                 "adaptive": self.adaptive,
                 "scale_function": self.scale_function.__name__,
                 "normalize_weights": self.normalize_weights,
-                "max_weight_ratio": self.max_weight_ratio}
+                "max_weight_ratio": self.max_weight_ratio,
+                "streaming": self.streaming}
 
 
 class DistanceFunctionWithMeasureList(DistanceFunction):
@@ -569,10 +986,15 @@ class DistanceFunctionWithMeasureList(DistanceFunction):
         self._measures_to_use_passed_to_init = measures_to_use
         #: The measures (summary statistics) to use for distance calculation.
         self.measures_to_use = None
+        # item getter for the measures, and cached observed data, see
+        # _getter and _compiled_x_0
+        self._measures_getter = None
+        self._x_0_cache = None
 
     def initialize(self,
                    t: int,
                    sample_from_prior: List[dict]):
+        self._x_0_cache = None
         if self._measures_to_use_passed_to_init == 'all':
             self.measures_to_use = sample_from_prior[0].keys()
             raise Exception(
@@ -585,6 +1007,55 @@ class DistanceFunctionWithMeasureList(DistanceFunction):
         config["measures_to_use"] = self.measures_to_use
         return config
 
+    def _getter(self):
+        """
+        Item getter returning the used measures in a fixed order (as a
+        tuple if more than one measure is used).
+        """
+        cached = self._measures_getter
+        if cached is None or cached[0] is not self.measures_to_use:
+            getter = operator.itemgetter(*self.measures_to_use)
+            self._measures_getter = cached = (self.measures_to_use, getter)
+        return cached[1]
+
+    def _to_vect(self, x: dict) -> np.ndarray:
+        """
+        The used measures of the summary statistics x as float array.
+        """
+        values = self._getter()(x)
+        if len(self.measures_to_use) == 1:
+            return np.array([values], dtype=float)
+        return np.fromiter(values, float, len(self.measures_to_use))
+
+    def _stack(self, X: List[dict]) -> np.ndarray:
+        """
+        Stack the used measures of the summary statistics X into an
+        array of shape (n_samples, n_measures).
+        """
+        getter = self._getter()
+        X_arr = np.array([getter(x) for x in X], dtype=float)
+        return X_arr.reshape(len(X), len(self.measures_to_use))
+
+    def _compiled_x_0(self, x_0: dict):
+        """
+        The observed data, as transformed by ``_compile_x_0``. Cached as
+        long as x_0 and the measures are unchanged, and until the next
+        initialization.
+        """
+        cached = self._x_0_cache
+        if cached is None or cached[0] is not x_0 \
+                or cached[1] is not self.measures_to_use:
+            compiled = self._compile_x_0(self._to_vect(x_0))
+            self._x_0_cache = cached = (x_0, self.measures_to_use, compiled)
+        return cached[2]
+
+    def _compile_x_0(self, x_0_vec: np.ndarray):
+        """
+        Precompute everything needed from the observed data. Default:
+        The observed data as array.
+        """
+        return x_0_vec
+
 
 class ZScoreDistanceFunction(DistanceFunctionWithMeasureList):
     """
@@ -603,9 +1074,37 @@ class ZScoreDistanceFunction(DistanceFunctionWithMeasureList):
                  t: int,
                  x: dict,
                  x_0: dict) -> float:
-        return sum(abs((x[key] - x_0[key]) / x_0[key]) if x_0[key] != 0 else
-                   (0 if x[key] == 0 else np.inf)
-                   for key in self.measures_to_use) / len(self.measures_to_use)
+        return float(self._z_scores(self._to_vect(x), x_0))
+
+    def batch(self,
+              t: int,
+              X: List[dict],
+              x_0: dict) -> np.ndarray:
+        if len(X) == 0:
+            return np.empty(0)
+        return self._z_scores(self._stack(X), x_0)
+
+    def _compile_x_0(self, x_0_vec: np.ndarray):
+        nonzero = x_0_vec != 0
+        inv_abs_x_0 = np.zeros_like(x_0_vec)
+        inv_abs_x_0[nonzero] = 1 / np.abs(x_0_vec[nonzero])
+        if nonzero.all():
+            nonzero = None
+        return x_0_vec, nonzero, inv_abs_x_0
+
+    def _z_scores(self, x_arr: np.ndarray, x_0: dict):
+        """
+        Mean z-scores along the last axis of x_arr.
+        """
+        x_0_vec, nonzero, inv_abs_x_0 = self._compiled_x_0(x_0)
+        deviations = np.abs(x_arr - x_0_vec)
+        if nonzero is None:
+            # all observed values are non-zero
+            return deviations.dot(inv_abs_x_0) / len(x_0_vec)
+        with np.errstate(invalid="ignore"):
+            scores = np.where(nonzero, deviations * inv_abs_x_0,
+                              np.where(deviations == 0, 0, np.inf))
+        return scores.sum(axis=-1) / len(x_0_vec)
 
 
 class PCADistanceFunction(DistanceFunctionWithMeasureList):
@@ -626,11 +1125,10 @@ class PCADistanceFunction(DistanceFunctionWithMeasureList):
         self._whitening_transformation_matrix = None
 
     def _dict_to_to_vect(self, x):
-        return sp.asarray([x[key] for key in self.measures_to_use])
+        return self._to_vect(x)
 
     def _calculate_whitening_transformation_matrix(self, sample_from_prior):
-        samples_vec = sp.asarray([self._dict_to_to_vect(x)
-                                  for x in sample_from_prior])
+        samples_vec = self._stack(sample_from_prior)
         # samples_vec is an array of shape nr_samples x nr_features
         means = samples_vec.mean(axis=0)
         centered = samples_vec - means
@@ -649,10 +1147,24 @@ class PCADistanceFunction(DistanceFunctionWithMeasureList):
                  t: int,
                  x: dict,
                  x_0: dict) -> float:
-        x_vec, x_0_vec = self._dict_to_to_vect(x), self._dict_to_to_vect(x_0)
-        distance = la.norm(
-            self._whitening_transformation_matrix.dot(x_vec - x_0_vec), 2)
-        return distance
+        whitened = self._whitening_transformation_matrix.dot(
+            self._to_vect(x)) - self._compiled_x_0(x_0)
+        return float(np.sqrt(whitened.dot(whitened)))
+
+    def batch(self,
+              t: int,
+              X: List[dict],
+              x_0: dict) -> np.ndarray:
+        if len(X) == 0:
+            return np.empty(0)
+        # whiten all samples at once
+        whitened = self._stack(X) @ self._whitening_transformation_matrix.T \
+            - self._compiled_x_0(x_0)
+        return np.sqrt(np.einsum("ij,ij->i", whitened, whitened))
+
+    def _compile_x_0(self, x_0_vec: np.ndarray):
+        # the whitened observed data
+        return self._whitening_transformation_matrix.dot(x_0_vec)
 
 
 class RangeEstimatorDistanceFunction(DistanceFunctionWithMeasureList):
@@ -741,6 +1253,18 @@ class RangeEstimatorDistanceFunction(DistanceFunctionWithMeasureList):
                        for key in self.measures_to_use)
         return distance
 
+    def batch(self,
+              t: int,
+              X: List[dict],
+              x_0: dict) -> np.ndarray:
+        if len(X) == 0:
+            return np.empty(0)
+        X_arr, x_0_arr = self._stack(X), self._stack([x_0])[0]
+        normalization = np.array(
+            [self.normalization[key] for key in self.measures_to_use],
+            dtype=float)
+        return np.abs((X_arr - x_0_arr) / normalization).sum(axis=1)
+
 
 class MinMaxDistanceFunction(RangeEstimatorDistanceFunction):
     """
@@ -19,6 +19,11 @@ in addition the following:
 
 Here, "only distance to observation" means that the in-sample variation
 is not taken into account.
+
+All scale functions also accept a 2-dimensional data array of shape
+(n_samples, n_stats) and an array x_0 of length n_stats, and then
+compute the scales of all columns at once. Missing values can be
+indicated by NaN and are ignored.
 """
 
 
@@ -32,8 +37,8 @@ def median_absolute_deviation(**kwargs):
     from the median, defined as
     median(abs(data - median(data)).
     """
-    data = np.asarray(kwargs['data'])
-    mad = np.median(np.abs(data - np.median(data)))
+    data = np.asarray(kwargs['data'], dtype=float)
+    mad = np.nanmedian(np.abs(data - np.nanmedian(data, axis=0)), axis=0)
     return mad
 
 
@@ -41,8 +46,8 @@ def mean_absolute_deviation(**kwargs):
     """
     Calculate the mean absolute deviation from the mean.
     """
-    data = np.asarray(kwargs['data'])
-    mad = np.mean(np.abs(data - np.mean(data)))
+    data = np.asarray(kwargs['data'], dtype=float)
+    mad = np.nanmean(np.abs(data - np.nanmean(data, axis=0)), axis=0)
     return mad
 
 
@@ -51,8 +56,8 @@ def standard_deviation(**kwargs):
     Calculate the sample `standard deviation (SD)
     <https://en.wikipedia.org/wiki/Standard_deviation/>`_.
     """
-    data = np.asarray(kwargs['data'])
-    std = np.std(data)
+    data = np.asarray(kwargs['data'], dtype=float)
+    std = np.nanstd(data, axis=0)
     return std
 
 
@@ -60,9 +65,9 @@ def bias(**kwargs):
     """
     Bias of sample to observed value.
     """
-    data = np.asarray(kwargs['data'])
+    data = np.asarray(kwargs['data'], dtype=float)
     x_0 = kwargs['x_0']
-    bias = np.abs(np.mean(data) - x_0)
+    bias = np.abs(np.nanmean(data, axis=0) - x_0)
     return bias
 
 
@@ -82,9 +87,9 @@ def median_absolute_deviation_to_observation(**kwargs):
     """
     Median absolute deviation of data w.r.t. the observation x_0.
     """
-    data = np.asarray(kwargs['data'])
+    data = np.asarray(kwargs['data'], dtype=float)
     x_0 = kwargs['x_0']
-    mado = np.median(np.abs(data - x_0))
+    mado = np.nanmedian(np.abs(data - x_0), axis=0)
     return mado
 
 
@@ -92,9 +97,9 @@ def mean_absolute_deviation_to_observation(**kwargs):
     """
     Mean absolute deviation of data w.r.t. the observation x_0.
     """
-    data = np.asarray(kwargs['data'])
+    data = np.asarray(kwargs['data'], dtype=float)
     x_0 = kwargs['x_0']
-    mado = np.mean(np.abs(data - x_0))
+    mado = np.nanmean(np.abs(data - x_0), axis=0)
     return mado
 
 
@@ -125,7 +130,22 @@ def standard_deviation_to_observation(**kwargs):
     Standard deviation of absolute deviations of the data w.r.t.
     the observation x_0.
     """
-    data = np.asarray(kwargs['data'])
+    data = np.asarray(kwargs['data'], dtype=float)
     x_0 = kwargs['x_0']
-    stdo = np.std(np.abs(data - x_0))
+    stdo = np.nanstd(np.abs(data - x_0), axis=0)
     return stdo
+
+
+#: Scale functions which can be evaluated column-wise on a data matrix.
+COLUMN_WISE_SCALE_FUNCTIONS = {
+    median_absolute_deviation,
+    mean_absolute_deviation,
+    standard_deviation,
+    bias,
+    root_mean_square_deviation,
+    median_absolute_deviation_to_observation,
+    mean_absolute_deviation_to_observation,
+    combined_median_absolute_deviation,
+    combined_mean_absolute_deviation,
+    standard_deviation_to_observation,
+}
@@ -0,0 +1,332 @@
+"""
+Streaming estimators of the scales of summary statistics, for the
+AdaptivePNormDistance.
+
+Instead of recording all (in particular rejected) summary statistics
+and computing the scales on the master, the summary statistics are
+condensed into mergeable estimators while sampling. These are filled
+on the workers, shipped alongside the samples, and merged on the
+master.
+
+Running means and variances (and the mean absolute deviations from the
+observed data) are tracked exactly, such that the scales
+
+* standard_deviation
+* bias
+* root_mean_square_deviation
+* mean_absolute_deviation_to_observation
+* standard_deviation_to_observation
+
+are exact. The median based scales and the mean absolute deviation are
+computed from a :class:`pyabc.weighted_statistics.WeightedQuantileSketch`
+per summary statistic, and are thus approximations.
+"""
+
+import operator
+from typing import List
+
+import numpy as np
+
+from ..weighted_statistics import WeightedQuantileSketch, weighted_quantile
+from .scales import (median_absolute_deviation,
+                     mean_absolute_deviation,
+                     standard_deviation,
+                     bias,
+                     root_mean_square_deviation,
+                     median_absolute_deviation_to_observation,
+                     mean_absolute_deviation_to_observation,
+                     combined_median_absolute_deviation,
+                     combined_mean_absolute_deviation,
+                     standard_deviation_to_observation)
+
+
+class StreamingScaleEstimator:
+    """
+    Streaming, mergeable estimator of the scales of scalar summary
+    statistics. Summary statistics missing in a sample are ignored for
+    that sample.
+
+    Parameters
+    ----------
+
+    keys: List[str]
+        The summary statistic labels.
+
+    x_0: dict
+        The observed summary statistics.
+
+    sketch_size: int, optional (default = 1000)
+        Maximum number of points held per summary statistic for the
+        median based scales, see
+        :class:`pyabc.weighted_statistics.WeightedQuantileSketch`.
+
+    buffer_size: int, optional (default = 100)
+        Number of samples buffered before the statistics are updated in a
+        vectorized manner.
+    """
+
+    _MOMENTS = ("_n", "_mean", "_m2", "_sum_abs_dev_0")
+
+    def __init__(self,
+                 keys: List[str],
+                 x_0: dict,
+                 sketch_size: int = 1000,
+                 buffer_size: int = 100):
+        self.keys = list(keys)
+        self.x_0 = np.array([x_0[key] for key in self.keys], dtype=float)
+        self.sketch_size = sketch_size
+        self.buffer_size = buffer_size
+
+        n_stats = len(self.keys)
+        # number of values, mean, sum of squared deviations from the mean,
+        # and sum of absolute deviations from x_0, per summary statistic
+        self._n = np.zeros(n_stats)
+        self._mean = np.zeros(n_stats)
+        self._m2 = np.zeros(n_stats)
+        self._sum_abs_dev_0 = np.zeros(n_stats)
+        self._sketches = [WeightedQuantileSketch(sketch_size)
+                          for _ in self.keys]
+
+        self._buffer = []
+        self._getter = operator.itemgetter(*self.keys) if self.keys else None
+
+    def __getstate__(self):
+        # estimators are pickled with every sample sent back from the
+        # workers, so the buffer and the sketches are packed into a few
+        # flat arrays instead of one list and one sketch per statistic
+        state = self.__dict__.copy()
+        del state["_getter"]
+        state["_buffer"] = np.array(self._buffer, dtype=float).reshape(
+            len(self._buffer), len(self.keys))
+        sketches = state.pop("_sketches")
+        points = [sketch.points for sketch in sketches]
+        weights = np.concatenate([np.empty(0)]
+                                 + [sketch.weights for sketch in sketches])
+        state["_sketch_n"] = np.array([sketch.n for sketch in sketches])
+        state["_sketch_sizes"] = np.array([len(p) for p in points])
+        state["_sketch_points"] = np.concatenate([np.empty(0)] + points)
+        # uncompressed sketches only hold points of weight 1
+        state["_sketch_weights"] = None if np.all(weights == 1) else weights
+        if not self._n.any():
+            # nothing flushed yet
+            for name in self._MOMENTS:
+                state[name] = None
+        return state
+
+    def __setstate__(self, state):
+        sketch_n = state.pop("_sketch_n")
+        offsets = np.cumsum(state.pop("_sketch_sizes"))[:-1]
+        points = state.pop("_sketch_points")
+        weights = state.pop("_sketch_weights")
+        if weights is None:
+            weights = np.ones_like(points)
+        self.__dict__.update(state)
+        for name in self._MOMENTS:
+            if getattr(self, name) is None:
+                setattr(self, name, np.zeros(len(self.keys)))
+        self._buffer = list(self._buffer)
+        self._getter = operator.itemgetter(*self.keys) if self.keys else None
+        self._sketches = []
+        for n, sketch_points, sketch_weights in zip(
+                sketch_n, np.split(points, offsets),
+                np.split(weights, offsets)):
+            sketch = WeightedQuantileSketch(self.sketch_size)
+            sketch.n = int(n)
+            sketch._points = sketch_points
+            sketch._weights = sketch_weights
+            self._sketches.append(sketch)
+
+    def update(self, sum_stat: dict):
+        """
+        Add the summary statistics of a single sample.
+        """
+        if self._getter is None:
+            return
+        try:
+            row = self._getter(sum_stat)
+        except KeyError:
+            row = [sum_stat.get(key, np.nan) for key in self.keys]
+        self._buffer.append(row)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def merge(self, other: "StreamingScaleEstimator"):
+        """
+        Merge the statistics of another estimator into this one.
+        """
+        if other.keys != self.keys:
+            raise ValueError(
+                "Cannot merge scale estimators for different summary "
+                "statistics.")
+        other._flush()
+        self._flush()
+        self._merge_moments(other._n, other._mean, other._m2,
+                            other._sum_abs_dev_0)
+        for sketch, other_sketch in zip(self._sketches, other._sketches):
+            sketch.merge(other_sketch)
+
+    def __add__(self, other: "StreamingScaleEstimator") \
+            -> "StreamingScaleEstimator":
+        estimator = StreamingScaleEstimator(
+            self.keys, dict(zip(self.keys, self.x_0)),
+            self.sketch_size, self.buffer_size)
+        estimator.merge(self)
+        estimator.merge(other)
+        return estimator
+
+    @property
+    def n(self) -> np.ndarray:
+        """
+        The number of values per summary statistic.
+        """
+        self._flush()
+        return self._n
+
+    def scales(self, scale_function) -> np.ndarray:
+        """
+        Estimate the scales of all summary statistics.
+
+        Parameters
+        ----------
+
+        scale_function: Callable
+            One of the scale functions from the scales module, see
+            STREAMING_SCALE_FUNCTIONS.
+
+        Returns
+        -------
+
+        scales: np.ndarray
+            The scales, in the order of ``keys``. Summary statistics
+            without values get a scale of NaN.
+        """
+        if scale_function not in STREAMING_SCALE_FUNCTIONS:
+            raise ValueError(
+                f"The scale function {scale_function.__name__} cannot be "
+                f"estimated in a streaming manner.")
+        self._flush()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return STREAMING_SCALE_FUNCTIONS[scale_function](self)
+
+    def _flush(self):
+        """
+        Update the statistics from the buffered samples.
+        """
+        if not self._buffer:
+            return
+        data = np.array(self._buffer, dtype=float).reshape(
+            len(self._buffer), len(self.keys))
+        self._buffer = []
+
+        present = ~np.isnan(data)
+        n = present.sum(axis=0)
+        filled = np.where(present, data, 0)
+        mean = filled.sum(axis=0) / np.maximum(n, 1)
+        m2 = (np.where(present, data - mean, 0)**2).sum(axis=0)
+        sum_abs_dev_0 = np.where(present, np.abs(data - self.x_0), 0) \
+            .sum(axis=0)
+        self._merge_moments(n, mean, m2, sum_abs_dev_0)
+
+        for sketch, column, present_column in zip(
+                self._sketches, data.T, present.T):
+            sketch.update_batch(column[present_column])
+
+    def _merge_moments(self, n, mean, m2, sum_abs_dev_0):
+        """
+        Merge counts, means and squared deviations via Chan's formula.
+        """
+        n_total = self._n + n
+        delta = mean - self._mean
+        ratio = np.divide(n, n_total, out=np.zeros_like(n_total),
+                          where=n_total > 0)
+        self._m2 += m2 + delta**2 * self._n * ratio
+        self._mean += delta * ratio
+        self._n = n_total
+        self._sum_abs_dev_0 += sum_abs_dev_0
+
+    # exact scales
+
+    def _standard_deviation(self):
+        return np.sqrt(self._m2 / self._n)
+
+    def _bias(self):
+        return np.where(self._n > 0, np.abs(self._mean - self.x_0), np.nan)
+
+    def _root_mean_square_deviation(self):
+        return np.sqrt(self._bias()**2 + self._standard_deviation()**2)
+
+    def _mean_absolute_deviation_to_observation(self):
+        return self._sum_abs_dev_0 / self._n
+
+    def _standard_deviation_to_observation(self):
+        mean_squared_dev_0 = self._root_mean_square_deviation()**2
+        mean_abs_dev_0 = self._mean_absolute_deviation_to_observation()
+        return np.sqrt(np.maximum(mean_squared_dev_0 - mean_abs_dev_0**2, 0))
+
+    # sketch based scales
+
+    def _sketch_scales(self, scale):
+        """
+        Evaluate `scale(points, weights, mean, x_0)` on the sketch of
+        each summary statistic.
+        """
+        scales = np.full(len(self.keys), np.nan)
+        for j, sketch in enumerate(self._sketches):
+            points, weights = sketch.points, sketch.weights
+            if weights.sum() > 0:
+                scales[j] = scale(points, weights / weights.sum(),
+                                  self._mean[j], self.x_0[j])
+        return scales
+
+    def _median_absolute_deviation(self):
+        def scale(points, weights, mean, x_0):
+            median = weighted_quantile(points, weights, alpha=.5)
+            return _weighted_median(np.abs(points - median), weights)
+        return self._sketch_scales(scale)
+
+    def _mean_absolute_deviation(self):
+        def scale(points, weights, mean, x_0):
+            return (np.abs(points - mean) * weights).sum()
+        return self._sketch_scales(scale)
+
+    def _median_absolute_deviation_to_observation(self):
+        def scale(points, weights, mean, x_0):
+            return _weighted_median(np.abs(points - x_0), weights)
+        return self._sketch_scales(scale)
+
+    def _combined_median_absolute_deviation(self):
+        return (self._median_absolute_deviation()
+                + self._median_absolute_deviation_to_observation())
+
+    def _combined_mean_absolute_deviation(self):
+        return (self._mean_absolute_deviation()
+                + self._mean_absolute_deviation_to_observation())
+
+
+def _weighted_median(points, weights):
+    return weighted_quantile(points, weights, alpha=.5)
+
+
+#: Scale functions which can be estimated by the StreamingScaleEstimator.
+STREAMING_SCALE_FUNCTIONS = {
+    median_absolute_deviation:
+        StreamingScaleEstimator._median_absolute_deviation,
+    mean_absolute_deviation:
+        StreamingScaleEstimator._mean_absolute_deviation,
+    standard_deviation:
+        StreamingScaleEstimator._standard_deviation,
+    bias:
+        StreamingScaleEstimator._bias,
+    root_mean_square_deviation:
+        StreamingScaleEstimator._root_mean_square_deviation,
+    median_absolute_deviation_to_observation:
+        StreamingScaleEstimator._median_absolute_deviation_to_observation,
+    mean_absolute_deviation_to_observation:
+        StreamingScaleEstimator._mean_absolute_deviation_to_observation,
+    combined_median_absolute_deviation:
+        StreamingScaleEstimator._combined_median_absolute_deviation,
+    combined_mean_absolute_deviation:
+        StreamingScaleEstimator._combined_mean_absolute_deviation,
+    standard_deviation_to_observation:
+        StreamingScaleEstimator._standard_deviation_to_observation,
+}
@@ -64,9 +64,25 @@ class Epsilon(ABC):
         """
         pass
 
+    def configure_sampler(self, sampler):
+        """
+        This is called by the ABCSMC class and gives the epsilon the
+        opportunity to configure the sampler, e.g. to condense the accepted
+        distances while sampling.
+
+        The default is to do nothing.
+
+        Parameters
+        ----------
+
+        sampler: Sampler
+            The Sampler used in ABCSMC.
+        """
+
     def update(self,
                t: int,
-               weighted_distances: pandas.DataFrame):
+               weighted_distances: pandas.DataFrame,
+               distance_sketch=None):
         """
         Update epsilon value to be used as acceptance criterion for
         generation t.
@@ -85,7 +101,15 @@ class Epsilon(ABC):
             by Population.get_weighted_distances(). These are usually the
             distances of samples accepted in population t-1. The distances may
             differ from those used for acceptance in population t-1, if the
-            distance function for population t has been updated.
+            distance function for population t has been updated. None if
+            ``distance_sketch`` is passed.
+
+        distance_sketch: WeightedQuantileSketch, optional
+            If the epsilon configured the sampler to sketch the accepted
+            distances (see ``configure_sampler``), the sketch of the
+            accepted distances. Only passed in that case, and if the
+            distances have not been changed since acceptance. The weighted
+            distances are then not collected from the population.
         """
         pass
 
@@ -230,13 +254,24 @@ class QuantileEpsilon(Epsilon):
     weighted: bool
         Flag indicating whether the new epsilon should be computed using
         weighted (True, default) or non-weighted (False) distances.
+
+    sketch_size: int, optional (default = None)
+        If not None and weighted, the sampler is configured to condense the
+        accepted distances into a mergeable
+        :class:`pyabc.weighted_statistics.WeightedQuantileSketch` of this
+        size while sampling, from which the quantile is then approximated,
+        with bounded memory and without sorting all distances. If the
+        distance function is updated between generations, the exact
+        quantile of the new distances is computed. By default, the exact
+        quantile is always computed.
     """
 
     def __init__(self,
                  initial_epsilon: Union[str, int, float] = 'from_sample',
                  alpha: float = 0.5,
                  quantile_multiplier: float = 1,
-                 weighted: bool = True):
+                 weighted: bool = True,
+                 sketch_size: int = None):
 
         logger.debug(
             "init quantile_epsilon initial_epsilon={}, quantile_multiplier={}"
@@ -247,6 +282,7 @@ class QuantileEpsilon(Epsilon):
         self.alpha = alpha
         self.quantile_multiplier = quantile_multiplier
         self.weighted = weighted
+        self.sketch_size = sketch_size
         self._look_up = {}
 
         if self.alpha > 1 or self.alpha <= 0:
@@ -257,10 +293,19 @@ class QuantileEpsilon(Epsilon):
         config.update({"initial_epsilon": self._initial_epsilon,
                        "alpha": self.alpha,
                        "quantile_multiplier": self.quantile_multiplier,
-                       "weighted": self.weighted})
+                       "weighted": self.weighted,
+                       "sketch_size": self.sketch_size})
 
         return config
 
+    def configure_sampler(self, sampler):
+        """
+        Make the sampler sketch the accepted distances, if a sketch size
+        is given.
+        """
+        if self.sketch_size is not None and self.weighted:
+            sampler.sample_factory.distance_sketch_size = self.sketch_size
+
     def initialize(self,
                    t: int,
                    weighted_distances: pandas.DataFrame):
@@ -300,13 +345,20 @@ class QuantileEpsilon(Epsilon):
 
     def update(self,
                t: int,
-               weighted_distances: pandas.DataFrame):
+               weighted_distances: pandas.DataFrame,
+               distance_sketch=None):
         """
         Compute quantile of the (weighted) distances given in population,
         and use this to update epsilon.
         """
 
-        self._update(t, weighted_distances)
+        if distance_sketch is not None:
+            # approximate quantile from the sketch, which is only requested
+            # for weighted quantiles
+            self._look_up[t] = distance_sketch.quantile(self.alpha) \
+                * self.quantile_multiplier
+        else:
+            self._update(t, weighted_distances)
 
         # logger
         logger.debug("new eps, t={}, eps={}".format(t, self._look_up[t]))
@@ -348,8 +400,10 @@ class MedianEpsilon(QuantileEpsilon):
     def __init__(self,
                  initial_epsilon: Union[str, int, float] = 'from_sample',
                  median_multiplier: float = 1,
-                 weighted: bool = True):
+                 weighted: bool = True,
+                 sketch_size: int = None):
         super().__init__(initial_epsilon=initial_epsilon,
                          alpha=0.5,
                          quantile_multiplier=median_multiplier,
-                         weighted=weighted)
+                         weighted=weighted,
+                         sketch_size=sketch_size)
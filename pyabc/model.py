@@ -5,8 +5,10 @@ Models
 Models for ABCSMC.
 """
 
+import pandas as pd
+
 from .parameters import Parameter
-from typing import Callable, Any
+from typing import Callable, Any, Iterator, List
 from .epsilon import Epsilon
 from .distance_functions import DistanceFunction
 from .acceptor import Acceptor
@@ -19,10 +21,16 @@ class ModelResult:
     distances and accepted/rejected.
     """
 
-    def __init__(self, sum_stats=None, distance=None, accepted=None):
+    def __init__(self, sum_stats=None, distance=None, accepted=None,
+                 counters: dict = None, partial: bool = False):
         self.sum_stats = sum_stats if sum_stats is not None else {}
         self.distance = distance
         self.accepted = accepted
+        # numeric counters of the evaluation, summed up per generation
+        self.counters = counters
+        # whether the summary statistics are incomplete, as the simulation
+        # was aborted, such that they are not recorded as rejected ones
+        self.partial = partial
 
 
 class Model:
@@ -43,6 +51,12 @@ class Model:
 
     To use this class, at least the sample method has to be overriden.
 
+    Models which can simulate many parameters at once more efficiently
+    than one by one, e.g. vectorized simulators, can additionally
+    overwrite ``sample_batch`` and set ``supports_batch`` to True.
+    Samplers then evaluate blocks of proposals at once, via the batch
+    variants of the individual steps.
+
     .. note::
 
         Most likely you do not want to use this class directly, but the
@@ -57,6 +71,15 @@ class Model:
         analysis for the user as it is stored in the database.
     """
 
+    #: Whether the model declares ``sample_batch`` to be worth using
+    #: over individual calls to ``sample``.
+    supports_batch = False
+
+    #: Whether the model always returns the same sample for the same
+    #: parameters. Only deterministic models are cached, see
+    #: :class:`pyabc.cache.SimulationCache`.
+    deterministic = False
+
     def __init__(self, name: str = "model"):
         self.name = name
 
@@ -84,6 +107,30 @@ class Model:
         """
         raise NotImplementedError()
 
+    def sample_batch(self, pars: pd.DataFrame) -> list:
+        """
+        Return samples from the model evaluated at each of the parameters
+        in ``pars``.
+
+        The default implementation calls ``sample`` for each parameter.
+        Overwrite it, and set ``supports_batch`` to True, if the
+        simulations can be vectorized.
+
+        Parameters
+        ----------
+
+        pars: pd.DataFrame
+            The parameters, one row per parameter.
+
+        Returns
+        -------
+
+        samples: list
+            The sampled data, one entry per row of ``pars``.
+        """
+        return [self.sample(Parameter(row))
+                for row in pars.to_dict("records")]
+
     def summary_statistics(self,
                            t,
                            pars,
@@ -117,6 +164,38 @@ class Model:
         sum_stats = sum_stats_calculator(raw_data)
         return ModelResult(sum_stats=sum_stats)
 
+    def summary_statistics_batch(self,
+                                 t,
+                                 pars: List[Parameter],
+                                 sum_stats_calculator) -> List[ModelResult]:
+        """
+        Batch variant of ``summary_statistics``, sampling via
+        ``sample_batch``.
+
+        Parameters
+        ----------
+
+        t: int
+            Current time point.
+
+        pars: List[Parameter]
+            Model parameters.
+
+        sum_stats_calculator: Callable
+            A function which calculates summary statistics, as passed to
+            :class:`pyabc.smc.ABCSMC`.
+
+        Returns
+        -------
+
+        model_results: List[ModelResult]
+            The results with filled summary statistics, in the order of
+            ``pars``.
+        """
+        raw_data = self.sample_batch(pd.DataFrame([dict(par) for par in pars]))
+        return [ModelResult(sum_stats=sum_stats_calculator(data))
+                for data in raw_data]
+
     def distance(self,
                  t,
                  pars,
@@ -229,6 +308,47 @@ class Model:
 
         return result
 
+    def accept_batch(self,
+                     t,
+                     pars: List[Parameter],
+                     sum_stats_calculator,
+                     distance_calculator: DistanceFunction,
+                     eps_calculator: Epsilon,
+                     acceptor: Acceptor,
+                     x_0) -> List[ModelResult]:
+        """
+        Batch variant of ``accept``. The summary statistics are computed via
+        ``summary_statistics_batch``, the acceptance is judged for each
+        parameter individually.
+
+        Parameters
+        ----------
+
+        pars: List[Parameter]
+            The model parameters.
+
+        For the remaining parameters, see ``accept``.
+
+        Returns
+        -------
+
+        model_results: List[ModelResult]
+            The results with filled accepted fields, in the order of
+            ``pars``.
+        """
+        results = self.summary_statistics_batch(t,
+                                                pars,
+                                                sum_stats_calculator)
+        for result in results:
+            distance, accepted = acceptor(t,
+                                          distance_calculator,
+                                          eps_calculator,
+                                          result.sum_stats, x_0)
+            result.distance = distance
+            result.accepted = accepted
+
+        return results
+
 
 class SimpleModel(Model):
     """
@@ -247,19 +367,37 @@ class SimpleModel(Model):
     name: str. optional
         The name of the model. If not provided, the names if inferred from
         the function name of `sample_function`.
+
+    sample_batch_function: Callable[[pd.DataFrame], list], optional
+        Returns the samples for a data frame of parameters, one row
+        per parameter. If provided, the model supports batch evaluation.
+
+    deterministic: bool, optional (default = False)
+        Whether the sample function always returns the same sample for
+        the same parameters, such that the simulations can be cached.
     """
 
     def __init__(self,
                  sample_function: Callable[[Parameter], Any],
-                 name=None):
+                 name=None,
+                 sample_batch_function: Callable[[pd.DataFrame], list] = None,
+                 deterministic: bool = False):
         if name is None:
             name = sample_function.__name__
         super().__init__(name)
         self.sample_function = sample_function
+        self.sample_batch_function = sample_batch_function
+        self.supports_batch = sample_batch_function is not None
+        self.deterministic = deterministic
 
     def sample(self, pars):
         return self.sample_function(pars)
 
+    def sample_batch(self, pars: pd.DataFrame) -> list:
+        if self.sample_batch_function is None:
+            return super().sample_batch(pars)
+        return self.sample_batch_function(pars)
+
     @staticmethod
     def assert_model(model_or_function):
         """
@@ -298,6 +436,10 @@ class IntegratedModel(Model):
 
     Subclass this model and implement ``integrated_simulate`` to define
     your own integrated model..
+
+    If the summary statistics are produced in chunks, e.g. one time point
+    after the other, consider the :class:`StreamingModel` instead, for
+    which the aborting is done by pyABC, based on the distance function.
     """
 
     def integrated_simulate(self, pars, eps: float) -> ModelResult:
@@ -343,3 +485,126 @@ class IntegratedModel(Model):
                acceptor: Acceptor,
                x_0: dict):
         return self.integrated_simulate(pars, eps_calculator(t))
+
+
+class StreamingModel(Model):
+    """
+    A model which simulates its summary statistics in chunks, e.g. one
+    time point or replicate after the other, such that simulations can be
+    aborted as soon as their distance is known to exceed the acceptance
+    threshold.
+
+    Subclass this model and implement ``sample_stream``, a generator
+    yielding dictionaries of summary statistics. After each chunk, the
+    :meth:`pyabc.DistanceFunction.lower_bound` of the summary statistics
+    simulated so far is compared to the current epsilon, and the
+    simulation is rejected without requesting further chunks once the
+    bound exceeds it. This assumes that acceptance requires the distance
+    to be below the current epsilon, as for the default acceptors.
+    :class:`pyabc.PNormDistance` and
+    :class:`pyabc.AdaptivePNormDistance` provide such a bound, for other
+    distance functions the simulations always run to completion.
+
+    The chunks are the summary statistics, i.e. as for the
+    :class:`IntegratedModel`, the summary statistics calculator passed to
+    :class:`pyabc.smc.ABCSMC` is not applied. The chunks should provide
+    disjoint keys. The partial summary statistics of aborted simulations
+    are not recorded as rejected summary statistics. Otherwise, e.g. the
+    scales of the :class:`pyabc.AdaptivePNormDistance` would be estimated
+    for later chunks only from the simulations that got that far, and for
+    earlier chunks from all simulations.
+
+    Per generation, the counters ``stream_chunks`` (number of simulated
+    chunks) and ``stream_aborted`` (number of aborted simulations) are
+    recorded, see :meth:`pyabc.History.get_population_counters`, and,
+    if ``n_chunks`` is given, also ``stream_chunks_saved``.
+
+    Parameters
+    ----------
+
+    name: str, optional
+        A descriptive name of the model.
+
+    n_chunks: int, optional
+        The number of chunks of a complete simulation, if known, to
+        record the number of chunks saved by aborting simulations.
+    """
+
+    def __init__(self, name: str = "model", n_chunks: int = None):
+        super().__init__(name)
+        self.n_chunks = n_chunks
+
+    def sample_stream(self, pars) -> Iterator[dict]:
+        """
+        Simulate the model at parameters ``pars`` chunk by chunk.
+
+        This method has to be implemented by any subclass.
+
+        Parameters
+        ----------
+
+        pars: Parameter
+            Dictionary of parameters.
+
+        Returns
+        -------
+
+        chunks: Iterator[dict]
+            The summary statistics, in chunks.
+        """
+        raise NotImplementedError()
+
+    def sample(self, pars):
+        sum_stats = {}
+        for chunk in self.sample_stream(pars):
+            sum_stats.update(chunk)
+        return sum_stats
+
+    def summary_statistics(self,
+                           t,
+                           pars,
+                           sum_stats_calculator) -> ModelResult:
+        return ModelResult(sum_stats=self.sample(pars))
+
+    def accept(self,
+               t: int,
+               pars,
+               sum_stats_calculator,
+               distance_calculator: DistanceFunction,
+               eps_calculator: Epsilon,
+               acceptor: Acceptor,
+               x_0: dict):
+        eps = eps_calculator(t)
+        sum_stats = {}
+        n_chunks = 0
+        stream = self.sample_stream(pars)
+        for chunk in stream:
+            sum_stats.update(chunk)
+            n_chunks += 1
+            bound = distance_calculator.lower_bound(t, sum_stats, x_0)
+            if bound > eps:
+                # stop the simulation
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+                return ModelResult(sum_stats=sum_stats,
+                                   distance=bound,
+                                   accepted=False,
+                                   counters=self._counters(n_chunks, True),
+                                   partial=True)
+
+        distance, accepted = acceptor(t,
+                                      distance_calculator,
+                                      eps_calculator,
+                                      sum_stats, x_0)
+        return ModelResult(sum_stats=sum_stats,
+                           distance=distance,
+                           accepted=accepted,
+                           counters=self._counters(n_chunks, False))
+
+    def _counters(self, n_chunks: int, aborted: bool) -> dict:
+        counters = {"stream_chunks": n_chunks,
+                    "stream_aborted": int(aborted)}
+        if self.n_chunks is not None:
+            counters["stream_chunks_saved"] = self.n_chunks - n_chunks
+        return counters
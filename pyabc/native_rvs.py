@@ -0,0 +1,244 @@
+"""
+Native random variables
+=======================
+
+NumPy implementations of the most common ``scipy.stats`` distributions.
+
+:class:`pyabc.random_variables.RV` forwards sampling and density
+evaluations to these instead of the ``scipy.stats`` frozen distributions
+where possible, avoiding their per-call argument checking. The
+parametrizations follow ``scipy.stats``, i.e. the shape parameters
+followed by ``loc`` and ``scale``.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from scipy import special
+
+
+class NativeRV(ABC):
+    """
+    Base class of the native random variables. Subclasses implement
+    ``rvs`` and the density and distribution functions on the standardized
+    variable ``y = (x - loc) / scale``.
+
+    Parameters
+    ----------
+
+    loc, scale: float
+        Location and scale, as in ``scipy.stats``.
+    """
+
+    def __init__(self, loc: float = 0, scale: float = 1):
+        self.loc = loc
+        self.scale = scale
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._log_scale = np.log(scale)
+
+    def valid(self) -> bool:
+        """
+        Whether the parameters define a valid distribution. If not,
+        scipy.stats is used instead, to reproduce its behavior.
+        """
+        return self.scale > 0
+
+    def rvs(self, size=None):
+        return self.loc + self.scale * self._standard_rvs(size)
+
+    def pdf(self, x):
+        return np.exp(self.logpdf(x))
+
+    def logpdf(self, x):
+        y = self._standardize(x)
+        return _scalar(self._standard_logpdf(y) - self._log_scale)
+
+    def cdf(self, x):
+        return _scalar(self._standard_cdf(self._standardize(x)))
+
+    def _standardize(self, x):
+        return (np.asarray(x, dtype=float) - self.loc) / self.scale
+
+    @abstractmethod
+    def _standard_rvs(self, size):
+        """
+        Sample the standardized variable.
+        """
+
+    @abstractmethod
+    def _standard_logpdf(self, y):
+        """
+        Log-density of the standardized variable.
+        """
+
+    @abstractmethod
+    def _standard_cdf(self, y):
+        """
+        Distribution function of the standardized variable.
+        """
+
+
+class NativeUniform(NativeRV):
+    """
+    Uniform distribution on [loc, loc + scale].
+    """
+
+    def _standard_rvs(self, size):
+        return np.random.random_sample(size)
+
+    def _standard_logpdf(self, y):
+        return np.where((y >= 0) & (y <= 1), 0., -np.inf)
+
+    def _standard_cdf(self, y):
+        return np.clip(y, 0, 1)
+
+
+class NativeNorm(NativeRV):
+    """
+    Normal distribution with mean loc and standard deviation scale.
+    """
+
+    _LOG_NORMALIZATION = .5 * np.log(2 * np.pi)
+
+    def rvs(self, size=None):
+        return np.random.normal(self.loc, self.scale, size)
+
+    def _standard_rvs(self, size):
+        return np.random.standard_normal(size)
+
+    def _standard_logpdf(self, y):
+        return -.5 * y**2 - self._LOG_NORMALIZATION
+
+    def _standard_cdf(self, y):
+        return special.ndtr(y)
+
+
+class NativeLognorm(NativeRV):
+    """
+    Log-normal distribution with shape parameter s, i.e.
+    ``loc + scale * exp(s * N)`` for a standard normal N.
+    """
+
+    def __init__(self, s: float, loc: float = 0, scale: float = 1):
+        super().__init__(loc, scale)
+        self.s = s
+
+    def valid(self):
+        return super().valid() and self.s > 0
+
+    def _standard_rvs(self, size):
+        return np.exp(self.s * np.random.standard_normal(size))
+
+    def _standard_logpdf(self, y):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_y = np.log(y)
+            return np.where(
+                y > 0,
+                -.5 * (log_y / self.s)**2 - log_y - np.log(self.s)
+                - NativeNorm._LOG_NORMALIZATION,
+                -np.inf)
+
+    def _standard_cdf(self, y):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(y > 0, special.ndtr(np.log(y) / self.s), 0.)
+
+
+class NativeBeta(NativeRV):
+    """
+    Beta distribution with shape parameters a and b on
+    [loc, loc + scale].
+    """
+
+    def __init__(self, a: float, b: float, loc: float = 0, scale: float = 1):
+        super().__init__(loc, scale)
+        self.a = a
+        self.b = b
+        self._log_beta = special.betaln(a, b)
+
+    def valid(self):
+        return super().valid() and self.a > 0 and self.b > 0
+
+    def _standard_rvs(self, size):
+        return np.random.beta(self.a, self.b, size)
+
+    def _standard_logpdf(self, y):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                (y >= 0) & (y <= 1),
+                special.xlogy(self.a - 1, y) + special.xlog1py(self.b - 1, -y)
+                - self._log_beta,
+                -np.inf)
+
+    def _standard_cdf(self, y):
+        return special.betainc(self.a, self.b, np.clip(y, 0, 1))
+
+
+class NativeGamma(NativeRV):
+    """
+    Gamma distribution with shape parameter a, shifted by loc and scaled
+    by scale.
+    """
+
+    def __init__(self, a: float, loc: float = 0, scale: float = 1):
+        super().__init__(loc, scale)
+        self.a = a
+        self._log_gamma = special.gammaln(a)
+
+    def valid(self):
+        return super().valid() and self.a > 0
+
+    def _standard_rvs(self, size):
+        return np.random.standard_gamma(self.a, size)
+
+    def _standard_logpdf(self, y):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(y >= 0,
+                            special.xlogy(self.a - 1, y) - y - self._log_gamma,
+                            -np.inf)
+
+    def _standard_cdf(self, y):
+        return special.gammainc(self.a, np.maximum(y, 0))
+
+
+#: The native random variables, by their names in scipy.stats.
+NATIVE_RVS = {
+    "uniform": NativeUniform,
+    "norm": NativeNorm,
+    "lognorm": NativeLognorm,
+    "beta": NativeBeta,
+    "gamma": NativeGamma,
+}
+
+
+def create_native_rv(name: str, *args, **kwargs):
+    """
+    Create the native random variable with the ``scipy.stats`` name and
+    arguments.
+
+    Returns
+    -------
+
+    native_rv: Union[NativeRV, None]
+        The native random variable, or None if there is none for the
+        name, or the arguments are not understood or invalid.
+    """
+    if name not in NATIVE_RVS:
+        return None
+    try:
+        native_rv = NATIVE_RVS[name](*args, **kwargs)
+    except TypeError:
+        return None
+    try:
+        if not native_rv.valid():
+            return None
+    except (TypeError, ValueError):
+        # e.g. array valued parameters
+        return None
+    return native_rv
+
+
+def _scalar(values):
+    """
+    Return 0-dimensional arrays as scalars.
+    """
+    return values[()]
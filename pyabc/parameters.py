@@ -1,6 +1,14 @@
 from collections import UserDict
 
 
+def _is_nested(value) -> bool:
+    """
+    Whether `value` is a nested dictionary to be flattened. Nested
+    parameters are not flattened.
+    """
+    return isinstance(value, dict) and not isinstance(value, Parameter)
+
+
 class ParameterStructure(UserDict):
     """
     Basic functionality of a structure containing parameters.
@@ -10,7 +18,7 @@ class ParameterStructure(UserDict):
     def flatten_dict(dict_: dict):
         new_dict = {}
         for key, value in dict_.items():
-            if isinstance(value, dict):
+            if _is_nested(value):
                 flattened = ParameterStructure.flatten_dict(value)
                 for key_flat, value_flat in flattened.items():
                     new_dict.update({str(key) + "." + key_flat: value_flat})
@@ -30,7 +38,7 @@ class ParameterStructure(UserDict):
         super().__init__(flattened)
 
 
-class Parameter(ParameterStructure):
+class Parameter(dict):
     """
     A single model parameter.
 
@@ -55,13 +63,33 @@ class Parameter(ParameterStructure):
         >>> p = Parameter({"a": 1, "b": 2})
         >>> assert p.a == p["a"]
 
+    Nested dictionaries are flattened as for the
+    :class:`ParameterStructure`. As parameters are created for every
+    simulation and sent back from the workers, they are plain dictionaries
+    without an instance dictionary, and flattening is skipped if the
+    dictionary is already flat.
     """
 
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > 0 and len(kwargs) > 0:
+            raise Exception("Only keyword or dictionary allowed")
+        if len(args) > 0:
+            dict_ = args[0]
+            if not isinstance(dict_, dict):
+                dict_ = dict(dict_.items())
+        else:
+            dict_ = kwargs
+        if any(map(_is_nested, dict_.values())):
+            dict_ = ParameterStructure.flatten_dict(dict_)
+        super().__init__(dict_)
+
     def __add__(self, other: "Parameter") -> "Parameter":
-        return Parameter(**{key: self[key] + other[key] for key in self})
+        return Parameter({key: self[key] + other[key] for key in self})
 
     def __sub__(self, other: "Parameter") -> "Parameter":
-        return Parameter(**{key: self[key] - other[key] for key in self})
+        return Parameter({key: self[key] - other[key] for key in self})
 
     def __repr__(self):
         return "<Parameter " + super().__repr__()[1:-1] + ">"
@@ -73,16 +101,13 @@ class Parameter(ParameterStructure):
         try:
             return self[item]
         except KeyError:
-            raise AttributeError
-
-    def __getstate__(self):
-        return dict(self)
+            raise AttributeError(item)
 
-    def __setstate__(self, state):
-        self.data = state
+    def __reduce__(self):
+        return Parameter, (dict(self),)
 
     def copy(self) -> "Parameter":
         """
         Copy the parameter.
         """
-        return Parameter(**self)
+        return Parameter(self)
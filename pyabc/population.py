@@ -8,10 +8,14 @@ iteration.
 """
 
 
+import logging
 from typing import List, Callable
+import numpy as np
 import pandas as pd
 from pyabc.parameters import Parameter
 
+logger = logging.getLogger("Population")
+
 
 class Particle:
     """
@@ -54,6 +58,16 @@ class Particle:
     accepted: bool
         True if particle was accepted, False if not.
 
+    log_weight: float, optional
+        The logarithm of the weight. If given, it is used instead of
+        ``weight`` for the normalization of the weights in a population,
+        such that weights too small to be represented do not underflow.
+
+    counters: dict, optional
+        Numeric counters of the simulations of this particle, e.g. the
+        number of early rejected simulations. They are summed up over a
+        generation and stored in the history.
+
     .. note::
         There are two different ways of weighting particles: First, the weights
         can be calculated as emerges from the importance sampling. Second, the
@@ -65,8 +79,16 @@ class Particle:
         stored in the database. If one needs access to the first weighting
         scheme later on again, one has to perform backwards transformation,
         multiplying the weights with the model probabilities.
+
+    As a particle is created for every simulation and sent back from the
+    workers, it has slots instead of an instance dictionary and is pickled
+    as a plain tuple of its attributes.
     """
 
+    __slots__ = ("m", "parameter", "weight", "accepted_sum_stats",
+                 "accepted_distances", "rejected_sum_stats",
+                 "rejected_distances", "accepted", "log_weight", "counters")
+
     def __init__(self,
                  m: int,
                  parameter: Parameter,
@@ -75,7 +97,9 @@ class Particle:
                  accepted_distances: List[float],
                  rejected_sum_stats: List[dict] = None,
                  rejected_distances: List[float] = None,
-                 accepted: bool = True):
+                 accepted: bool = True,
+                 log_weight: float = None,
+                 counters: dict = None):
 
         self.m = m
         self.parameter = parameter
@@ -89,6 +113,46 @@ class Particle:
             rejected_distances = []
         self.rejected_distances = rejected_distances
         self.accepted = accepted
+        self.log_weight = log_weight
+        self.counters = counters
+
+    def __reduce__(self):
+        return Particle, (self.m, self.parameter, self.weight,
+                          self.accepted_sum_stats, self.accepted_distances,
+                          self.rejected_sum_stats, self.rejected_distances,
+                          self.accepted, self.log_weight, self.counters)
+
+
+def add_counters(counters: dict, other: dict) -> dict:
+    """
+    Add the numeric counters in ``other`` to ``counters``, in place.
+
+    Returns
+    -------
+
+    counters: dict
+        The updated counters.
+    """
+    for key, value in other.items():
+        counters[key] = counters.get(key, 0) + value
+    return counters
+
+
+def _as_dict(parameter) -> dict:
+    """
+    Plain dictionary view of a Parameter, dictionary or pd.Series.
+    """
+    if isinstance(parameter, dict):
+        return parameter
+    return dict(parameter)
+
+
+def _is_integer(value) -> bool:
+    """
+    Whether the parameter value is an integer, but not a bool.
+    """
+    return (isinstance(value, (int, np.integer))
+            and not isinstance(value, (bool, np.bool_)))
 
 
 class Population:
@@ -96,49 +160,189 @@ class Population:
     A population contains a list of particles and offers standardized access
     to them. Upon initialization, the particle weights are normalized and model
     probabilities computed as described in _normalize_weights.
+
+    Internally, the population is stored as a struct of arrays: a vector of
+    model indices, a vector of weights, a parameter matrix with one column
+    per parameter name, and the concatenated accepted distances and summary
+    statistics of all particles. Per-generation reductions are thus
+    performed on NumPy arrays. The particles returned by :meth:`get_list`
+    and :meth:`to_dict` are views created on demand; modifying them does
+    not affect the population. The views carry the normalized weights and
+    log-weights, the counters, and integer parameters as ints.
     """
 
     def __init__(self, particles: List[Particle]):
-        self._list = particles.copy()
+        if any(particle is None for particle in particles):
+            logger.warning("Empty particle.")
+            particles = [particle for particle in particles
+                         if particle is not None]
+        n_particles = len(particles)
+
+        self._m = np.fromiter((particle.m for particle in particles),
+                              dtype=int, count=n_particles)
+        with np.errstate(divide="ignore"):
+            self._log_weight = np.fromiter(
+                (np.log(particle.weight) if particle.log_weight is None
+                 else particle.log_weight for particle in particles),
+                dtype=float, count=n_particles)
+        self._accepted = np.fromiter(
+            (particle.accepted for particle in particles),
+            dtype=bool, count=n_particles)
+        # counters, only if there are any
+        self._counters = None
+        if any(particle.counters is not None for particle in particles):
+            self._counters = [particle.counters for particle in particles]
+
+        # parameters, as matrix over the union of all parameter names, and
+        # the parameter names per model
+        self._model_parameter_names = {}
+        for particle in particles:
+            self._model_parameter_names.setdefault(
+                int(particle.m), list(particle.parameter.keys()))
+        self._parameter_names = list(dict.fromkeys(
+            key for keys in self._model_parameter_names.values()
+            for key in keys))
+        self._model_columns = {
+            m: np.array([self._parameter_names.index(key) for key in keys],
+                        dtype=int)
+            for m, keys in self._model_parameter_names.items()}
+        self._parameters = self._parameter_matrix(particles)
+
+        # accepted summary statistics and distances, concatenated over all
+        # particles
+        self._n_sum_stats = np.fromiter(
+            (len(particle.accepted_distances) for particle in particles),
+            dtype=int, count=n_particles)
+        self._offsets = np.concatenate(([0], np.cumsum(self._n_sum_stats)))
+        self._accepted_sum_stats = [
+            sum_stat for particle in particles
+            for sum_stat in particle.accepted_sum_stats]
+        self._accepted_distances = np.array(
+            [distance for particle in particles
+             for distance in particle.accepted_distances], dtype=float)
+
+        # rejected summary statistics and distances, only if there are any
+        self._rejected = None
+        if any(particle.rejected_sum_stats or particle.rejected_distances
+               for particle in particles):
+            self._rejected = [
+                (particle.rejected_sum_stats, particle.rejected_distances)
+                for particle in particles]
+
         self._model_probabilities = None
         self._normalize_weights()
+        # weights per accepted summary statistic, created lazily
+        self._accepted_weights = None
+
+    def _parameter_matrix(self, particles: List[Particle]) -> np.ndarray:
+        """
+        Create the parameter matrix, with NaN for parameters not defined
+        for a particle. If the parameters cannot be represented as floats,
+        the Parameter objects are kept in an object array instead.
+        """
+        names = self._parameter_names
+        # columns holding only integers, converted back in the views
+        self._integer_columns = np.zeros(len(names), dtype=bool)
+        if all(list(particle.parameter.keys())
+               == self._model_parameter_names[int(particle.m)]
+               for particle in particles):
+            rows = [[parameter.get(key, np.nan) for key in names]
+                    for parameter in map(_as_dict, (
+                        particle.parameter for particle in particles))]
+            try:
+                matrix = np.array(rows, dtype=float).reshape(
+                    len(particles), len(names))
+            except (TypeError, ValueError):
+                pass
+            else:
+                # np.nan marks the parameters not defined for a particle
+                self._integer_columns = np.array(
+                    [all(_is_integer(row[j]) for row in rows
+                         if row[j] is not np.nan)
+                     for j in range(len(names))], dtype=bool)
+                return matrix
+        parameters = np.empty(len(particles), dtype=object)
+        parameters[:] = [particle.parameter for particle in particles]
+        return parameters
 
     def __len__(self):
-        return len(self._list)
+        return len(self._m)
 
     def get_list(self) -> List[Particle]:
         """
         Returns
         -------
 
-        A copy of the underlying particle list.
+        A list of particle views, in the original order.
         """
+        return [self._particle(i) for i in range(len(self))]
 
-        return self._list.copy()
+    def _particle(self, i: int) -> Particle:
+        """
+        Create a view of the i-th particle.
+        """
+        m = int(self._m[i])
+        if self._parameters.dtype == object:
+            parameter = self._parameters[i]
+        else:
+            columns = self._model_columns[m]
+            values = [int(value) if is_integer else value
+                      for value, is_integer in zip(
+                          self._parameters[i, columns].tolist(),
+                          self._integer_columns[columns])]
+            parameter = Parameter(
+                dict(zip(self._model_parameter_names[m], values)))
+        start, end = self._offsets[i], self._offsets[i + 1]
+        if self._rejected is not None:
+            rejected_sum_stats, rejected_distances = self._rejected[i]
+        else:
+            rejected_sum_stats, rejected_distances = [], []
+        return Particle(
+            m=m,
+            parameter=parameter,
+            weight=float(self._weight[i]),
+            accepted_sum_stats=self._accepted_sum_stats[start:end],
+            accepted_distances=self._accepted_distances[start:end].tolist(),
+            rejected_sum_stats=rejected_sum_stats,
+            rejected_distances=rejected_distances,
+            accepted=bool(self._accepted[i]),
+            log_weight=float(self._normalized_log_weight[i]),
+            counters=(self._counters[i] if self._counters is not None
+                      else None))
 
     def _normalize_weights(self):
         """
         Normalize the cumulative weight of the particles belonging to a model
         to 1, and compute the model probabilities. Should only be called once.
-        """
-
-        store = self.to_dict()
 
-        model_total_weights = {m: sum(particle.weight for particle in plist)
-                               for m, plist in store.items()}
-        population_total_weight = sum(model_total_weights.values())
-        model_probabilities = {m: w / population_total_weight
-                               for m, w in model_total_weights.items()}
-
-        # update model_probabilities attribute
+        The normalization is performed on the log-weights via log-sum-exp,
+        such that it does not underflow.
+        """
+        models, model_ixs = np.unique(self._m, return_inverse=True)
+        log_weight = self._log_weight
+
+        # log-sum-exp per model, shifted by the maximum log-weight per model
+        shifts = np.full(len(models), -np.inf)
+        np.maximum.at(shifts, model_ixs, log_weight)
+        shifts[~np.isfinite(shifts)] = 0
+        with np.errstate(divide="ignore"):
+            model_log_total_weights = shifts + np.log(np.bincount(
+                model_ixs, weights=np.exp(log_weight - shifts[model_ixs]),
+                minlength=len(models)))
+        population_log_total_weight = np.logaddexp.reduce(
+            model_log_total_weights)
+
+        # model probabilities, in the order of first occurrence
+        model_probabilities = dict.fromkeys(self._model_parameter_names)
+        for m, model_log_total_weight in zip(models, model_log_total_weights):
+            model_probabilities[int(m)] = float(np.exp(
+                model_log_total_weight - population_log_total_weight))
         self._model_probabilities = model_probabilities
 
         # normalize weights within each model
-        for m in store:
-            model_total_weight = model_total_weights[m]
-            plist = store[m]
-            for particle in plist:
-                particle.weight /= model_total_weight
+        self._normalized_log_weight = \
+            log_weight - model_log_total_weights[model_ixs]
+        self._weight = np.exp(self._normalized_log_weight)
 
     def update_distances(self,
                          distance_to_ground_truth: Callable[[dict], float]):
@@ -151,11 +355,64 @@ class Population:
         :param distance_to_ground_truth:
             Distance function to the observed summary statistics.
         """
+        self._accepted_distances = np.array(
+            [distance_to_ground_truth(sum_stat)
+             for sum_stat in self._accepted_sum_stats], dtype=float)
 
-        for particle in self._list:
-            for i in range(len(particle.accepted_distances)):
-                particle.accepted_distances[i] = distance_to_ground_truth(
-                    particle.accepted_sum_stats[i])
+    def update_distances_batch(
+            self,
+            distances_to_ground_truth: Callable[[List[dict]], np.ndarray]):
+        """
+        As :meth:`update_distances`, but evaluating the distances of all
+        summary statistics of all particles in a single call.
+
+        :param distances_to_ground_truth:
+            Batched distance function, mapping a list of summary statistics
+            to the array of their distances to the observed summary
+            statistics.
+        """
+        self._accepted_distances = np.array(
+            distances_to_ground_truth(self._accepted_sum_stats), dtype=float)
+
+    def get_accepted_sum_stats(self) -> List[dict]:
+        """
+        Returns
+        -------
+
+        sum_stats: List[dict]
+            The accepted summary statistics of all particles, concatenated
+            in the order of the particles.
+        """
+        return self._accepted_sum_stats
+
+    def get_accepted_distances(self) -> np.ndarray:
+        """
+        Returns
+        -------
+
+        distances: np.ndarray
+            The accepted distances of all particles, in the order of
+            ``get_accepted_sum_stats``.
+        """
+        return self._accepted_distances.copy()
+
+    def get_accepted_weights(self) -> np.ndarray:
+        """
+        Returns
+        -------
+
+        weights: np.ndarray
+            The particle weights multiplied by the model probabilities,
+            repeated for each accepted summary statistic of a particle, in
+            the order of ``get_accepted_sum_stats``.
+        """
+        if self._accepted_weights is None:
+            model_probabilities = np.array(
+                [self._model_probabilities[m] for m in self._m.tolist()],
+                dtype=float)
+            self._accepted_weights = np.repeat(
+                self._weight * model_probabilities, self._n_sum_stats)
+        return self._accepted_weights
 
     def get_model_probabilities(self) -> dict:
         """
@@ -171,6 +428,37 @@ class Population:
         # _model_probabilities are assigned during normalization
         return self._model_probabilities
 
+    def get_parameters(self, m: int = 0) -> (pd.DataFrame, np.ndarray):
+        """
+        Get the parameters and weights of the particles of model m, in the
+        format of :meth:`pyabc.History.get_distribution`.
+
+        Parameters
+        ----------
+
+        m: int, optional (default = 0)
+            The model index.
+
+        Returns
+        -------
+
+        parameters, weights: pd.DataFrame, np.ndarray
+            The parameters, one column per parameter name in sorted order,
+            and the weights normalized within the model.
+        """
+        ixs = np.flatnonzero(self._m == m)
+        names = self._model_parameter_names.get(m, [])
+        if self._parameters.dtype == object:
+            parameters = pd.DataFrame(
+                [dict(parameter) for parameter in self._parameters[ixs]],
+                columns=names)
+        else:
+            parameters = pd.DataFrame(
+                self._parameters[np.ix_(ixs, self._model_columns.get(
+                    m, np.array([], dtype=int)))],
+                columns=names)
+        return parameters[sorted(names)], self._weight[ixs]
+
     def get_weighted_distances(self) -> pd.DataFrame:
         """
         Create DataFrame of (distance, weight)'s. The particle weights are
@@ -186,14 +474,10 @@ class Population:
             A pd.DataFrame containing in column 'distance' the distances
             and in column 'w' the scaled weights.
         """
-        rows = []
-        for particle in self._list:
-            model_probability = self._model_probabilities[particle.m]
-            for distance in particle.accepted_distances:
-                rows.append({'distance': distance,
-                             'w': particle.weight * model_probability})
-
-        weighted_distances = pd.DataFrame(rows)
+        weighted_distances = pd.DataFrame(
+            {'distance': self.get_accepted_distances(),
+             'w': self.get_accepted_weights().copy()},
+            columns=['distance', 'w'])
 
         return weighted_distances
 
@@ -206,18 +490,10 @@ class Population:
         -------
 
         store: dict
-            A dictionary with the models as keys and a list of particles for
-            each model as values.
+            A dictionary with the models as keys and a list of particle
+            views for each model as values.
         """
-
-        store = dict()
-
-        for particle in self._list:
-            if particle is not None:
-                # append particle for key particle.m, create empty list
-                # if key not yet existent
-                store.setdefault(particle.m, []).append(particle)
-            else:
-                print("Warning: Empty particle.")
-
+        store = {m: [] for m in self._model_parameter_names}
+        for i, m in enumerate(self._m.tolist()):
+            store[m].append(self._particle(i))
         return store
@@ -6,8 +6,12 @@ Random variables
 
 import logging
 from abc import ABC, abstractmethod
-from functools import reduce
-from typing import Union
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+from .native_rvs import create_native_rv
 from .parameters import Parameter, ParameterStructure
 
 rv_logger = logging.getLogger("RV")
@@ -107,6 +111,22 @@ class RVBase(ABC):
             Cumulative distribution function at x.
         """
 
+    def logpmf(self, x, *args, **kwargs) -> float:
+        """
+        Logarithm of the probability mass function, defaulting to the
+        logarithm of ``pmf``.
+        """
+        with np.errstate(divide="ignore"):
+            return np.log(self.pmf(x, *args, **kwargs))
+
+    def logpdf(self, x: float, *args, **kwargs) -> float:
+        """
+        Logarithm of the probability density function, defaulting to the
+        logarithm of ``pdf``.
+        """
+        with np.errstate(divide="ignore"):
+            return np.log(self.pdf(x, *args, **kwargs))
+
 
 class RV(RVBase):
     """
@@ -125,6 +145,14 @@ class RV(RVBase):
     kwargs:
         Keyword arguments as in ``scipy.stats``
         matching the distribution with name "name".
+
+    .. note::
+
+        For the uniform, normal, log-normal, beta and gamma distributions,
+        ``rvs``, ``pdf``, ``logpdf`` and ``cdf`` are evaluated by native
+        NumPy implementations (see :mod:`pyabc.native_rvs`), which avoid
+        the per-call overhead of ``scipy.stats``. All other methods are
+        taken from the ``scipy.stats`` distribution.
     """
 
     @classmethod
@@ -160,6 +188,8 @@ class RV(RVBase):
         self.kwargs = kwargs
         self.distribution = None
         "the scipy.stats. ... distribution object"
+        self.native = None
+        "the native implementation, if available"
         self.__setstate__(self.__getstate__())
 
     def __getattr__(self, item):
@@ -175,22 +205,37 @@ class RV(RVBase):
         import scipy.stats as st
         distribution = getattr(st, self.name)
         self.distribution = distribution(*self.args, **self.kwargs)
+        self.native = create_native_rv(self.name, *self.args, **self.kwargs)
 
     def copy(self):
         return self.__class__(self.name, *self.args, **self.kwargs)
 
     def rvs(self, *args, **kwargs):
+        if self.native is not None and not args and kwargs.keys() <= {"size"}:
+            return self.native.rvs(**kwargs)
         return self.distribution.rvs(*args, **kwargs)
 
     def pmf(self, x, *args, **kwargs):
         return self.distribution.pmf(x, *args, **kwargs)
 
     def pdf(self, x, *args, **kwargs):
+        if self.native is not None and not args and not kwargs:
+            return self.native.pdf(x)
         return self.distribution.pdf(x, *args, **kwargs)
 
     def cdf(self, x, *args, **kwargs):
+        if self.native is not None and not args and not kwargs:
+            return self.native.cdf(x)
         return self.distribution.cdf(x, *args, **kwargs)
 
+    def logpmf(self, x, *args, **kwargs):
+        return self.distribution.logpmf(x, *args, **kwargs)
+
+    def logpdf(self, x, *args, **kwargs):
+        if self.native is not None and not args and not kwargs:
+            return self.native.logpdf(x)
+        return self.distribution.logpdf(x, *args, **kwargs)
+
     def __repr__(self):
         return ("<RV(name={name}, args={args} kwargs={kwargs})>"
                 .format(name=self.name, args=self.args, kwargs=self.kwargs))
@@ -232,6 +277,12 @@ class RVDecorator(RVBase):
     def cdf(self, x, *args, **kwargs):
         return self.component.cdf(x, *args, **kwargs)
 
+    def logpmf(self, x, *args, **kwargs):
+        return self.component.logpmf(x, *args, **kwargs)
+
+    def logpdf(self, x, *args, **kwargs):
+        return self.component.logpdf(x, *args, **kwargs)
+
     def copy(self):
         return self.__class__(self.component.copy())
 
@@ -286,10 +337,13 @@ class LowerBoundDecorator(RVDecorator):
     MAX_TRIES = 10000
 
     def __init__(self, component: RV, lower_bound: float):
-        if component.cdf(lower_bound) == 1:
+        lower_mass = component.cdf(lower_bound)
+        if lower_mass == 1:
             raise Exception(
                 "LowerBoundDecorator: Conditioning on a set of measure zero.")
         self.lower_bound = lower_bound
+        # probability mass above the lower bound
+        self.normalization = 1 - lower_mass
         super(LowerBoundDecorator, self).__init__(component)
 
     def copy(self):
@@ -298,7 +352,9 @@ class LowerBoundDecorator(RVDecorator):
     def decorator_repr(self):
         return "Lower: X > {lower:2f}".format(lower=self.lower_bound)
 
-    def rvs(self, *args, **kwargs):
+    def rvs(self, *args, size=None, **kwargs):
+        if size is not None:
+            return self._rvs_batch(size)
         for _ in range(LowerBoundDecorator.MAX_TRIES):
             sample = self.component.rvs()
             # not sure whether > is the exact opposite. but <= is consistent
@@ -306,17 +362,62 @@ class LowerBoundDecorator(RVDecorator):
                 return sample  # with the other functions
         return None
 
+    def _rvs_batch(self, size: int) -> np.ndarray:
+        """
+        Sample `size` values via batched rejection. Values for which no
+        sample within the permitted range was found within MAX_TRIES
+        tries are NaN.
+        """
+        samples = np.full(size, np.nan)
+        missing = np.arange(size)
+        n_tries = 0
+        while len(missing) > 0 and n_tries < LowerBoundDecorator.MAX_TRIES:
+            proposals = np.atleast_1d(
+                self.component.rvs(size=len(missing))).astype(float)
+            valid = ~(proposals <= self.lower_bound)
+            samples[missing[valid]] = proposals[valid]
+            missing = missing[~valid]
+            n_tries += 1
+        return samples
+
     def pdf(self, x, *args, **kwargs):
-        if x <= self.lower_bound:
-            return 0.
-        return (self.component.pdf(x)
-                / (1 - self.component.cdf(self.lower_bound)))
+        return self._conditioned(self.component.pdf, x)
 
     def pmf(self, x, *args, **kwargs):
-        if x <= self.lower_bound:
-            return 0.
-        return (self.component.pmf(x)
-                / (1 - self.component.cdf(self.lower_bound)))
+        return self._conditioned(self.component.pmf, x)
+
+    def logpdf(self, x, *args, **kwargs):
+        return self._log_conditioned(self.component.logpdf, x)
+
+    def logpmf(self, x, *args, **kwargs):
+        return self._log_conditioned(self.component.logpmf, x)
+
+    def _log_conditioned(self, log_density, x):
+        """
+        Logarithm of ``_conditioned``.
+        """
+        log_normalization = np.log(self.normalization)
+        if np.ndim(x) == 0:
+            if x <= self.lower_bound:
+                return -np.inf
+            return log_density(x) - log_normalization
+        x = np.asarray(x)
+        return np.where(x <= self.lower_bound, -np.inf,
+                        log_density(x) - log_normalization)
+
+    def _conditioned(self, density, x):
+        """
+        Condition the density (or mass) function to X > lower bound,
+        for scalar or array x.
+        """
+        normalization = self.normalization
+        if np.ndim(x) == 0:
+            if x <= self.lower_bound:
+                return 0.
+            return density(x) / normalization
+        x = np.asarray(x)
+        return np.where(x <= self.lower_bound, 0.,
+                        density(x) / normalization)
 
     def cdf(self, x, *args, **kwargs):
         if x <= self.lower_bound:
@@ -409,20 +510,93 @@ class Distribution(ParameterStructure):
 
         return sorted(self.keys())
 
-    def rvs(self) -> Parameter:
+    def get_column_names(self) -> List[str]:
+        """
+        Column names of the parameter matrices returned by ``rvs(size)``
+        and accepted by ``pdf`` and ``logpdf``. These are the sorted
+        parameter names, with nested distributions expanded in place into
+        the flattened names of their parameters.
+
+        Returns
+        -------
+
+        column_names: List[str]
+            The column names.
+        """
+        return [name for name, _ in self._flat_items()]
+
+    def _flat_items(self):
+        """
+        Iterate over (flattened name, random variable) pairs in column
+        order.
+        """
+        for key in self.get_parameter_names():
+            value = self[key]
+            if isinstance(value, Distribution):
+                for name, rv in value._flat_items():
+                    yield str(key) + "." + name, rv
+            else:
+                yield key, value
+
+    def rvs(self, size: int = None) -> Union[Parameter, np.ndarray]:
         """
         Sample from joint distribution
 
+        Parameters
+        ----------
+
+        size: int, optional
+            If None (default), a single parameter is sampled. Otherwise,
+            ``size`` parameters are sampled at once, calling each random
+            variable only once.
+
         Returns
         -------
 
-        parameter: Parameter
-            A parameter which was sampled.
+        parameter: Union[Parameter, np.ndarray]
+            A parameter which was sampled, or, if ``size`` is given, an
+            array of shape (size, n_columns) of sampled parameters, with
+            columns ordered as in ``get_column_names``.
         """
+        if size is None:
+            return Parameter(**{key: val.rvs() for key, val in self.items()})
+        columns = self._rvs_columns(size)
+        if not columns:
+            return np.empty((size, 0))
+        return np.column_stack(columns)
+
+    def rvs_parameters(self, size: int) -> List[Parameter]:
+        """
+        Sample ``size`` parameters at once.
+
+        As ``rvs(size)``, but returning a list of flat parameters. In
+        contrast to the array, integer valued random variables keep their
+        type.
+
+        Parameters
+        ----------
 
-        return Parameter(**{key: val.rvs() for key, val in self.items()})
+        size: int
+            Number of parameters to sample.
 
-    def pdf(self, x: Union[Parameter, dict]):
+        Returns
+        -------
+
+        parameters: List[Parameter]
+            The sampled parameters.
+        """
+        names = self.get_column_names()
+        columns = [column.tolist() for column in self._rvs_columns(size)]
+        if not columns:
+            return [Parameter() for _ in range(size)]
+        return [Parameter(dict(zip(names, row))) for row in zip(*columns)]
+
+    def _rvs_columns(self, size: int) -> List[np.ndarray]:
+        return [np.asarray(rv.rvs(size=size)).reshape(size)
+                for _, rv in self._flat_items()]
+
+    def pdf(self, x: Union[Parameter, dict, pd.Series, pd.DataFrame,
+                           np.ndarray]):
         """
         Get combination of probability density function (for continuous
         variables) and
@@ -430,26 +604,88 @@ class Distribution(ParameterStructure):
 
         Parameters
         ----------
-        x : Union[Parameter, dict]
-            Evaluate at the given Parameter ``x``.
+        x : Union[Parameter, dict, pd.Series, pd.DataFrame, np.ndarray]
+            Evaluate at the given Parameter ``x``. Alternatively, a
+            DataFrame or an array of shape (n, n_columns), with columns
+            ordered as in ``get_column_names``, to evaluate at n points
+            at once.
+
+        Returns
+        -------
+
+        density: Union[float, np.ndarray]
+            The density at ``x``, or an array of n densities.
+        """
+        if isinstance(x, (np.ndarray, pd.DataFrame)):
+            densities = np.ones(len(x))
+            for rv, column in zip(self._rvs(), self._columns(x)):
+                densities *= _density(rv, column)
+            return densities
+        self._check_keys(list(x.keys()))
+        res = 1
+        for key, val in x.items():
+            res = res * _density(self[key], val)
+        return res
+
+    def logpdf(self, x: Union[Parameter, dict, pd.Series, pd.DataFrame,
+                              np.ndarray]):
+        """
+        Logarithm of ``pdf``, evaluated as sum of the log-densities of the
+        individual variables.
+
+        Parameters
+        ----------
+        x : Union[Parameter, dict, pd.Series, pd.DataFrame, np.ndarray]
+            As for ``pdf``.
+
+        Returns
+        -------
+
+        log_density: Union[float, np.ndarray]
+            The log-density at ``x``, or an array of n log-densities.
+        """
+        if isinstance(x, (np.ndarray, pd.DataFrame)):
+            log_densities = np.zeros(len(x))
+            for rv, column in zip(self._rvs(), self._columns(x)):
+                log_densities += _log_density(rv, column)
+            return log_densities
+        self._check_keys(list(x.keys()))
+        res = 0
+        for key, val in x.items():
+            res = res + _log_density(self[key], val)
+        return res
+
+    def _rvs(self) -> List[RVBase]:
+        return [rv for _, rv in self._flat_items()]
+
+    def _columns(self, x: Union[pd.DataFrame, np.ndarray]) \
+            -> List[np.ndarray]:
+        """
+        Split a parameter matrix into columns, ordered as the random
+        variables.
+        """
+        names = self.get_column_names()
+        if isinstance(x, pd.DataFrame):
+            if len(x.columns) != len(names) or set(x.columns) != set(names):
+                raise Exception("Random variable parameter mismatch. "
+                                "Expected: " + str(names) +
+                                " got " + str(sorted(x.columns)))
+            return [x[name].values for name in names]
+        x = np.asarray(x)
+        if x.ndim != 2 or x.shape[1] != len(names):
+            raise Exception("Random variable parameter mismatch. Expected "
+                            "array with columns " + str(names) +
+                            " got shape " + str(x.shape))
+        return list(x.T)
+
+    def _check_keys(self, keys):
         """
-        # check if the parameters match
-        if sorted(x.keys()) != sorted(self.keys()):
+        Check that the parameters match.
+        """
+        if len(keys) != len(self) or any(key not in self for key in keys):
             raise Exception("Random variable parameter mismatch. Expected: " +
                             str(sorted(self.keys())) +
-                            " got " + str(sorted(x.keys())))
-        if len(self) > 0:
-            res = []
-            for key, val in x.items():
-                try:
-                    # works for continuous variables
-                    res.append(self[key].pdf(val))
-                except AttributeError:
-                    # discrete variables do not have a pdf but a pmf
-                    res.append(self[key].pmf(val))
-            return reduce(lambda s, t: s * t, res)
-        else:
-            return 1
+                            " got " + str(sorted(keys)))
 
 
 class ModelPerturbationKernel:
@@ -536,3 +772,28 @@ class ModelPerturbationKernel:
             return 1 if n == m else 0
         else:
             return self._get_discrete_rv(m).pmf(n)
+
+
+def _density(rv: RVBase, x):
+    """
+    Probability density of continuous, or probability mass of discrete,
+    random variables.
+    """
+    try:
+        # works for continuous variables
+        return rv.pdf(x)
+    except AttributeError:
+        # discrete variables do not have a pdf but a pmf
+        return rv.pmf(x)
+
+
+def _log_density(rv: RVBase, x):
+    """
+    Logarithm of ``_density``, computed in log-space.
+    """
+    try:
+        # works for continuous variables
+        return rv.logpdf(x)
+    except AttributeError:
+        # discrete variables do not have a pdf but a pmf
+        return rv.logpmf(x)
@@ -1,5 +1,6 @@
 from abc import ABC, ABCMeta, abstractmethod
-from pyabc.population import Particle, Population
+from pyabc.population import Particle, Population, add_counters
+from pyabc.weighted_statistics import WeightedMoments, WeightedQuantileSketch
 from typing import List, Callable
 
 
@@ -13,11 +14,69 @@ class Sample:
     record_rejected: bool
         Whether to record rejected particles as well, along with accepted
         ones.
+
+    sum_stats_estimator: optional
+        An estimator with methods ``update(sum_stat)``, ``merge(other)``
+        and ``__add__``, which is updated with the accepted and rejected
+        summary statistics of all appended particles, and merged when
+        samples are added.
+
+    distance_sketch_size: int, optional
+        If not None, the distances of the accepted summary statistics are
+        condensed into a
+        :class:`pyabc.weighted_statistics.WeightedQuantileSketch` of this
+        size, weighted by the particle weights.
+
+    Properties
+    ----------
+
+    accepted_moments: Dict[int, WeightedMoments]
+        The weighted moments of the parameters of the accepted particles
+        of positive weight, per model, accumulated while the particles are
+        appended. None for models with non-numeric parameters.
+
+    counters: dict
+        The sums of the counters of all appended particles, accepted or
+        not.
     """
 
-    def __init__(self, record_rejected: bool = False):
+    def __init__(self, record_rejected: bool = False,
+                 sum_stats_estimator=None,
+                 distance_sketch_size: int = None):
         self._particles = []
         self.record_rejected = record_rejected
+        self.accepted_moments = {}
+        self.counters = {}
+        # estimators and sketches are merged lazily on access
+        self._sum_stats_estimators = []
+        if sum_stats_estimator is not None:
+            self._sum_stats_estimators.append(sum_stats_estimator)
+        self._distance_sketches = []
+        if distance_sketch_size is not None:
+            self._distance_sketches.append(
+                WeightedQuantileSketch(distance_sketch_size))
+
+    @property
+    def sum_stats_estimator(self):
+        """
+        The summary statistics estimator, merged over all added samples,
+        or None if no estimator is used.
+        """
+        self._sum_stats_estimators = _merge_all(self._sum_stats_estimators)
+        if not self._sum_stats_estimators:
+            return None
+        return self._sum_stats_estimators[0]
+
+    @property
+    def distance_sketch(self) -> WeightedQuantileSketch:
+        """
+        The sketch of the weighted accepted distances, merged over all
+        added samples, or None if no sketch is used.
+        """
+        self._distance_sketches = _merge_all(self._distance_sketches)
+        if not self._distance_sketches:
+            return None
+        return self._distance_sketches[0]
 
     @property
     def all_sum_stats(self):
@@ -60,11 +119,61 @@ class Sample:
         if particle.accepted or self.record_rejected:
             self._particles.append(particle)
 
+        # accumulate parameter moments of accepted particles
+        if particle.accepted and particle.weight > 0:
+            self._update_moments(particle)
+
+        if particle.counters:
+            add_counters(self.counters, particle.counters)
+
+        # condense all summary statistics
+        for estimator in self._sum_stats_estimators:
+            for sum_stat in particle.accepted_sum_stats:
+                estimator.update(sum_stat)
+            for sum_stat in particle.rejected_sum_stats:
+                estimator.update(sum_stat)
+
+        # condense accepted distances
+        if particle.accepted:
+            for sketch in self._distance_sketches:
+                for distance in particle.accepted_distances:
+                    sketch.update(distance, particle.weight)
+
+    def _update_moments(self, particle: Particle):
+        """
+        Add the parameter of an accepted particle to the moments of its
+        model, unless the model has non-numeric parameters.
+        """
+        moments = self.accepted_moments.setdefault(
+            particle.m, WeightedMoments())
+        if moments is None:
+            return
+        try:
+            moments.update(particle.parameter, particle.weight)
+        except (TypeError, ValueError):
+            self.accepted_moments[particle.m] = None
+
     def __add__(self, other: "Sample"):
         sample = Sample(self.record_rejected)
         # sample's list of particles is the concatenation of both samples'
         # lists
         sample._particles = self._particles + other._particles
+        # merge the moments accumulated on both samples
+        for moments in (self.accepted_moments, other.accepted_moments):
+            for m, moments_m in moments.items():
+                merged = sample.accepted_moments.setdefault(
+                    m, WeightedMoments())
+                if merged is None or moments_m is None:
+                    sample.accepted_moments[m] = None
+                else:
+                    merged.merge(moments_m)
+        for counters in (self.counters, other.counters):
+            add_counters(sample.counters, counters)
+        # the estimators and sketches are only merged on access
+        sample._sum_stats_estimators = \
+            self._sum_stats_estimators + other._sum_stats_estimators
+        sample._distance_sketches = \
+            self._distance_sketches + other._distance_sketches
         return sample
 
     @property
@@ -102,16 +211,44 @@ class SampleFactory:
 
     record_rejected: bool
         Corresponds to Sample.record_rejected.
+
+    sum_stats_estimator_factory: Callable, optional
+        Creates an empty Sample.sum_stats_estimator for each sample. If
+        None, no estimator is used.
+
+    distance_sketch_size: int, optional
+        Corresponds to Sample.distance_sketch_size.
     """
 
-    def __init__(self, record_rejected: bool = False):
+    def __init__(self, record_rejected: bool = False,
+                 sum_stats_estimator_factory=None,
+                 distance_sketch_size: int = None):
         self.record_rejected = record_rejected
+        self.sum_stats_estimator_factory = sum_stats_estimator_factory
+        self.distance_sketch_size = distance_sketch_size
 
     def __call__(self):
         """
         Create a new empty sample.
         """
-        return Sample(self.record_rejected)
+        sum_stats_estimator = None
+        if self.sum_stats_estimator_factory is not None:
+            sum_stats_estimator = self.sum_stats_estimator_factory()
+        return Sample(self.record_rejected, sum_stats_estimator,
+                      self.distance_sketch_size)
+
+
+def _merge_all(items: list) -> list:
+    """
+    Merge a list of mergeable objects into a list of at most one merged
+    object, leaving the original objects unchanged.
+    """
+    if len(items) <= 1:
+        return items
+    merged = items[0] + items[1]
+    for item in items[2:]:
+        merged.merge(item)
+    return [merged]
 
 
 def wrap_sample(f):
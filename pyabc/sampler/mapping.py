@@ -35,10 +35,11 @@ latest/task.html#quick-and-easy-parallelism)
 
         and many other implementations.
 
-        Each of the mapped function calls samples until it gets one accepted
-        particle. This could have a performance impact if one of the sample
-        tasks runs very long and all the other tasks are already finished.
-        The sampler then has to wait until the last sample task is finished.
+        Each of the mapped function calls samples until it gets
+        ``acceptances_per_task`` accepted particles. This could have a
+        performance impact if one of the sample tasks runs very long and all
+        the other tasks are already finished. The sampler then has to wait
+        until the last sample task is finished.
 
     mapper_pickles: bool, optional
         Whether the mapper handles the pickling itself
@@ -54,39 +55,74 @@ latest/task.html#quick-and-easy-parallelism)
         For example, for the
         :class:`pyabc.sge.SGE` mapper, this option should be set to
         `True` for better performance.
+
+    acceptances_per_task: int, optional (default = 1)
+        The number of accepted particles each task samples. Fewer, longer
+        tasks reduce the scheduling and serialization overhead, as each task
+        carries the pickled simulation function.
+
+    over_submission: float, optional (default = 0)
+        The fraction of additional tasks submitted, to cover failed tasks.
+        Results are used in the order of submission until n particles
+        are accepted, such that fast tasks are not preferred. If the map
+        returns an iterator, e.g. ``multiprocessing.Pool.imap_unordered``,
+        the results of later tasks are not waited for. All simulations of
+        the received tasks count as evaluations, including the ones not
+        used. If failed tasks leave fewer than n accepted particles, a
+        RuntimeError naming the failed tasks is raised.
     """
 
-    def __init__(self, map_=map, mapper_pickles=False):
+    def __init__(self, map_=map, mapper_pickles=False,
+                 acceptances_per_task: int = 1,
+                 over_submission: float = 0):
         super().__init__()
         self.map_ = map_
         self.pickle, self.unpickle = ((identity, identity)
                                       if mapper_pickles
                                       else (pickle.dumps, pickle.loads))
+        self.acceptances_per_task = acceptances_per_task
+        self.over_submission = over_submission
 
     def __getstate__(self):
         return (self.pickle, self.unpickle,
-                self.nr_evaluations_, self.sample_factory)
+                self.nr_evaluations_, self.sample_factory,
+                self.acceptances_per_task, self.over_submission)
 
     def __setstate__(self, state):
         (self.pickle, self.unpickle, self.nr_evaluations_,
-         self.sample_factory) = state
+         self.sample_factory, self.acceptances_per_task,
+         self.over_submission) = state
+
+    def map_function(self, simulate_one, task_index):
+        """
+        Sample until ``acceptances_per_task`` particles are accepted.
 
-    def map_function(self, simulate_one, _):
+        Returns
+        -------
+
+        task_index, samples: int, List[Tuple[Sample, int]]
+            The index of the task, and, per accepted particle, a sample
+            containing it and the rejected particles before, together with
+            the number of simulations for it.
+        """
         simulate_one = self.unpickle(simulate_one)
 
         np.random.seed()
         random.seed()
-        nr_simulations = 0
-        sample = self._create_empty_sample()
+        samples = []
 
-        while True:
-            new_sim = simulate_one()
-            nr_simulations += 1
-            sample.append(new_sim)
-            if new_sim.accepted:
-                break
+        for _ in range(self.acceptances_per_task):
+            nr_simulations = 0
+            sample = self._create_empty_sample()
+            while True:
+                new_sim = simulate_one()
+                nr_simulations += 1
+                sample.append(new_sim)
+                if new_sim.accepted:
+                    break
+            samples.append((sample, nr_simulations))
 
-        return sample, nr_simulations
+        return task_index, samples
 
     def sample_until_n_accepted(self, n, simulate_one, all_accepted=False):
         # pickle them as a tuple instead of individual pickling
@@ -99,17 +135,51 @@ latest/task.html#quick-and-easy-parallelism)
         map_function = functools.partial(self.map_function,
                                          sample_simulate_accept)
 
-        counted_results = list(self.map_(map_function, [None] * n))
-        counted_results = filter(lambda x: not isinstance(x, Exception),
-                                 counted_results)
-        results, evals = zip(*counted_results)
+        n_tasks = int(np.ceil(np.ceil(n / self.acceptances_per_task)
+                              * (1 + self.over_submission)))
+
+        # collect the results until the tasks submitted first cover n
+        # acceptances, tasks which failed contributing none
+        task_samples = {}
+        failed_tasks = {}
+        n_accepted = 0
+        next_task = 0
+        nr_evaluations = 0
+        for position, result in enumerate(
+                self.map_(map_function, range(n_tasks))):
+            if isinstance(result, Exception):
+                # only mappers preserving the order return exceptions
+                task_samples[position] = []
+                failed_tasks[position] = result
+            else:
+                task_index, samples = result
+                task_samples[task_index] = samples
+                # also the simulations of tasks not used count
+                nr_evaluations += sum(evals for _, evals in samples)
+            while next_task in task_samples and n_accepted < n:
+                n_accepted += len(task_samples[next_task])
+                next_task += 1
+            if n_accepted >= n:
+                break
+
+        self.nr_evaluations_ = nr_evaluations
+
+        if n_accepted < n:
+            raise RuntimeError(
+                f"Only {n_accepted} of {n} particles were accepted, as "
+                f"{len(failed_tasks)} of {n_tasks} tasks failed: "
+                + "; ".join(f"task {task_index}: {error!r}"
+                            for task_index, error in failed_tasks.items())
+                + ". Consider increasing over_submission.")
 
-        # count all evaluations
-        self.nr_evaluations_ = sum(evals)
+        # the first n acceptances in the order of submission
+        results = [result
+                   for task_index in range(next_task)
+                   for result in task_samples[task_index]][:n]
 
         # aggregate all results to 1 to-be-returned sample
         sample = self._create_empty_sample()
-        for result in results:
+        for result, _ in results:
             sample += result
 
         return sample
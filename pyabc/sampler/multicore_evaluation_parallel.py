@@ -15,12 +15,19 @@ def work(simulate_one,
          n_acc: Value,
          n: int,
          all_accepted: bool,
-         sample_factory):
+         sample_factory,
+         batch_size: int):
     random.seed()
     np.random.seed()
 
     sample = sample_factory()
 
+    simulate_batch = getattr(simulate_one, "simulate_batch", None)
+    if simulate_batch is not None:
+        work_batches(simulate_batch, queue, n_eval, n_acc, n, all_accepted,
+                     sample_factory, batch_size)
+        return
+
     while n_acc.value < n and \
             (not all_accepted or n_eval.value < n):
         with n_eval.get_lock():
@@ -46,6 +53,45 @@ def work(simulate_one,
     queue.put(DONE)
 
 
+def work_batches(simulate_batch,
+                 queue,
+                 n_eval: Value,
+                 n_acc: Value,
+                 n: int,
+                 all_accepted: bool,
+                 sample_factory,
+                 batch_size: int):
+    """
+    Like :func:`work`, but reserve a block of contiguous evaluation ids and
+    simulate it at once. Each accepted particle is put into the queue with
+    its own id, such that the ordering by id is the same as for single
+    evaluations.
+    """
+    sample = sample_factory()
+
+    while n_acc.value < n and \
+            (not all_accepted or n_eval.value < n):
+        size = max(1, min(batch_size, n - n_acc.value))
+        with n_eval.get_lock():
+            if all_accepted:
+                size = max(1, min(size, n - n_eval.value))
+            first_id = n_eval.value
+            n_eval.value += size
+
+        for offset, new_sim in enumerate(simulate_batch(size)):
+            sample.append(new_sim)
+
+            if new_sim.accepted:
+                with n_acc.get_lock():
+                    n_acc.value += 1
+
+                queue.put((first_id + offset, sample))
+
+                sample = sample_factory()
+
+    queue.put(DONE)
+
+
 class MulticoreEvalParallelSampler(MultiCoreSampler):
     """
     Multicore Evaluation parallel sampler.
@@ -79,8 +125,18 @@ class MulticoreEvalParallelSampler(MultiCoreSampler):
     n_procs: int, optional
         If set to None, the Number of cores is determined according to
         :func:`pyabc.sge.nr_cores_available`.
+
+    batch_size: int, optional (default = 100)
+        If the model supports batch evaluation, each worker reserves
+        blocks of up to ``batch_size`` evaluation ids and simulates them at
+        once. The blocks are never larger than the number of still missing
+        acceptances.
     """
 
+    def __init__(self, n_procs=None, daemon=True, batch_size: int = 100):
+        super().__init__(n_procs, daemon)
+        self.batch_size = batch_size
+
     @property
     def n_procs(self):
         if self._n_procs is not None:
@@ -100,7 +156,7 @@ class MulticoreEvalParallelSampler(MultiCoreSampler):
             Process(target=work,
                     args=(simulate_one,
                           queue, n_eval, n_acc, n, all_accepted,
-                          self._create_empty_sample),
+                          self._create_empty_sample, self.batch_size),
                     daemon=self.daemon)
             for _ in range(self.n_procs)
         ]
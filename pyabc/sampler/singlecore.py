@@ -4,9 +4,27 @@ from .base import Sampler
 class SingleCoreSampler(Sampler):
     """
     Sample on a single core. No parallelization.
+
+    Parameters
+    ----------
+
+    batch_size: int, optional (default = 100)
+        Maximum number of parameters simulated at once if the model
+        supports batch evaluation. The batches are never larger than the
+        number of still missing acceptances. Simulations after the n-th
+        acceptance are discarded and not counted.
     """
 
+    def __init__(self, batch_size: int = 100):
+        super().__init__()
+        self.batch_size = batch_size
+
     def sample_until_n_accepted(self, n, simulate_one, all_accepted=False):
+        simulate_batch = getattr(simulate_one, "simulate_batch", None)
+        if simulate_batch is not None:
+            return self._sample_batches_until_n_accepted(
+                n, simulate_batch, all_accepted)
+
         nr_simulations = 0
         sample = self._create_empty_sample()
 
@@ -20,3 +38,25 @@ class SingleCoreSampler(Sampler):
         self.nr_evaluations_ = nr_simulations
 
         return sample
+
+    def _sample_batches_until_n_accepted(self, n, simulate_batch,
+                                         all_accepted=False):
+        nr_simulations = 0
+        n_accepted = 0
+        sample = self._create_empty_sample()
+
+        # if all are accepted, no more than n particles are simulated
+        while n_accepted < n and (not all_accepted or nr_simulations < n):
+            size = min(self.batch_size, n - n_accepted)
+            if all_accepted:
+                size = min(size, n - nr_simulations)
+            for new_sim in simulate_batch(size):
+                sample.append(new_sim)
+                nr_simulations += 1
+                if new_sim.accepted:
+                    n_accepted += 1
+                    if n_accepted == n:
+                        break
+        self.nr_evaluations_ = nr_simulations
+
+        return sample
@@ -10,14 +10,18 @@ two purposes:
 2. SGE.map can be used in a standalone mode to execute jobs on a SGE/UGE
    cluster. This is completely independent of ABC-SMC inference.
 
+The LocalSGE mapper runs the same array job pipeline in a local process
+pool, to test and profile it without a cluster.
+
 """
 
 from .util import nr_cores_available
 from .execution_contexts import (DefaultContext,
                                  ProfilingContext, NamedPrinter)
 from .sge import SGE
+from .local import LocalSGE
 from .util import sge_available
 
-__all__ = ["SGE", "sge_available", "nr_cores_available",
+__all__ = ["SGE", "LocalSGE", "sge_available", "nr_cores_available",
            "DefaultContext", "ProfilingContext",
            "NamedPrinter"]
@@ -1,10 +1,20 @@
+import os
 import sys
 
 from pyabc.sge.db import job_db_factory
 
-tmp_path = sys.argv[1]
-job_nr = sys.argv[2]
 
-# save end time to database
-job_db = job_db_factory(tmp_path)
-job_db.finish(int(job_nr))
+def cleanup_sge_array_job(tmp_path, job_nr):
+    """
+    Mark the task ``job_nr`` of the array job in ``tmp_path`` as finished.
+    """
+    # the mapper removes the directory once it received all results,
+    # which can happen before the last tasks get here
+    if os.path.isdir(tmp_path):
+        # save end time to database
+        job_db = job_db_factory(tmp_path)
+        job_db.finish(int(job_nr))
+
+
+if __name__ == "__main__":
+    cleanup_sge_array_job(sys.argv[1], sys.argv[2])
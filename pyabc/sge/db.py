@@ -11,7 +11,16 @@ def within_time(job_start_time, max_run_time_h):
 
 
 class SQLiteJobDB:
+    """
+    Job database in an SQLite file in the temporary directory of the job.
+
+    The table holds one row per task, created in a single batch by the
+    mapper, and indexed by the task ID and the status.
+    """
     SQLITE_DB_TIMEOUT = 2000
+    PENDING_STATE = "pending"
+    STARTED_STATE = "started"
+    FINISHED_STATE = "finished"
 
     def __init__(self, tmp_dir):
         self.connection = sqlite3.connect(os.path.join(tmp_dir, 'status.db'),
@@ -25,19 +34,25 @@ class SQLiteJobDB:
         with self.connection:
             self.connection.execute(
                 "CREATE TABLE IF NOT EXISTS "
-                "status(ID INTEGER, status TEXT, time REAL)")
+                "status(ID INTEGER PRIMARY KEY, status TEXT, "
+                "start REAL, finish REAL)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS status_status ON status(status)")
+            self.connection.executemany(
+                "INSERT INTO status(ID, status) VALUES(?,?)",
+                ((ID, self.PENDING_STATE) for ID in range(1, nr_jobs + 1)))
 
     def start(self, ID):
         with self.connection:
             self.connection.execute(
-                "INSERT INTO status VALUES(?,?,?)",
-                (ID, 'started', time.time()))
+                "UPDATE status SET status=?, start=? WHERE ID=?",
+                (self.STARTED_STATE, time.time(), ID))
 
     def finish(self, ID):
         with self.connection:
             self.connection.execute(
-                "INSERT INTO status VALUES(?,?,?)",
-                (ID, 'finished', time.time()))
+                "UPDATE status SET status=?, finish=? WHERE ID=?",
+                (self.FINISHED_STATE, time.time(), ID))
 
     def wait_for_job(self, ID, max_run_time_h):
         """
@@ -45,28 +60,62 @@ class SQLiteJobDB:
         Return false otherwise
         """
         with self.connection:
-            results = self.connection.execute(
-                "SELECT status, time from status WHERE ID="
-                + str(ID)).fetchall()
-            nr_rows = len(results)
+            row = self.connection.execute(
+                "SELECT status, start FROM status WHERE ID=?",
+                (ID,)).fetchone()
 
-        if nr_rows == 0:  # job not jet started
+        if row is None or row[0] == self.PENDING_STATE:
+            # job not jet started
             return True
-        if nr_rows == 1:  # job already started
-            job_start_time = results[0][1]
+        status, job_start_time = row
+        if status == self.STARTED_STATE:
             # job took to long
             if not within_time(job_start_time, max_run_time_h):
                 print('Job ' + str(ID) + ' timed out.')
                 return False  # job took to long
             else:  # still time left
                 return True
-        if nr_rows == 2:  # job finished
+        if status == self.FINISHED_STATE:
             return False
         # something not catched here
-        raise Exception('Something went wrong. nr_rows={}'.format(nr_rows))
+        raise Exception('Something went wrong. status={}'.format(status))
+
+    def pending(self, max_run_time_h):
+        """
+        The IDs of all jobs we should still wait for, i.e. which did not
+        start yet, or started and did neither finish nor time out.
+        """
+        with self.connection:
+            rows = self.connection.execute(
+                "SELECT ID FROM status WHERE status=? "
+                "OR (status=? AND start>?) ORDER BY ID",
+                (self.PENDING_STATE, self.STARTED_STATE,
+                 time.time() - max_run_time_h * 1.1 * 3600)).fetchall()
+        return [ID for ID, in rows]
+
+    def progress(self):
+        """
+        The number of jobs per status, as a dictionary with the keys
+        "pending", "started" and "finished".
+        """
+        with self.connection:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) FROM status "
+                "GROUP BY status").fetchall()
+        progress = {self.PENDING_STATE: 0, self.STARTED_STATE: 0,
+                    self.FINISHED_STATE: 0}
+        progress.update(rows)
+        return progress
 
 
 class RedisJobDB:
+    """
+    Job database on the Redis server configured in the ``REDIS`` section.
+
+    The task IDs are stored in a list, the status of each task in a hash.
+    Queries over all tasks are sent in a single pipeline.
+    """
+    PENDING_STATE = "pending"
     FINISHED_STATE = "finished"
     STARTED_STATE = "started"
 
@@ -97,10 +146,7 @@ class RedisJobDB:
         pipeline.execute()
 
     def create(self, nr_jobs):
-        pipeline = self.connection.pipeline()
-        for ID in range(1, nr_jobs+1):
-            pipeline.rpush(self.job_name, ID)
-        pipeline.execute()
+        self.connection.rpush(self.job_name, *range(1, nr_jobs + 1))
 
     def start(self, ID):
         self.connection.hmset(self.key(ID), {"status": self.STARTED_STATE,
@@ -128,6 +174,34 @@ class RedisJobDB:
 
         raise Exception('Something went wrong.')
 
+    def _all_values(self):
+        IDs = list(map(int, self.connection.lrange(self.job_name, 0, -1)))
+        pipeline = self.connection.pipeline()
+        for ID in IDs:
+            pipeline.hgetall(self.key(ID))
+        return zip(IDs, pipeline.execute())
+
+    def pending(self, max_run_time_h):
+        """
+        The IDs of all jobs we should still wait for, i.e. which did not
+        start yet, or started and did neither finish nor time out.
+        """
+        return [ID for ID, values in self._all_values()
+                if len(values) == 0
+                or (values["status"] == self.STARTED_STATE
+                    and within_time(float(values["time"]), max_run_time_h))]
+
+    def progress(self):
+        """
+        The number of jobs per status, as a dictionary with the keys
+        "pending", "started" and "finished".
+        """
+        progress = {self.PENDING_STATE: 0, self.STARTED_STATE: 0,
+                    self.FINISHED_STATE: 0}
+        for _, values in self._all_values():
+            progress[values.get("status", self.PENDING_STATE)] += 1
+        return progress
+
 
 def job_db_factory(tmp_path):
     """
@@ -0,0 +1,87 @@
+import sys
+from multiprocessing import Pool
+
+from .cleanup_sge_array_job import cleanup_sge_array_job
+from .execute_sge_array_job import execute_sge_array_job
+from .sge import SGE
+from .util import nr_cores_available
+
+
+def _run_task(tmp_dir, task_nr):
+    try:
+        execute_sge_array_job(tmp_dir, task_nr)
+    finally:
+        # a task which failed does not leave the mapper waiting
+        cleanup_sge_array_job(tmp_dir, task_nr)
+
+
+class LocalSGE(SGE):
+    """
+    Stand-in for the :class:`SGE` mapper which runs the array tasks in a
+    local process pool instead of submitting them with qsub.
+
+    Everything else is as for the :class:`SGE` mapper: the function and
+    the chunks of the array are pickled to the temporary directory, the
+    tasks are executed by the same code as on the cluster and report to
+    the same job database and result stream. This allows testing and
+    profiling the array job pipeline without a scheduler.
+
+    Parameters
+    ----------
+
+    n_procs: int, optional
+        Number of worker processes. Defaults to the number of available
+        cores, see :func:`nr_cores_available`.
+
+    All other parameters are passed on to :class:`SGE`. The ones
+    concerning the scheduler, such as the memory, queue or priority,
+    have no effect.
+    """
+
+    REQUIRES_SGE = False
+
+    def __init__(self, n_procs: int = None, **kwargs):
+        super().__init__(**kwargs)
+        self.n_procs = n_procs if n_procs is not None \
+            else nr_cores_available()
+        self._pool = None
+        self._async_results = {}
+
+    def __repr__(self):
+        return "<LocalSGE n_procs={} chunk_size={} tmp_dir={}>".format(
+            self.n_procs, self.chunk_size, self.config["DIRECTORIES"]["TMP"])
+
+    def _submit(self, tmp_dir, nr_tasks):
+        self._pool = Pool(min(self.n_procs, nr_tasks))
+        self._async_results = {
+            task_nr: self._pool.apply_async(_run_task, (tmp_dir, task_nr))
+            for task_nr in range(1, nr_tasks + 1)}
+        self._pool.close()
+
+    def _receive_results(self, result_stream, job_db, nr_tasks):
+        try:
+            task_results = super()._receive_results(
+                result_stream, job_db, nr_tasks)
+        except BaseException:
+            self._pool.terminate()
+            raise
+        # report why tasks did not send their results
+        for task_nr, async_result in self._async_results.items():
+            if task_nr in task_results:
+                continue
+            async_result.wait(1)
+            if async_result.ready() and not async_result.successful():
+                try:
+                    async_result.get()
+                except Exception as e:
+                    print("LocalSGE: Task", task_nr, "failed:", repr(e),
+                          file=sys.stderr)
+        self._async_results = {}
+        if len(task_results) == nr_tasks:
+            # only the cleanup of the tasks is left
+            self._pool.join()
+        else:
+            # tasks which crashed or timed out would block joining
+            self._pool.terminate()
+        self._pool = None
+        return task_results
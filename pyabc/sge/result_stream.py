@@ -0,0 +1,292 @@
+"""
+Result streams
+==============
+
+Transport of the results of the array tasks back to the
+:class:`pyabc.sge.SGE` mapper.
+
+The mapper opens the stream before submitting the job and stores its
+configuration in the job's temporary directory. The tasks load it from
+there via :func:`result_stream_factory` and send their results.
+"""
+
+import json
+import os
+import pickle
+import select
+import socket
+import struct
+import sys
+import time
+from typing import List, Tuple
+
+import cloudpickle
+import redis
+
+from .config import get_config
+
+CONFIG_FILE = "result_stream.json"
+
+
+class ResultStream:
+    """
+    Base class of the result streams.
+
+    Parameters
+    ----------
+
+    tmp_dir: str
+        The temporary directory of the job.
+    """
+
+    TYPE = None
+
+    def __init__(self, tmp_dir: str):
+        self.tmp_dir = tmp_dir
+
+    def open(self):
+        """
+        Called by the mapper before the job is submitted. Prepares
+        receiving and stores the configuration for the tasks.
+        """
+        with open(os.path.join(self.tmp_dir, CONFIG_FILE), "w") as my_file:
+            json.dump(dict(type=self.TYPE, **self.config()), my_file)
+
+    def config(self) -> dict:
+        """
+        The configuration the tasks need to send their results.
+        """
+        return {}
+
+    def send(self, task_nr: int, results: list):
+        """
+        Called by the tasks to send their results.
+        """
+        raise NotImplementedError()
+
+    def receive(self, timeout: float) -> List[Tuple[int, list]]:
+        """
+        Wait up to ``timeout`` seconds for results to arrive, and return all
+        arrived results as a list of (task number, results) tuples.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Called by the mapper after all results are received.
+        """
+
+
+class FileResultStream(ResultStream):
+    """
+    Each task writes its results to a file in the ``results`` directory,
+    which is renamed to its final name only after being written entirely.
+    The mapper polls the directory.
+    """
+
+    TYPE = "file"
+    POLL_INTERVAL = 1
+
+    def __init__(self, tmp_dir: str):
+        super().__init__(tmp_dir)
+        self.results_dir = os.path.join(tmp_dir, "results")
+        self._received = set()
+
+    def send(self, task_nr: int, results: list):
+        file_name = os.path.join(self.results_dir, f"{task_nr}.result")
+        with open(file_name + ".tmp", "wb") as my_file:
+            cloudpickle.dump(results, my_file)
+        # the result file is complete once it exists
+        os.replace(file_name + ".tmp", file_name)
+
+    def receive(self, timeout: float) -> List[Tuple[int, list]]:
+        end = time.time() + timeout
+        while True:
+            arrived = []
+            for file_name in os.listdir(self.results_dir):
+                if not file_name.endswith(".result"):
+                    continue
+                task_nr = int(file_name[:-len(".result")])
+                if task_nr in self._received:
+                    continue
+                with open(os.path.join(self.results_dir, file_name),
+                          "rb") as my_file:
+                    arrived.append((task_nr, pickle.load(my_file)))
+                self._received.add(task_nr)
+            remaining = end - time.time()
+            if arrived or remaining <= 0:
+                return arrived
+            time.sleep(min(self.POLL_INTERVAL, remaining))
+
+
+class SocketResultStream(ResultStream):
+    """
+    The mapper listens on a TCP socket, to which each task connects to
+    send its results. The host name of the mapper has to be reachable
+    from the execution hosts.
+
+    The connections are read without blocking, such that a stalled task
+    does not delay the results of the others. Connections which break,
+    or do not complete within ``TIMEOUT`` seconds, are dropped. Their
+    tasks are then reported as failed by the mapper.
+    """
+
+    TYPE = "socket"
+    TIMEOUT = 60
+
+    def __init__(self, tmp_dir: str, host: str = None, port: int = None):
+        super().__init__(tmp_dir)
+        self.host = host
+        self.port = port
+        self._server = None
+        # open connection -> (received bytes, deadline)
+        self._connections = {}
+
+    def open(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("", 0))
+        self._server.listen(128)
+        self._server.setblocking(False)
+        self.host = socket.gethostname()
+        self.port = self._server.getsockname()[1]
+        super().open()
+
+    def config(self) -> dict:
+        return {"host": self.host, "port": self.port}
+
+    def send(self, task_nr: int, results: list):
+        payload = cloudpickle.dumps((task_nr, results))
+        with socket.create_connection((self.host, self.port),
+                                      timeout=self.TIMEOUT) as connection:
+            connection.sendall(struct.pack("!Q", len(payload)) + payload)
+
+    def receive(self, timeout: float) -> List[Tuple[int, list]]:
+        end = time.time() + timeout
+        arrived = []
+        while True:
+            now = time.time()
+            for connection, (_, deadline) in list(self._connections.items()):
+                if now > deadline:
+                    self._drop(connection, "timed out")
+            # do not wait any more once results arrived
+            wait = 0 if arrived else max(0, end - now)
+            if self._connections:
+                wait = min(wait, max(0, min(
+                    deadline for _, deadline in self._connections.values())
+                    - now))
+            readable, _, _ = select.select(
+                [self._server, *self._connections], [], [], wait)
+            for readable_socket in readable:
+                if readable_socket is self._server:
+                    self._accept()
+                else:
+                    self._read(readable_socket, arrived)
+            if not readable and (arrived or time.time() >= end):
+                return arrived
+
+    def close(self):
+        for connection in list(self._connections):
+            connection.close()
+        self._connections = {}
+        if self._server is not None:
+            self._server.close()
+
+    def _accept(self):
+        try:
+            connection, _ = self._server.accept()
+        except BlockingIOError:
+            return
+        connection.setblocking(False)
+        self._connections[connection] = (bytearray(),
+                                         time.time() + self.TIMEOUT)
+
+    def _read(self, connection: socket.socket, arrived: list):
+        """
+        Read what is available on the connection, and add the result to
+        ``arrived`` once it is complete.
+        """
+        data, _ = self._connections[connection]
+        try:
+            chunk = connection.recv(2**20)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._drop(connection, str(e))
+            return
+        data += chunk
+        if len(data) >= 8:
+            size, = struct.unpack("!Q", data[:8])
+            if len(data) >= 8 + size:
+                try:
+                    arrived.append(pickle.loads(data[8:8 + size]))
+                except Exception as e:
+                    self._drop(connection, f"invalid result: {e}")
+                    return
+                connection.close()
+                del self._connections[connection]
+                return
+        if not chunk:
+            self._drop(connection, "closed before the result was complete")
+
+    def _drop(self, connection: socket.socket, reason: str):
+        print("SocketResultStream: Dropped a connection of a task, "
+              "reason:", reason, file=sys.stderr)
+        connection.close()
+        del self._connections[connection]
+
+
+class RedisResultStream(ResultStream):
+    """
+    Each task pushes its results to a Redis list, on which the mapper
+    blocks. The Redis host is read from the configuration file.
+    """
+
+    TYPE = "redis"
+
+    def __init__(self, tmp_dir: str):
+        super().__init__(tmp_dir)
+        config = get_config()
+        self.key = os.path.basename(tmp_dir) + ":results"
+        self.connection = redis.Redis(host=config["REDIS"]["HOST"])
+
+    def send(self, task_nr: int, results: list):
+        self.connection.rpush(self.key, cloudpickle.dumps((task_nr, results)))
+
+    def receive(self, timeout: float) -> List[Tuple[int, list]]:
+        # a timeout of 0 would block forever
+        item = self.connection.blpop(self.key, timeout=max(1, int(timeout)))
+        if item is None:
+            return []
+        payloads = [item[1]]
+        # collect everything else that has arrived in the meantime
+        payload = self.connection.lpop(self.key)
+        while payload is not None:
+            payloads.append(payload)
+            payload = self.connection.lpop(self.key)
+        return [pickle.loads(payload) for payload in payloads]
+
+    def close(self):
+        self.connection.delete(self.key)
+
+
+RESULT_STREAMS = {stream.TYPE: stream
+                  for stream in [FileResultStream, SocketResultStream,
+                                 RedisResultStream]}
+
+
+def result_stream_factory(tmp_dir: str) -> ResultStream:
+    """
+    The result stream opened by the mapper for the job in ``tmp_dir``,
+    as seen from the tasks.
+
+    Returns
+    -------
+
+    A file based result stream if no other stream was configured.
+    """
+    config_file = os.path.join(tmp_dir, CONFIG_FILE)
+    if not os.path.isfile(config_file):
+        return FileResultStream(tmp_dir)
+    with open(config_file) as my_file:
+        config = json.load(my_file)
+    return RESULT_STREAMS[config.pop("type")](tmp_dir, **config)
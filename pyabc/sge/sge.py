@@ -1,6 +1,5 @@
 import inspect
 import os
-import pickle
 import shutil
 import subprocess
 import tempfile
@@ -10,6 +9,7 @@ import cloudpickle
 from .config import get_config
 from .execution_contexts import DefaultContext
 from .db import job_db_factory
+from .result_stream import RESULT_STREAMS
 from .util import sge_available
 import warnings
 
@@ -120,6 +120,20 @@ class SGE:
                 as all the jobs within one chunk are executed within the python
                 process.
 
+    result_stream: str, optional (default = 'file')
+        How the tasks send their results back. One of
+
+        * 'file': Each task writes its results to a file in the temporary
+          directory, which the mapper polls every second.
+        * 'socket': Each task sends its results to a TCP socket opened by
+          the mapper. The host name of the submitting machine has to be
+          reachable from the execution hosts.
+        * 'redis': Each task pushes its results to a list on the Redis
+          server configured in the ``REDIS`` section.
+
+        With 'socket' and 'redis', the mapper is woken up as soon as
+        results arrive, and no result files are written.
+
 
     Returns
     -------
@@ -127,6 +141,11 @@ class SGE:
         The configured sge mapper.
     """
 
+    # seconds between checks of the job database for timed out tasks
+    STATUS_CHECK_INTERVAL = 5
+    # whether the jobs are submitted to an SGE installation
+    REQUIRES_SGE = True
+
     def __init__(self, tmp_directory: str = None, memory: str = '3G',
                  time_h: int = 100,
                  python_executable_path: str = None,
@@ -134,7 +153,8 @@ class SGE:
                  sge_output_file: str = None,
                  parallel_environment=None, name="map",
                  queue=None, priority=None, num_threads: int = 1,
-                 execution_context=DefaultContext, chunk_size=1):
+                 execution_context=DefaultContext, chunk_size=1,
+                 result_stream: str = 'file'):
 
         # simple assignments
         self.memory = memory
@@ -166,11 +186,17 @@ class SGE:
         self.execution_context = execution_context
         self.chunk_size = chunk_size
 
+        if result_stream not in RESULT_STREAMS:
+            raise ValueError(
+                f"Unknown result stream {result_stream}, use one of "
+                f"{', '.join(RESULT_STREAMS)}.")
+        self.result_stream = result_stream
+
         if chunk_size != 1:
             warnings.warn("Chunk size != 1. "
                           "This can potentially have bad side effect.")
 
-        if not sge_available():
+        if self.REQUIRES_SGE and not sge_available():
             print("Warning: Could not find SGE installation.", file=sys.stderr)
 
         # python interpreter which executes the jobs
@@ -286,41 +312,29 @@ class SGE:
 
         # crate job jd
         job_db = job_db_factory(tmp_dir)
-        job_db.create(len(array))
+        job_db.create(nr_tasks)
 
-        # start the job with qsub
-        subprocess.run(['qsub', os.path.join(tmp_dir, 'job.sh')],
-                       stdout=subprocess.PIPE)
+        # listen for results before the tasks can send any
+        result_stream = RESULT_STREAMS[self.result_stream](tmp_dir)
+        result_stream.open()
 
-        # wait for the tasks to be finished
-        finished = False
-        while not finished:
-            time.sleep(5)
-            for k in range(nr_tasks)[::-1]:  # check from last to first job
-                # +1 offset for k b/c SGE array jobs start at 1, not at 0
-                if job_db.wait_for_job(k + 1, self.time_h):
-                    break
-            else:
-                finished = True
-        # from here on all tasks are finished
+        self._submit(tmp_dir, nr_tasks)
 
-        # sleep to make sure files are entirely written
-        time.sleep(5)
+        try:
+            task_results = self._receive_results(
+                result_stream, job_db, nr_tasks)
+        finally:
+            result_stream.close()
 
         # make the results array
         results = []
         had_exception = False
-        for task_nr in range(nr_tasks):
-            try:
-                my_file = open(
-                    os.path.join(tmp_dir, 'results', str(task_nr + 1)
-                                 + '.result'), 'rb')
-                single_result = pickle.load(my_file)
-                results += single_result
-                my_file.close()
-            except Exception as e:
-                results.append(Exception('Could not load temporary '
-                                         'result file:' + str(e)))
+        for task_nr in range(1, nr_tasks + 1):
+            if task_nr in task_results:
+                results += task_results[task_nr]
+            else:
+                results.append(Exception(
+                    f'No result received for task {task_nr}.'))
                 had_exception = True
 
         # delete the temporary folder if there was no problem
@@ -335,6 +349,44 @@ class SGE:
             job_db.clean_up()
         return results
 
+    def _submit(self, tmp_dir, nr_tasks):
+        """
+        Start the job with qsub.
+        """
+        subprocess.run(['qsub', os.path.join(tmp_dir, 'job.sh')],
+                       stdout=subprocess.PIPE)
+
+    def _receive_results(self, result_stream, job_db, nr_tasks):
+        """
+        Collect the results of the tasks as they arrive, until all tasks
+        sent their results, or all remaining tasks have finished without
+        doing so or timed out.
+
+        Returns
+        -------
+
+        task_results: dict
+            The results of each task, by task number.
+        """
+        task_results = {}
+        last_check = time.time()
+        while len(task_results) < nr_tasks:
+            for task_nr, task_result in result_stream.receive(
+                    self.STATUS_CHECK_INTERVAL):
+                task_results[task_nr] = task_result
+            if (len(task_results) == nr_tasks
+                    or time.time() - last_check
+                    < self.STATUS_CHECK_INTERVAL):
+                continue
+            last_check = time.time()
+            if not set(job_db.pending(self.time_h)) - set(task_results):
+                # the tasks send their results before they are marked
+                # as finished, so everything sent has arrived by now
+                for task_nr, task_result in result_stream.receive(0):
+                    task_results[task_nr] = task_result
+                break
+        return task_results
+
     def _render_batch_file(self, nr_tasks, tmp_dir):
         # create the file to be submitted to SGE via qsub
         # for array jobs the ressource request are per task!
@@ -14,13 +14,15 @@ import numpy as np
 import scipy as sp
 import pandas as pd
 import copy
+import functools
 import warnings
 from typing import Union
 
 from .distance_functions import to_distance
 from .epsilon import Epsilon, MedianEpsilon
 from .model import Model
-from .population import Particle
+from .parameters import Parameter
+from .population import Particle, add_counters
 from .transition import Transition, MultivariateNormalTransition
 from .random_variables import RV, ModelPerturbationKernel, Distribution
 from .storage import History
@@ -30,6 +32,7 @@ from .model import SimpleModel
 from .populationstrategy import ConstantPopulationSize
 from .platform_factory import DefaultSampler
 from .acceptor import accept_use_current_time, SimpleAcceptor
+from .cache import SimulationCache, CachedModel
 
 
 logger = logging.getLogger("ABC")
@@ -41,6 +44,77 @@ def identity(x):
     return x
 
 
+class _ParameterBuffer:
+    """
+    Draw parameters in batches and hand them out one by one, to share the
+    per-call overhead of the random variables and transitions.
+
+    Buffered parameters are not pickled, such that copies sent to
+    different workers do not hand out the same parameters.
+
+    Parameters
+    ----------
+
+    sample: Callable[[int], list]
+        Function drawing a list of a given number of parameters.
+
+    batch_size: int
+        Number of parameters drawn at once.
+    """
+
+    def __init__(self, sample: Callable[[int], list], batch_size: int = 100):
+        self.sample = sample
+        self.batch_size = batch_size
+        self._parameters = []
+
+    def rvs(self):
+        while not self._parameters:
+            self._parameters = self.sample(self.batch_size)[::-1]
+        return self._parameters.pop()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_parameters"] = []
+        return state
+
+
+def _sample_from_prior(parameter_prior: Distribution, size: int) -> list:
+    if hasattr(parameter_prior, "rvs_parameters"):
+        return parameter_prior.rvs_parameters(size)
+    # priors which only implement rvs, e.g. user defined ones
+    return [parameter_prior.rvs() for _ in range(size)]
+
+
+def _sample_proposals(transition: Transition, parameter_prior: Distribution,
+                      size: int) -> list:
+    """
+    Draw proposals from the transition and check their validity under the
+    prior at once. Invalid proposals are returned as None.
+    """
+    proposals = transition.rvs(size=size)
+    records = proposals.to_dict("records")
+    if isinstance(parameter_prior, Distribution):
+        valid = parameter_prior.pdf(proposals) > 0
+    else:
+        # priors which only evaluate single parameters, e.g. user defined
+        # ones
+        valid = [parameter_prior.pdf(Parameter(record)) > 0
+                 for record in records]
+    return [Parameter(record) if is_valid else None
+            for record, is_valid in zip(records, valid)]
+
+
+def _prior_logpdf(parameter_prior: Distribution, parameter: Parameter):
+    """
+    Log-density of the parameter under the prior, also for priors which
+    only implement pdf.
+    """
+    if hasattr(parameter_prior, "logpdf"):
+        return parameter_prior.logpdf(parameter)
+    with np.errstate(divide="ignore"):
+        return np.log(parameter_prior.pdf(parameter))
+
+
 class ABCSMC:
     """
     Approximate Bayesian Computation - Sequential Monte Carlo (ABCSMC).
@@ -129,6 +203,12 @@ class ABCSMC:
         of :class:`pyabc.acceptor.Acceptor` or a function convertible to an
         acceptor.
 
+    simulation_cache: SimulationCache, optional
+        If given, the summary statistics of the models declared
+        deterministic are cached, and looked up for repeated parameters.
+        The cache hits and misses are recorded per generation, see
+        :meth:`pyabc.History.get_population_counters`.
+
 
     Attributes
     ----------
@@ -157,7 +237,8 @@ class ABCSMC:
                  transitions: List[Transition] = None,
                  eps: Epsilon = None,
                  sampler=None,
-                 acceptor=None):
+                 acceptor=None,
+                 simulation_cache: SimulationCache = None):
 
         if not isinstance(models, list):
             models = [models]
@@ -210,12 +291,17 @@ class ABCSMC:
             acceptor = accept_use_current_time
         self.acceptor = SimpleAcceptor.assert_acceptor(acceptor)
 
+        self.simulation_cache = simulation_cache
+
         self.stop_if_only_single_model_alive = False
         self.x_0 = None
         self.history = None  # type: History
         self._initial_sum_stats = None
         self._initial_weights = None
         self._initial_n_eval = 0
+        # the last sampled population, and its parameter moments per model
+        self._population = None
+        self._accepted_moments = {}
 
     def __getstate__(self):
         state_red_dict = self.__dict__.copy()
@@ -304,6 +390,7 @@ class ABCSMC:
 
         # initialize history object
         self.history = History(db)
+        self._population = None
 
         if gt_par is None:
             gt_par = {}
@@ -358,6 +445,7 @@ class ABCSMC:
 
         self.history = History(db)
         self.history.id = abc_id
+        self._population = None
 
         # extract observed sum stats from input or history
         if observed_sum_stat is None:
@@ -397,17 +485,12 @@ class ABCSMC:
                 t, self._get_initial_samples(t)[1])
 
         if self.eps.require_initialize:
-            def distance_to_ground_truth(x):
-                return self.distance_function(t, x, self.x_0)
-
             # create dataframe from weights and new distances
             weights, sum_stats = self._get_initial_samples(t)
-            rows = []
-            for weight, sum_stat in zip(weights, sum_stats):
-                distance = distance_to_ground_truth(sum_stat)
-                rows.append({'distance': distance,
-                             'w': weight})
-            weighted_distances = pd.DataFrame(rows)
+            distances = self.distance_function.batch(t, sum_stats, self.x_0)
+            weighted_distances = pd.DataFrame(
+                {'distance': distances, 'w': weights},
+                columns=['distance', 'w'])
 
             # initialize epsilon
             self.eps.initialize(t, weighted_distances)
@@ -438,6 +521,17 @@ class ABCSMC:
                 self._initial_n_eval = self.sampler.nr_evaluations_
         return self._initial_weights, self._initial_sum_stats
 
+    def _simulation_models(self) -> List[Model]:
+        """
+        The models to simulate, with the deterministic ones looked up in
+        the simulation cache if one is used.
+        """
+        if self.simulation_cache is None:
+            return self.models
+        return [CachedModel(model, m, self.simulation_cache)
+                if model.deterministic else model
+                for m, model in enumerate(self.models)]
+
     def _create_simulate_from_prior_function(self, t):
         """
         Similar to _create_simulate_function, apart here we sample from the
@@ -446,33 +540,57 @@ class ABCSMC:
 
         model_prior = self.model_prior
         parameter_priors = self.parameter_priors
-        models = self.models
+        models = self._simulation_models()
         summary_statistics = self.summary_statistics
 
+        proposal_buffers = ABCSMC._create_proposal_buffers(
+            t=0, parameter_priors=parameter_priors, transitions=None)
+
         # simulation function, simplifying some parts compared to later
 
         def simulate_one():
             m = int(model_prior.rvs())
-            theta = parameter_priors[m].rvs()
+            theta = proposal_buffers[m].rvs()
             model_result = models[m].summary_statistics(
                 t, theta, summary_statistics)
-            weight = 1.0
-            accepted_sum_stats = [model_result.sum_stats]
-            # distance will be computed after initialization of the
-            # distance function
-            accepted_distances = [np.inf]
-            return Particle(
-                m=m,
-                parameter=theta,
-                weight=weight,
-                accepted_sum_stats=accepted_sum_stats,
-                accepted_distances=accepted_distances,
-                rejected_sum_stats=[],
-                rejected_distances=[],
-                accepted=True)
+            return ABCSMC._create_prior_particle(m, theta, [model_result])
+
+        if all(model.supports_batch for model in models):
+            def simulate_batch(size):
+                proposals = []
+                for _ in range(size):
+                    m = int(model_prior.rvs())
+                    proposals.append((m, proposal_buffers[m].rvs()))
+                model_results = ABCSMC._evaluate_batch(
+                    proposals, 1, models,
+                    lambda model, pars: model.summary_statistics_batch(
+                        t, pars, summary_statistics))
+                return [ABCSMC._create_prior_particle(m, theta, results)
+                        for (m, theta), results
+                        in zip(proposals, model_results)]
+
+            simulate_one.simulate_batch = simulate_batch
 
         return simulate_one
 
+    @staticmethod
+    def _create_prior_particle(m, theta, model_results) -> Particle:
+        """
+        Create the always accepted particle of a prior sample.
+        """
+        return Particle(
+            m=m,
+            parameter=theta,
+            weight=1.0,
+            accepted_sum_stats=[model_results[0].sum_stats],
+            # distance will be computed after initialization of the
+            # distance function
+            accepted_distances=[np.inf],
+            rejected_sum_stats=[],
+            rejected_distances=[],
+            accepted=True,
+            counters=model_results[0].counters)
+
     def _sample_from_prior(self, t: int) -> List[dict]:
         """
         Only sample from prior and return results without changing
@@ -505,7 +623,9 @@ class ABCSMC:
         -------
         simulate_one: callable
             Function that samples parameters, simulates data, and checks
-            acceptance.
+            acceptance. If all models support batch evaluation, it has an
+            attribute ``simulate_batch``, which does the same for a given
+            number of parameters at once and returns a list of particles.
 
         .. note::
             For some of the samplers, the sampling function needs to be
@@ -527,21 +647,22 @@ class ABCSMC:
         transitions = self.transitions
         nr_samples_per_parameter = \
             self.population_strategy.nr_samples_per_parameter
-        models = self.models
+        models = self._simulation_models()
         summary_statistics = self.summary_statistics
         distance_function = self.distance_function
         eps = self.eps
         acceptor = self.acceptor
         x_0 = self.x_0
+        proposal_buffers = ABCSMC._create_proposal_buffers(
+            t, parameter_priors, transitions)
 
         # simulation function
         def simulate_one():
             parameter = ABCSMC._generate_valid_proposal(
                 t, m, p,
                 model_prior,
-                parameter_priors,
                 model_perturbation_kernel,
-                transitions)
+                proposal_buffers)
             particle = ABCSMC._evaluate_proposal(
                 *parameter,
                 t,
@@ -559,15 +680,59 @@ class ABCSMC:
                 transitions)
             return particle
 
+        if all(model.supports_batch for model in models):
+            def simulate_batch(size):
+                proposals = [
+                    ABCSMC._generate_valid_proposal(
+                        t, m, p,
+                        model_prior,
+                        model_perturbation_kernel,
+                        proposal_buffers)
+                    for _ in range(size)]
+                model_results = ABCSMC._evaluate_batch(
+                    proposals, nr_samples_per_parameter, models,
+                    lambda model, pars: model.accept_batch(
+                        t, pars, summary_statistics, distance_function,
+                        eps, acceptor, x_0))
+                return [
+                    ABCSMC._create_particle(
+                        m_ss, theta_ss, results,
+                        t,
+                        model_probabilities,
+                        nr_samples_per_parameter,
+                        model_prior,
+                        parameter_priors,
+                        model_perturbation_kernel,
+                        transitions)
+                    for (m_ss, theta_ss), results
+                    in zip(proposals, model_results)]
+
+            simulate_one.simulate_batch = simulate_batch
+
         return simulate_one
 
+    @staticmethod
+    def _create_proposal_buffers(t, parameter_priors, transitions):
+        """
+        Create a buffer of parameter proposals per model. In the first
+        generation, the proposals are drawn from the priors, later from
+        the transitions, with the invalid ones marked as None.
+        """
+        if t == 0:
+            return [
+                _ParameterBuffer(functools.partial(_sample_from_prior, prior))
+                for prior in parameter_priors]
+        return [
+            _ParameterBuffer(functools.partial(
+                _sample_proposals, transition, prior))
+            for transition, prior in zip(transitions, parameter_priors)]
+
     @staticmethod
     def _generate_valid_proposal(
             t, m, p,
             model_prior,
-            parameter_priors,
             model_perturbation_kernel,
-            transitions):
+            proposal_buffers):
         """
         Sample a parameter for a model.
 
@@ -576,6 +741,8 @@ class ABCSMC:
         t: Population number
         m: Indices of alive models
         p: Probabilities of alive models
+        proposal_buffers: Proposal buffers per model, see
+            _create_proposal_buffers
 
         Returns
         -------
@@ -587,7 +754,7 @@ class ABCSMC:
         # first generation
         if t == 0:  # sample from prior
             m_ss = int(model_prior.rvs())
-            theta_ss = parameter_priors[m_ss].rvs()
+            theta_ss = proposal_buffers[m_ss].rvs()
             return m_ss, theta_ss
 
         # later generation
@@ -603,10 +770,11 @@ class ABCSMC:
                     continue
             else:
                 m_ss = m[0]
-            theta_ss = transitions[m_ss].rvs()
+            # proposals are checked for validity under the parameter prior
+            # in batches, invalid ones are None
+            theta_ss = proposal_buffers[m_ss].rvs()
 
-            if (model_prior.pmf(m_ss)
-                    * parameter_priors[m_ss].pdf(theta_ss) > 0):
+            if theta_ss is not None and model_prior.pmf(m_ss) > 0:
                 return m_ss, theta_ss
 
     @staticmethod
@@ -634,13 +802,8 @@ class ABCSMC:
 
         # from here, theta_ss is valid according to the prior
 
-        accepted_sum_stats = []
-        accepted_distances = []
-        rejected_sum_stats = []
-        rejected_distances = []
-
-        for _ in range(nr_samples_per_parameter):
-            model_result = models[m_ss].accept(
+        model_results = [
+            models[m_ss].accept(
                 t,
                 theta_ss,
                 summary_statistics,
@@ -648,24 +811,87 @@ class ABCSMC:
                 eps,
                 acceptor,
                 x_0)
+            for _ in range(nr_samples_per_parameter)]
+
+        return ABCSMC._create_particle(
+            m_ss, theta_ss, model_results,
+            t,
+            model_probabilities,
+            nr_samples_per_parameter,
+            model_prior,
+            parameter_priors,
+            model_perturbation_kernel,
+            transitions)
+
+    @staticmethod
+    def _evaluate_batch(proposals, nr_samples_per_parameter, models,
+                        evaluate) -> list:
+        """
+        Evaluate the models for a list of (model, parameter) proposals,
+        with one call of ``evaluate(model, parameters)`` per model.
+        Each parameter is evaluated ``nr_samples_per_parameter`` times.
+
+        Returns
+        -------
+
+        The lists of model results, in the order of the proposals.
+        """
+        model_results = [None] * len(proposals)
+        for m_ss in set(m for m, _ in proposals):
+            indices = [j for j, (m, _) in enumerate(proposals) if m == m_ss]
+            pars = [proposals[j][1] for j in indices
+                    for _ in range(nr_samples_per_parameter)]
+            results = evaluate(models[m_ss], pars)
+            for k, j in enumerate(indices):
+                model_results[j] = results[k * nr_samples_per_parameter:
+                                           (k + 1) * nr_samples_per_parameter]
+        return model_results
+
+    @staticmethod
+    def _create_particle(
+            m_ss, theta_ss,
+            model_results,
+            t,
+            model_probabilities,
+            nr_samples_per_parameter,
+            model_prior,
+            parameter_priors,
+            model_perturbation_kernel,
+            transitions) -> Particle:
+        """
+        Create the particle from the model results of the
+        ``nr_samples_per_parameter`` evaluations of a proposal.
+        """
+        accepted_sum_stats = []
+        accepted_distances = []
+        rejected_sum_stats = []
+        rejected_distances = []
+        counters = None
+
+        for model_result in model_results:
             if model_result.accepted:
                 accepted_sum_stats.append(model_result.sum_stats)
                 accepted_distances.append(model_result.distance)
-            else:
+            elif not model_result.partial:
                 rejected_sum_stats.append(model_result.sum_stats)
                 rejected_distances.append(model_result.distance)
+            if model_result.counters:
+                counters = add_counters(counters or {},
+                                        model_result.counters)
 
         accepted = len(accepted_sum_stats) > 0
 
         if accepted:
-            weight = ABCSMC._calc_proposal_weight(
+            log_weight = ABCSMC._calc_proposal_log_weight(
                 accepted_distances, m_ss, theta_ss, t, model_probabilities,
                 model_prior,
                 parameter_priors,
                 nr_samples_per_parameter,
                 model_perturbation_kernel,
                 transitions)
+            weight = np.exp(log_weight)
         else:
+            log_weight = -np.inf
             weight = 0
 
         return Particle(
@@ -676,10 +902,12 @@ class ABCSMC:
             accepted_distances=accepted_distances,
             rejected_sum_stats=rejected_sum_stats,
             rejected_distances=rejected_distances,
-            accepted=accepted)
+            accepted=accepted,
+            log_weight=log_weight,
+            counters=counters)
 
     @staticmethod
-    def _calc_proposal_weight(
+    def _calc_proposal_log_weight(
             distance_list,
             m_ss,
             theta_ss,
@@ -691,30 +919,33 @@ class ABCSMC:
             model_perturbation_kernel,
             transitions):
         """
-        Calculate the weight for the generated parameter.
+        Calculate the logarithm of the weight for the generated parameter.
+        The densities are combined in log-space, such that the weight does
+        not underflow for many parameters.
         """
 
+        # reflects stochasticity of the model
+        fraction_accepted_runs_for_single_parameter = (
+                len(distance_list)
+                / nr_samples_per_parameter)
         if t == 0:
-            weight = (len(distance_list)
-                      / nr_samples_per_parameter)
-        else:
-            model_factor = sum(
-                row.p * model_perturbation_kernel.pmf(m_ss, m)
-                for m, row in model_probabilities.iterrows())
-            particle_factor = transitions[m_ss].pdf(
-                pd.Series(dict(theta_ss)))
-            normalization = model_factor * particle_factor
-            if normalization == 0:
-                print('normalization is zero!')
-            # reflects stochasticity of the model
-            fraction_accepted_runs_for_single_parameter = (
-                    len(distance_list)
-                    / nr_samples_per_parameter)
-            weight = (model_prior.pmf(m_ss)
-                      * parameter_priors[m_ss].pdf(theta_ss)
-                      * fraction_accepted_runs_for_single_parameter
-                      / normalization)
-        return weight
+            return np.log(fraction_accepted_runs_for_single_parameter)
+
+        model_factor = sum(
+            row.p * model_perturbation_kernel.pmf(m_ss, m)
+            for m, row in model_probabilities.iterrows())
+        with np.errstate(divide="ignore"):
+            log_normalization = (
+                np.log(model_factor)
+                + transitions[m_ss].logpdf(pd.Series(dict(theta_ss))))
+            if log_normalization == -np.inf:
+                logger.warning("Normalization is zero for parameter "
+                               f"{theta_ss} of model {m_ss}.")
+            log_weight = (np.log(model_prior.pmf(m_ss))
+                          + _prior_logpdf(parameter_priors[m_ss], theta_ss)
+                          + np.log(fraction_accepted_runs_for_single_parameter)
+                          - log_normalization)
+        return log_weight
 
     def run(self, minimum_epsilon: float, max_nr_populations: int,
             min_acceptance_rate: float = 0., **kwargs) -> History:
@@ -777,6 +1008,7 @@ class ABCSMC:
 
         # configure sampler by whoever wants to
         self.distance_function.configure_sampler(self.sampler)
+        self.eps.configure_sampler(self.sampler)
 
         # run loop over time points
         t_max = t0 + max_nr_populations
@@ -801,6 +1033,8 @@ class ABCSMC:
 
             # retrieve accepted population
             population = sample.get_accepted_population()
+            self._population = population
+            self._accepted_moments = sample.accepted_moments
 
             # save to database before making any changes to the population
             logger.debug('population ' + str(t) + ' done')
@@ -808,7 +1042,9 @@ class ABCSMC:
             model_names = [model.name for model in self.models]
             self.history.append_population(
                 t, current_eps, population, nr_evaluations,
-                model_names)
+                model_names, sample.counters)
+            if sample.counters:
+                logger.info(f"t: {t} counters: {sample.counters}")
             logger.debug(
                 '\ntotal nr simulations up to t =' + str(t) + ' is '
                 + str(self.history.total_nr_simulations))
@@ -816,23 +1052,36 @@ class ABCSMC:
             # prepare next iteration
 
             # update distance function
-            df_updated = self.distance_function.update(
-                t + 1, sample.all_sum_stats)
+            sum_stats_estimator = sample.sum_stats_estimator
+            if sum_stats_estimator is not None:
+                df_updated = self.distance_function.update(
+                    t + 1, sample.all_sum_stats,
+                    sum_stats_estimator=sum_stats_estimator)
+            else:
+                df_updated = self.distance_function.update(
+                    t + 1, sample.all_sum_stats)
 
             # compute distances with the new distance measure
             if df_updated:
-                def distance_to_ground_truth(x):
-                    return self.distance_function(t + 1, x, self.x_0)
-
-                population.update_distances(distance_to_ground_truth)
-
-            # update epsilon
-            self.eps.update(t + 1, population.get_weighted_distances())
+                def distances_to_ground_truth(sum_stats):
+                    return self.distance_function.batch(
+                        t + 1, sum_stats, self.x_0)
+
+                population.update_distances_batch(distances_to_ground_truth)
+
+            # update epsilon, from the sketch of the accepted distances if
+            # available and these are still valid, without collecting the
+            # weighted distances
+            distance_sketch = sample.distance_sketch
+            if distance_sketch is not None and not df_updated:
+                self.eps.update(t + 1, None, distance_sketch=distance_sketch)
+            else:
+                self.eps.update(t + 1, population.get_weighted_distances())
 
             # check early termination conditions
 
             current_acceptance_rate = \
-                len(population.get_list()) / nr_evaluations
+                len(population) / nr_evaluations
             if (current_eps <= minimum_epsilon
                     or (self.stop_if_only_single_model_alive
                         and self.history.nr_of_models_alive() <= 1)
@@ -886,5 +1135,15 @@ class ABCSMC:
             return
 
         for m in self.history.alive_models(t - 1):
-            particles, w = self.history.get_distribution(m, t - 1)
-            self.transitions[m].fit(particles, w)
+            if self._population is not None:
+                # the parameters of the last population are still in memory
+                particles, w = self._population.get_parameters(m)
+            else:
+                particles, w = self.history.get_distribution(m, t - 1)
+            moments = self._accepted_moments.get(m)
+            if moments is not None and isinstance(self.transitions[m],
+                                                  Transition):
+                # reuse the moments accumulated during sampling
+                self.transitions[m].fit(particles, w, moments=moments)
+            else:
+                self.transitions[m].fit(particles, w)
@@ -60,6 +60,7 @@ class Population(Base):
     nr_samples = Column(Integer)
     epsilon = Column(Float)
     models = relationship("Model")
+    counters = relationship("PopulationCounter")
 
     def __init__(self, *args, **kwargs):
         super(Population, self).__init__(**kwargs)
@@ -75,6 +76,18 @@ class Population(Base):
                         population_end_time=self.population_end_time))
 
 
+class PopulationCounter(Base):
+    __tablename__ = 'population_counters'
+    id = Column(Integer, primary_key=True)
+    population_id = Column(Integer, ForeignKey('populations.id'))
+    name = Column(String(200))
+    value = Column(Float)
+
+    def __repr__(self):
+        return "<{} {}={}>".format(self.__class__.__name__,
+                                   self.name, self.value)
+
+
 class Model(Base):
     __tablename__ = 'models'
     id = Column(Integer, primary_key=True)
@@ -11,7 +11,8 @@ from functools import wraps
 import logging
 
 from .db_model import (ABCSMC, Population, Model, Particle,
-                       Parameter, Sample, SummaryStatistic, Base)
+                       Parameter, Sample, SummaryStatistic, Base,
+                       PopulationCounter)
 from ..population import Particle as PyParticle, Population as PyPopulation
 from ..parameters import Parameter as PyParameter
 
@@ -550,7 +551,8 @@ class History:
                                nr_simulations: int,
                                store: dict,
                                model_probabilities: dict,
-                               model_names):
+                               model_names,
+                               counters: dict = None):
         # sqlalchemy experimental stuff and highly inefficient implementation
         # here but that is ok for testing purposes for the moment
 
@@ -565,6 +567,12 @@ class History:
 
         abcsmc.populations.append(population)
 
+        # store the counters of the simulations
+        if counters:
+            for name, value in counters.items():
+                population.counters.append(
+                    PopulationCounter(name=name, value=value))
+
         # iterate over models
         for m, model_population in store.items():
             # create new model
@@ -628,7 +636,8 @@ class History:
                           current_epsilon: float,
                           population: Population,
                           nr_simulations: int,
-                          model_names):
+                          model_names,
+                          counters: dict = None):
         """
         Append population to database.
 
@@ -650,13 +659,17 @@ class History:
         model_names: list
             The model names.
 
+        counters: dict, optional
+            Numeric counters of the simulations for this population,
+            see :meth:`get_population_counters`.
+
         """
         store = population.to_dict()
         model_probabilities = population.get_model_probabilities()
 
         self._save_to_population_db(t, current_epsilon,
                                     nr_simulations, store, model_probabilities,
-                                    model_names)
+                                    model_names, counters)
 
     @with_session
     def get_model_probabilities(self, t: Union[int, None] = None) \
@@ -784,6 +797,32 @@ class History:
 
         return pd.DataFrame({'distance': distances, 'w': weights})
 
+    @with_session
+    def get_population_counters(self) -> pd.DataFrame:
+        """
+        Numeric counters recorded for the simulations of each population,
+        as reported by the models, e.g. the number of early rejected
+        simulations of a :class:`pyabc.model.StreamingModel`.
+
+        Returns
+        -------
+
+        counters: pd.DataFrame
+            A DataFrame indexed by the population number ``t``, with one
+            column per counter. Counters not recorded for a population
+            are NaN.
+        """
+        query = (self._session.query(Population.t,
+                                     PopulationCounter.name,
+                                     PopulationCounter.value)
+                 .join(ABCSMC)
+                 .join(PopulationCounter)
+                 .filter(ABCSMC.id == self.id))
+        df = pd.read_sql_query(query.statement, self._engine)
+        counters = df.pivot(index="t", columns="name", values="value")
+        counters.columns.name = None
+        return counters
+
     @with_session
     def get_nr_particles_per_population(self) -> pd.Series:
         """
@@ -20,6 +20,7 @@ from .exceptions import NotEnoughParticles
 from .model_selection import GridSearchCV
 from .local_transition import LocalTransition
 from .randomwalk import DiscreteRandomWalkTransition
+from .gaussian_mixture import GaussianMixtureTransition
 
 __all__ = [
     "Transition",
@@ -31,4 +32,5 @@ __all__ = [
     "scott_rule_of_thumb",
     "silverman_rule_of_thumb",
     "DiscreteRandomWalkTransition",
+    "GaussianMixtureTransition",
 ]
@@ -7,6 +7,7 @@ from sklearn.base import BaseEstimator
 from .exceptions import NotEnoughParticles
 from .predict_population_size import predict_population_size
 from ..cv.bootstrap import calc_cv
+from ..weighted_statistics import WeightedMoments
 from .transitionmeta import TransitionMeta
 
 logger = logging.getLogger("Transitions")
@@ -19,8 +20,9 @@ class Transition(BaseEstimator, metaclass=TransitionMeta):
         .. note::
             This class does a little bit of meta-programming.
 
-            The `fit`, `pdf` and `rvs` methods are automatically wrapped
-            to handle the special case of no parameters.
+            The `fit`, `pdf`, `rvs_single` and `rvs_array` methods are
+            automatically wrapped to handle the special case of no
+            parameters.
 
             Hence, you can safely assume that you encounter at least one
             parameter. All the defined transitions will then automatically
@@ -29,6 +31,7 @@ class Transition(BaseEstimator, metaclass=TransitionMeta):
     NR_BOOTSTRAP = 5
     X = None
     w = None
+    moments = None
 
     @abstractmethod
     def fit(self, X: pd.DataFrame, w: np.ndarray):
@@ -37,7 +40,10 @@ class Transition(BaseEstimator, metaclass=TransitionMeta):
         Concrete implementations might do something like fitting a KDE.
 
         The parameters given as ``X`` and ``w`` are automatically stored
-        in ``self.X`` and ``self.w``.
+        in ``self.X`` and ``self.w``. Optionally, the weighted moments of
+        ``X`` accumulated during sampling can be passed as keyword argument
+        ``moments``, and are stored in ``self.moments``. Implementations
+        may use them to avoid recomputing e.g. the covariance from ``X``.
 
         Parameters
         ----------
@@ -60,6 +66,36 @@ class Transition(BaseEstimator, metaclass=TransitionMeta):
             A sample from the fitted model.
         """
 
+    def rvs_array(self, size: int) -> np.ndarray:
+        """
+        Sample ``size`` independent points from the density at once.
+
+        Parameters
+        ----------
+
+        size: int
+            Number of independent samples to draw.
+
+        Returns
+        -------
+
+        samples: np.ndarray
+            The samples as an array of shape (size, n_parameters), the
+            columns ordered as the columns of ``X`` passed to the fit method.
+
+
+        Note
+        ----
+
+        This method should be overridden for efficient implementations.
+        The default is to call rvs_single repeatedly (which might
+        not be the most efficient way).
+        """
+        samples = np.empty((size, len(self.X.columns)))
+        for j in range(size):
+            samples[j] = self.rvs_single()[self.X.columns].values
+        return samples
+
     def rvs(self, size=None):
         """
         Sample from the density.
@@ -81,14 +117,12 @@ class Transition(BaseEstimator, metaclass=TransitionMeta):
         Note
         ----
 
-        This method can be overridden for efficient implementations.
-        The default is to call rvs_single repeatedly (which might
-        not be the most efficient way).
-
+        The samples are generated in one go via ``rvs_array``, which is
+        the method to override for efficient implementations.
         """
         if size is None:
             return self.rvs_single()
-        return pd.DataFrame([self.rvs_single() for _ in range(size)])
+        return pd.DataFrame(self.rvs_array(size), columns=self.X.columns)
 
     @abstractmethod
     def pdf(self, x: Union[pd.Series, pd.DataFrame]) \
@@ -112,9 +146,34 @@ class Transition(BaseEstimator, metaclass=TransitionMeta):
             Probability density at `x`.
         """
 
+    def logpdf(self, x: Union[pd.Series, pd.DataFrame]) \
+            -> Union[float, np.ndarray]:
+        """
+        Evaluate the logarithm of the probability density function at `x`,
+        see ``pdf``.
+
+        Note
+        ----
+
+        The default is the logarithm of ``pdf``. It should be overridden
+        where the log-density can be computed without underflow.
+        """
+        with np.errstate(divide="ignore"):
+            return np.log(self.pdf(x))
+
+    def _moments_match(self) -> bool:
+        """
+        Whether moments were passed to fit which describe the parameters
+        ``X``. Particles of zero weight are not accumulated in the moments.
+        """
+        moments = self.moments
+        return (isinstance(moments, WeightedMoments)
+                and moments.n == np.count_nonzero(self.w)
+                and moments.keys is not None
+                and set(moments.keys) == set(self.X.columns))
+
     def score(self, X: pd.DataFrame, w: np.ndarray):
-        densities = self.pdf(X)
-        return (np.log(densities) * w).sum()
+        return (self.logpdf(X) * w).sum()
 
     def no_meaningful_particles(self) -> bool:
         return len(self.X) == 0 or self.no_parameters
@@ -0,0 +1,240 @@
+from typing import Union
+import logging
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+from scipy.special import logsumexp
+
+from .base import Transition
+from .exceptions import NotEnoughParticles
+from .util import smart_cov
+
+logger = logging.getLogger("GaussianMixtureTransition")
+
+
+class GaussianMixtureTransition(Transition):
+    """
+    Transition via a mixture of K multivariate Gaussians, fitted to the
+    weighted population by expectation maximization (EM).
+
+    In contrast to the :class:`pyabc.transition.MultivariateNormalTransition`
+    and the :class:`pyabc.transition.LocalTransition`, which place one
+    kernel on every particle, the costs of ``pdf`` and ``rvs`` scale with
+    the number of components K instead of the population size. This makes
+    the transition particularly suited for large populations.
+
+    Parameters
+    ----------
+
+    n_components: int, optional
+        The number of mixture components K. If None (default), the number
+        of components is selected from 1, ..., ``max_components`` by the
+        Bayesian information criterion (BIC). The search stops early if
+        the BIC does not improve for two successive component numbers.
+
+    max_components: int, optional (default = 10)
+        The maximum number of components considered for the BIC selection.
+
+    scaling: float, optional (default = 1)
+        Scaling factor for the component covariances.
+
+    max_iter: int, optional (default = 100)
+        Maximum number of EM iterations.
+
+    tol: float, optional (default = 1e-6)
+        Convergence threshold on the improvement of the weighted mean
+        log-likelihood.
+
+    Attributes
+    ----------
+
+    REG_COVAR: float
+        Relative regularization added to the diagonals of the component
+        covariances, to keep them positive definite.
+
+    MIN_EFF_SAMPLES_PER_COMPONENT: float
+        The number of components is restricted such that each component
+        is backed by at least this effective sample size on average, to
+        avoid components collapsing onto single particles.
+    """
+    REG_COVAR = 1e-3
+    MIN_EFF_SAMPLES_PER_COMPONENT = 10
+
+    def __init__(self, n_components: int = None, max_components: int = 10,
+                 scaling: float = 1, max_iter: int = 100, tol: float = 1e-6):
+        self.n_components = n_components
+        self.max_components = max_components
+        self.scaling = scaling
+        self.max_iter = max_iter
+        self.tol = tol
+
+    def fit(self, X: pd.DataFrame, w: np.ndarray):
+        if len(X) == 0:
+            raise NotEnoughParticles("Fitting not possible.")
+        X_arr = X.values.astype(float)
+        reg_covar = self._reg_covar(X_arr, w)
+
+        eff_sample_size = 1 / (w**2).sum()
+        max_components = max(
+            int(eff_sample_size / self.MIN_EFF_SAMPLES_PER_COMPONENT), 1)
+        if self.n_components is not None:
+            n_components_list = [min(self.n_components, max_components)]
+        else:
+            n_components_list = range(
+                1, min(self.max_components, max_components) + 1)
+
+        dim = X_arr.shape[1]
+        best_bic = np.inf
+        for n_components in n_components_list:
+            fitted = fit_weighted_gaussian_mixture(
+                X_arr, w, n_components, reg_covar, self.max_iter, self.tol)
+            n_free_parameters = (n_components - 1 + n_components * dim
+                                 + n_components * dim * (dim + 1) / 2)
+            bic = (- 2 * eff_sample_size * fitted[3]
+                   + n_free_parameters * np.log(eff_sample_size))
+            if bic < best_bic:
+                best_bic = bic
+                self.weights_, self.means_, self.covs_, _ = fitted
+            elif n_components >= len(self.weights_) + 2:
+                # no improvement for two successive component numbers
+                break
+        self.n_components_ = len(self.weights_)
+        logger.debug("Fitted {} components.".format(self.n_components_))
+
+        covs = self.covs_ * self.scaling
+        self._chols = np.linalg.cholesky(covs)
+        self._log_dets = 2 * np.log(
+            np.diagonal(self._chols, axis1=1, axis2=2)).sum(axis=1)
+
+    def rvs_single(self) -> pd.Series:
+        return pd.Series(self.rvs_array(1)[0], index=self.X.columns)
+
+    def rvs_array(self, size: int) -> np.ndarray:
+        components = np.random.choice(
+            self.n_components_, size=size, p=self.weights_)
+        perturbations = np.einsum(
+            "ijk,ik->ij", self._chols[components],
+            np.random.normal(size=(size, self.means_.shape[1])))
+        return self.means_[components] + perturbations
+
+    def pdf(self, x: Union[pd.Series, pd.DataFrame]) \
+            -> Union[float, np.ndarray]:
+        x = x[self.X.columns]
+        x = np.array(x, dtype=float)
+        if len(x.shape) == 1:
+            return float(np.exp(self._logpdf(x[None, :]))[0])
+        return np.exp(self._logpdf(x))
+
+    def logpdf(self, x: Union[pd.Series, pd.DataFrame]) \
+            -> Union[float, np.ndarray]:
+        x = x[self.X.columns]
+        x = np.array(x, dtype=float)
+        if len(x.shape) == 1:
+            return float(self._logpdf(x[None, :])[0])
+        return self._logpdf(x)
+
+    def _logpdf(self, x: np.ndarray) -> np.ndarray:
+        log_dens = component_log_densities(
+            x, self.means_, self._chols, self._log_dets)
+        return logsumexp(log_dens, b=self.weights_, axis=1)
+
+    def _reg_covar(self, X_arr: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """
+        Diagonal regularization, relative to the population variances,
+        or the parameter magnitudes if these vanish.
+        """
+        scale = np.diag(smart_cov(X_arr, w)).copy()
+        zero = scale <= 0
+        scale[zero] = np.absolute(X_arr[0, zero])
+        scale[scale <= 0] = 1
+        return self.REG_COVAR * scale
+
+
+def component_log_densities(x: np.ndarray, means: np.ndarray,
+                            chols: np.ndarray, log_dets: np.ndarray):
+    """
+    Log-densities of the Gaussian components at the rows of `x`.
+
+    Returns
+    -------
+
+    log_dens: np.ndarray
+        Array of shape (n_points, n_components).
+    """
+    dim = x.shape[1]
+    log_dens = np.empty((x.shape[0], means.shape[0]))
+    for k, (mean, chol) in enumerate(zip(means, chols)):
+        whitened = solve_triangular(chol, (x - mean).T, lower=True)
+        log_dens[:, k] = -.5 * (dim * np.log(2 * np.pi) + log_dets[k]
+                                + (whitened**2).sum(axis=0))
+    return log_dens
+
+
+def fit_weighted_gaussian_mixture(X: np.ndarray, w: np.ndarray,
+                                  n_components: int, reg_covar: np.ndarray,
+                                  max_iter: int = 100, tol: float = 1e-6):
+    """
+    Fit a Gaussian mixture to the weighted points `X` by EM.
+
+    Parameters
+    ----------
+
+    X: np.ndarray
+        The points, of shape (n_points, dim).
+    w: np.ndarray
+        The normalized point weights.
+    n_components: int
+        Number of mixture components.
+    reg_covar: np.ndarray
+        Regularization added to the covariance diagonals.
+    max_iter: int
+        Maximum number of iterations.
+    tol: float
+        Convergence threshold on the weighted mean log-likelihood.
+
+    Returns
+    -------
+
+    weights, means, covs, log_likelihood:
+        Component weights, means and covariances, and the weighted mean
+        log-likelihood of the points.
+    """
+    n_points, dim = X.shape
+
+    # initialize means at weighted random points, covariances as the
+    # population covariance
+    replace = np.count_nonzero(w) < n_components
+    means = X[np.random.choice(n_points, size=n_components,
+                               replace=replace, p=w)]
+    covs = np.tile(smart_cov(X, w) + np.diag(reg_covar),
+                   (n_components, 1, 1))
+    weights = np.ones(n_components) / n_components
+
+    log_likelihood = -np.inf
+    for n_iter in range(max_iter + 1):
+        # E step
+        chols = np.linalg.cholesky(covs)
+        log_dets = 2 * np.log(
+            np.diagonal(chols, axis1=1, axis2=2)).sum(axis=1)
+        log_resp = (np.log(weights)
+                    + component_log_densities(X, means, chols, log_dets))
+        log_norm = logsumexp(log_resp, axis=1)
+
+        prev_log_likelihood = log_likelihood
+        log_likelihood = (log_norm * w).sum()
+        if (np.abs(log_likelihood - prev_log_likelihood) < tol
+                or n_iter == max_iter):
+            break
+
+        # M step
+        resp = np.exp(log_resp - log_norm[:, None]) * w[:, None]
+        weights = resp.sum(axis=0) + 10 * np.finfo(float).eps
+        means = resp.T @ X / weights[:, None]
+        for k in range(n_components):
+            deltas = X - means[k]
+            covs[k] = ((resp[:, k, None] * deltas).T @ deltas / weights[k]
+                       + np.diag(reg_covar))
+        weights /= weights.sum()
+
+    return weights, means, covs, log_likelihood
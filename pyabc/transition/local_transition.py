@@ -1,8 +1,10 @@
+import numpy as np
 import numpy.linalg as la
 import scipy as sp
 import pandas as pd
 from .base import Transition
 from scipy.spatial import cKDTree
+from scipy.special import logsumexp
 from .util import smart_cov
 from .exceptions import NotEnoughParticles
 import logging
@@ -87,6 +89,10 @@ class LocalTransition(Transition):
         self.covs = sp.array(covs)
         self.inv_covs = sp.array(inv_covs)
         self.determinants = sp.array(dets)
+        # square roots of the covariances for batched sampling
+        eigvals, eigvecs = la.eigh(self.covs)
+        self.cov_sqrts = (eigvecs
+                          * sp.sqrt(sp.maximum(eigvals, 0))[:, None, :])
 
         self.normalization = sp.sqrt(
             (2 * sp.pi) ** self.X_arr.shape[1] * self.determinants)
@@ -109,6 +115,21 @@ class LocalTransition(Transition):
         return sp.average(sp.exp(-.5 * cov_distance) / self.normalization,
                           weights=self.w)
 
+    def logpdf(self, x):
+        x = x[self.X.columns].values
+        if len(x.shape) == 1:
+            return self._logpdf_single(x)
+        else:
+            return np.array([self._logpdf_single(x) for x in x])
+
+    def _logpdf_single(self, x):
+        distance = self.X_arr - x
+        cov_distance = np.einsum("ij,ijk,ik->i",
+                                 distance, self.inv_covs, distance)
+        return (logsumexp(-.5 * cov_distance - np.log(self.normalization),
+                          b=self.w)
+                - np.log(self.w.sum()))
+
     def _cov_and_inv(self, n, indices):
         """
         Calculate covariance around local support vector
@@ -139,7 +160,13 @@ class LocalTransition(Transition):
         return cov * self.scaling
 
     def rvs_single(self):
-        support_index = sp.random.choice(self.w.shape[0], p=self.w)
-        sample = sp.random.multivariate_normal(self.X_arr[support_index],
-                                               self.covs[support_index])
-        return pd.Series(sample, index=self.X.columns)
+        return pd.Series(self.rvs_array(1)[0], index=self.X.columns)
+
+    def rvs_array(self, size):
+        support_ixs = np.random.choice(self.w.shape[0], size=size, p=self.w)
+        # draw standard normal perturbations and transform them by the
+        # square roots of the local covariances of the support points
+        perturbations = np.einsum(
+            "ijk,ik->ij", self.cov_sqrts[support_ixs],
+            np.random.normal(size=(size, self.X_arr.shape[1])))
+        return self.X_arr[support_ixs] + perturbations
@@ -1,7 +1,13 @@
 from sklearn.model_selection import GridSearchCV as GridSearchCVSKL
+from sklearn.model_selection import check_cv
+from sklearn.base import clone
+from scipy.spatial.distance import cdist
+from scipy.special import logsumexp
+from joblib import Parallel, delayed
 import logging
 import numpy as np
 from .multivariatenormal import MultivariateNormalTransition
+from .util import smart_cov
 
 logger = logging.getLogger("GridSearchCV")
 
@@ -23,21 +29,47 @@ class GridSearchCV(GridSearchCVSKL):
     - param_grid = {'scaling': np.linspace(0.05, 1.0, 5)}
     - cv = 5
 
+    If the estimator is a
+    :class:`pyabc.transition.MultivariateNormalTransition` and only the
+    ``scaling`` is searched over, the search does not refit the KDE for
+    every candidate. Instead, per cross validation fold the Mahalanobis
+    distances between test and training points are computed once and
+    reused for all scaling values, since these only rescale the
+    covariance. The folds are evaluated in parallel on ``n_jobs``
+    processes.
+
+    Additional parameters
+    ---------------------
+
+    warm_start: int, optional (default = None)
+        If not None, in each but the first fit only the previous optimum
+        and the ``warm_start`` neighboring values on each side in the
+        (sorted) grid of each parameter are evaluated. This restricts the
+        search to the vicinity of the previous generation's optimum.
+        Parameters with non-numeric grid values are always searched over
+        their full grid.
     """
     def __init__(self, estimator=None, param_grid=None,
                  scoring=None, fit_params=None,
                  n_jobs=1, iid=True, refit=True, cv=5,
                  verbose=0, pre_dispatch='2*n_jobs', error_score='raise',
-                 return_train_score=True):
+                 return_train_score=True, warm_start=None):
 
         if estimator is None:
             estimator = MultivariateNormalTransition()
         if param_grid is None:
             param_grid = {'scaling': np.linspace(0.05, 1.0, 5)}
 
-        super().__init__(estimator, param_grid, scoring, fit_params, n_jobs,
-                         iid, refit, cv, verbose, pre_dispatch,
-                         error_score, return_train_score)
+        super().__init__(estimator=estimator, param_grid=param_grid,
+                         scoring=scoring, n_jobs=n_jobs, refit=refit, cv=cv,
+                         verbose=verbose, pre_dispatch=pre_dispatch,
+                         error_score=error_score,
+                         return_train_score=return_train_score)
+        # not supported by recent scikit-learn versions any more, but
+        # kept for backwards compatibility of the signature
+        self.fit_params = fit_params
+        self.iid = iid
+        self.warm_start = warm_start
 
     def fit(self, X, y=None, groups=None):
         if len(X) == 1:
@@ -50,17 +82,146 @@ class GridSearchCV(GridSearchCVSKL):
         if self.cv > len(X):  # pylint: disable=E0203
             old_cv = self.cv  # pylint: disable=E0203
             self.cv = len(X)
-            res = super().fit(X, y, groups)
+            res = self._fit_grid(X, y, groups)
             self.cv = old_cv
             logging.info("Reduced CV Gridsearch {} -> {}. Best params: {}"
                          .format(self.cv, len(X), self.best_params_))
             return res
 
-        res = super().fit(X, y, groups)
+        res = self._fit_grid(X, y, groups)
         logging.info("Best params: {}".format(self.best_params_))
         return res
 
+    def _fit_grid(self, X, y, groups):
+        """
+        Search the (possibly warm start restricted) parameter grid.
+        """
+        full_param_grid = self.param_grid
+        self.param_grid = self._warm_start_param_grid()
+        try:
+            if self._is_scaling_search():
+                return self._fit_scaling(X, y, groups)
+            return super().fit(X, y, groups=groups)
+        finally:
+            self.param_grid = full_param_grid
+
+    def _warm_start_param_grid(self):
+        if (self.warm_start is None
+                or not isinstance(self.param_grid, dict)
+                or "best_params_" not in self.__dict__):
+            return self.param_grid
+
+        param_grid = {}
+        for key, values in self.param_grid.items():
+            values = np.asarray(values)
+            if values.dtype.kind not in "iuf":
+                logger.warning(
+                    f"Warm start skipped for the non-numeric grid of {key}.")
+                param_grid[key] = self.param_grid[key]
+                continue
+            values = np.sort(values)
+            best_ix = int(np.argmin(np.abs(values - self.best_params_[key])))
+            param_grid[key] = values[max(best_ix - self.warm_start, 0):
+                                     best_ix + self.warm_start + 1]
+        return param_grid
+
+    def _is_scaling_search(self):
+        return (type(self.estimator) is MultivariateNormalTransition
+                and self.scoring is None
+                and isinstance(self.param_grid, dict)
+                and list(self.param_grid.keys()) == ["scaling"])
+
+    def _fit_scaling(self, X, w, groups):
+        """
+        Grid search over the scaling of a MultivariateNormalTransition,
+        sharing the distance computations between the scaling values.
+        """
+        scalings = np.asarray(self.param_grid["scaling"], dtype=float)
+        X_arr = np.asarray(X, dtype=float)
+        w = np.asarray(w, dtype=float)
+        splits = list(check_cv(self.cv).split(X_arr, w, groups))
+
+        fold_scores = Parallel(n_jobs=self.n_jobs, verbose=self.verbose,
+                               pre_dispatch=self.pre_dispatch)(
+            delayed(scaling_scores)(
+                X_arr[train], w[train], X_arr[test], w[test], scalings,
+                self.estimator.bandwidth_selector)
+            for train, test in splits)
+        fold_scores = np.array(fold_scores)
+
+        mean_scores = fold_scores.mean(axis=0)
+        best_ix = int(np.argmax(mean_scores))
+        self.cv_results_ = {
+            "params": [{"scaling": scaling} for scaling in scalings],
+            "param_scaling": scalings,
+            "mean_test_score": mean_scores,
+            "std_test_score": fold_scores.std(axis=0),
+            "rank_test_score":
+                (-mean_scores).argsort().argsort() + 1,
+        }
+        for k, scores in enumerate(fold_scores):
+            self.cv_results_["split{}_test_score".format(k)] = scores
+        self.n_splits_ = len(splits)
+        self.best_index_ = best_ix
+        self.best_score_ = mean_scores[best_ix]
+        self.best_params_ = {"scaling": scalings[best_ix]}
+
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(
+                **self.best_params_)
+            self.best_estimator_.fit(X, w)
+        return self
+
     def __getattr__(self, item):
         if item == "best_estimator_":
             raise AttributeError
         return getattr(self.best_estimator_, item)
+
+
+def scaling_scores(X_train, w_train, X_test, w_test, scalings,
+                   bandwidth_selector):
+    """
+    Score a MultivariateNormalTransition fitted to the training points for
+    all scaling values, as ``MultivariateNormalTransition.score``.
+
+    The density of the KDE for scaling s is
+
+    .. math::
+
+        \\sum_i w_i (2\\pi s)^{-r/2} |\\Sigma|^{-1/2}
+        \\exp\\left(-\\frac{m_i}{2s}\\right)
+
+    with :math:`m_i` the squared Mahalanobis distance to training
+    point i and r the rank of the unscaled covariance :math:`\\Sigma`,
+    so that the distances only need to be computed once.
+
+    Returns
+    -------
+
+    scores: np.ndarray
+        The scores for all scaling values.
+    """
+    w_train = w_train / w_train.sum()
+    sample_cov = smart_cov(X_train, w_train)
+    dim = sample_cov.shape[0]
+    eff_sample_size = 1 / (w_train**2).sum()
+    cov = sample_cov * bandwidth_selector(eff_sample_size, dim)**2
+
+    # pseudo-determinant and pseudo-inverse as in
+    # scipy.stats.multivariate_normal with allow_singular=True
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    eps = 1e6 * np.finfo(float).eps * np.abs(eigvals).max()
+    nonzero = eigvals > eps
+    rank = nonzero.sum()
+    log_pdet = np.log(eigvals[nonzero]).sum()
+    whitening = eigvecs[:, nonzero] / np.sqrt(eigvals[nonzero])
+    mahalanobis = cdist(X_test @ whitening, X_train @ whitening,
+                        "sqeuclidean")
+
+    scores = np.empty(len(scalings))
+    for k, scaling in enumerate(scalings):
+        log_dens = -.5 * (rank * np.log(2 * np.pi * scaling) + log_pdet
+                          + mahalanobis / scaling)
+        log_pdf = logsumexp(log_dens, b=w_train, axis=1)
+        scores[k] = (log_pdf * w_test).sum()
+    return scores
@@ -3,6 +3,7 @@ from typing import Union
 import numpy as np
 import pandas as pd
 import scipy.stats as st
+from scipy.special import logsumexp
 from .exceptions import NotEnoughParticles
 from .base import Transition
 from .util import smart_cov
@@ -62,19 +63,26 @@ class MultivariateNormalTransition(Transition):
         if len(X) == 0:
             raise NotEnoughParticles("Fitting not possible.")
         self._X_arr = X.values
-        sample_cov = smart_cov(self._X_arr, w)
+        if self._moments_match():
+            # use the moments accumulated during sampling
+            sample_cov = self.moments.cov(keys=list(X.columns))
+            eff_sample_size = self.moments.eff_sample_size
+        else:
+            sample_cov = smart_cov(self._X_arr, w)
+            eff_sample_size = 1 / (w**2).sum()
         dim = sample_cov.shape[0]
-        eff_sample_size = 1 / (w**2).sum()
         bw_factor = self.bandwidth_selector(eff_sample_size, dim)
         self.cov = sample_cov * bw_factor**2 * self.scaling
         self.normal = st.multivariate_normal(cov=self.cov, allow_singular=True)
 
     def rvs_single(self):
-        sample = self.X.sample(weights=self.w).iloc[0]
-        perturbed = (sample +
-                     np.random.multivariate_normal(
-                         np.zeros(self.cov.shape[0]), self.cov))
-        return perturbed
+        return pd.Series(self.rvs_array(1)[0], index=self.X.columns)
+
+    def rvs_array(self, size):
+        support_ixs = np.random.choice(self.w.shape[0], size=size, p=self.w)
+        perturbations = np.random.multivariate_normal(
+            np.zeros(self.cov.shape[0]), self.cov, size=size)
+        return self._X_arr[support_ixs] + perturbations
 
     def pdf(self, x: Union[pd.Series, pd.DataFrame]):
         x = x[self.X.columns]
@@ -84,3 +92,14 @@ class MultivariateNormalTransition(Transition):
         dens = np.array([(self.normal.pdf(xs - self._X_arr) * self.w).sum()
                          for xs in x])
         return dens if dens.size != 1 else float(dens)
+
+    def logpdf(self, x: Union[pd.Series, pd.DataFrame]):
+        x = x[self.X.columns]
+        x = np.array(x)
+        if len(x.shape) == 1:
+            x = x[None, :]
+        log_dens = np.array([
+            logsumexp(np.atleast_1d(self.normal.logpdf(xs - self._X_arr)),
+                      b=self.w)
+            for xs in x])
+        return log_dens if log_dens.size != 1 else float(log_dens)
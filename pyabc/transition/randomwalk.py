@@ -24,8 +24,18 @@ class DiscreteRandomWalkTransition(DiscreteTransition):
 
     n_steps: int, optional (default = 1)
         Number of random walk steps to take.
+
+    Attributes
+    ----------
+
+    MAX_CHUNK_ENTRIES: int
+        Maximum number of entries of the intermediate
+        (query points x support points x dimension) arrays in the pdf
+        evaluation. Query points are processed in chunks accordingly.
     """
 
+    MAX_CHUNK_ENTRIES = 2**22
+
     def __init__(self,
                  n_steps: int = 1,
                  p_l: float = 1. / 3,
@@ -37,21 +47,28 @@ class DiscreteRandomWalkTransition(DiscreteTransition):
         self.p_c = p_c
 
     def fit(self, X: pd.DataFrame, w: np.ndarray):
-        pass
+        self._X_arr = X.values
+        # the walk is separable, so the probability of a displacement
+        # factorizes over the dimensions and only depends on the
+        # displacement in [-n_steps, n_steps] in each of them
+        self._step_probabilities = calculate_step_probabilities(
+            self.n_steps, self.p_l, self.p_r, self.p_c)
 
     def rvs_single(self) -> pd.Series:
-        # take a step
-        dim = len(self.X.columns)
-        step = perform_random_walk(
-            dim, self.n_steps, self.p_l, self.p_r, self.p_c)
+        return pd.Series(self.rvs_array(1)[0], index=self.X.columns)
 
-        # select a start point
-        start_point = self.X.sample(weights=self.w).iloc[0]
+    def rvs_array(self, size: int) -> np.ndarray:
+        # take steps
+        dim = len(self.X.columns)
+        steps = perform_random_walk(
+            dim, self.n_steps, self.p_l, self.p_r, self.p_c, size=size)
 
-        # create randomized point
-        perturbed_point = start_point + step
+        # select start points
+        start_ixs = np.random.choice(self.w.shape[0], size=size, p=self.w)
+        start_points = self._X_arr[start_ixs]
 
-        return perturbed_point
+        # create randomized points
+        return start_points + steps
 
     def pdf(self, x: Union[pd.Series, pd.DataFrame]) \
             -> Union[float, np.ndarray]:
@@ -67,31 +84,64 @@ class DiscreteRandomWalkTransition(DiscreteTransition):
         if len(x.shape) == 1:
             return self.pdf_single(x)
         else:
-            return np.array([self.pdf_single(x_) for x_ in x])
+            return self._pdf_array(x)
 
     def pdf_single(self, x):
-        p = 0.0
-        for start, weight in zip(self.X.values, self.w):
-            # probability if started from start
-            p_start = calculate_single_random_walk_probability(
-                start, x, self.n_steps, self.p_l, self.p_r, self.p_c)
-            # add p_start times the weight associated to p_start
-            p += p_start * weight
-
-        return p
+        return float(self._pdf_array(np.atleast_2d(x))[0])
 
-
-def perform_random_walk(dim, n_steps, p_l, p_r, p_c):
+    def _pdf_array(self, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the PMF at all rows of `x` by looking up the step
+        probabilities of the displacements from all support points.
+        """
+        n_support, dim = self._X_arr.shape
+        # bound the size of the (query x support x dim) intermediates
+        chunk_size = max(1, self.MAX_CHUNK_ENTRIES // max(n_support * dim, 1))
+        dens = np.empty(x.shape[0])
+        for start in range(0, x.shape[0], chunk_size):
+            x_chunk = x[start:start + chunk_size]
+            steps = np.rint(
+                x_chunk[:, None, :] - self._X_arr[None, :, :]).astype(int)
+            reachable = np.abs(steps) <= self.n_steps
+            p_steps = self._step_probabilities[
+                np.where(reachable, steps + self.n_steps, 0)]
+            p_steps[~reachable] = 0.0
+            dens[start:start + chunk_size] = p_steps.prod(axis=2) @ self.w
+        return dens
+
+
+def perform_random_walk(dim, n_steps, p_l, p_r, p_c, size=None):
     """
     Perform a random walk in [-1, 0, 1] in each dimension, for `n_steps`
     steps.
+
+    If `size` is given, `size` independent walks are performed at once
+    and returned as an array of shape (size, dim).
+    """
+    shape = (n_steps, dim) if size is None else (n_steps, size, dim)
+    steps = np.random.choice(a=[-1, 0, 1], p=[p_l, p_c, p_r], size=shape)
+    return steps.sum(axis=0).astype(float)
+
+
+def calculate_step_probabilities(
+        n_steps, p_l: float = 1. / 3, p_r: float = 1. / 3,
+        p_c: float = 1. / 3):
+    """
+    Calculate the probabilities of a one-dimensional displacement of
+    -n_steps, ..., n_steps in `n_steps` steps, where the probabilities for
+    a left, right, and no step are `p_l`, `p_r`, `p_c`, respectively.
+
+    Returns
+    -------
+
+    step_probabilities: np.ndarray
+        Array of length 2 * n_steps + 1, the entry at index
+        ``step + n_steps`` giving the probability of displacement ``step``.
     """
-    state = np.zeros(dim)
-    for _ in range(n_steps):
-        # sample a step
-        step = np.random.choice(a=[-1, 0, 1], p=[p_l, p_c, p_r], size=dim)
-        state += step
-    return state
+    return np.array([
+        calculate_single_random_walk_probability(
+            np.zeros(1), np.array([step]), n_steps, p_l, p_r, p_c)
+        for step in range(-n_steps, n_steps + 1)])
 
 
 def calculate_single_random_walk_probability(
@@ -6,9 +6,10 @@ import functools
 
 def wrap_fit(f):
     @functools.wraps(f)
-    def fit(self, X, w):
+    def fit(self, X, w, moments=None):
         self.X = X
         self.w = w
+        self.moments = moments
         if len(X.columns) == 0:
             self.no_parameters = True
             return
@@ -29,6 +30,15 @@ def wrap_pdf(f):
     return pdf
 
 
+def wrap_logpdf(f):
+    @functools.wraps(f)
+    def logpdf(self, x):
+        if self.no_parameters:
+            return 0
+        return f(self, x)
+    return logpdf
+
+
 def wrap_rvs_single(f):
     @functools.wraps(f)
     def rvs_single(self):
@@ -38,6 +48,15 @@ def wrap_rvs_single(f):
     return rvs_single
 
 
+def wrap_rvs_array(f):
+    @functools.wraps(f)
+    def rvs_array(self, size):
+        if self.no_parameters:
+            return np.empty((size, 0))
+        return f(self, size)
+    return rvs_array
+
+
 class TransitionMeta(ABCMeta):
     """
     This metaclass handles the special case of no parameters.
@@ -48,4 +67,6 @@ class TransitionMeta(ABCMeta):
         ABCMeta.__init__(cls, name, bases, attrs)
         cls.fit = wrap_fit(cls.fit)
         cls.pdf = wrap_pdf(cls.pdf)
+        cls.logpdf = wrap_logpdf(cls.logpdf)
         cls.rvs_single = wrap_rvs_single(cls.rvs_single)
+        cls.rvs_array = wrap_rvs_array(cls.rvs_array)
@@ -49,3 +49,302 @@ def weighted_std(points, weights):
     mean = weighted_mean(points, weights)
     std = sp.sqrt(((points - mean)**2 * weights).sum())
     return std
+
+
+class WeightedMoments:
+    """
+    Streaming accumulator of the weighted first and second moments of
+    vector valued points, updated via Welford's algorithm.
+
+    Accumulators filled independently (e.g. on different workers) can be
+    merged, such that the weighted mean and covariance of a population
+    are available in O(d^2) as soon as the population is complete,
+    without revisiting the individual points. The weights do not need to
+    be normalized.
+
+    Parameters
+    ----------
+
+    keys: List[str], optional
+        Names of the point dimensions. Used to identify the dimensions
+        when the points are passed as dictionaries, and to match
+        dimensions to e.g. DataFrame columns.
+    """
+
+    def __init__(self, keys=None):
+        self.keys = None if keys is None else list(keys)
+        self.n = 0
+        self.sum_weights = 0.
+        self.sum_squared_weights = 0.
+        self._mean = None
+        self._m2 = None
+
+    def update(self, x, weight: float = 1.):
+        """
+        Add a single point.
+
+        Parameters
+        ----------
+
+        x: np.ndarray or dict
+            The point. If a dictionary, the entries are ordered according
+            to ``keys``, which are set from the sorted dictionary keys on
+            the first update if not given.
+        weight: float, optional (default = 1)
+            The (unnormalized) weight of the point.
+        """
+        x = self._to_array(x)
+        if self.n == 0:
+            self._mean = np.zeros(x.size)
+            self._m2 = np.zeros((x.size, x.size))
+        self.n += 1
+        self.sum_weights += weight
+        self.sum_squared_weights += weight**2
+        if self.sum_weights == 0:
+            return
+        delta = x - self._mean
+        self._mean += weight / self.sum_weights * delta
+        self._m2 += weight * np.outer(delta, x - self._mean)
+
+    def update_batch(self, X: np.ndarray, weights: np.ndarray):
+        """
+        Add a batch of points, given as rows of ``X``.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        weights = np.asarray(weights, dtype=float)
+        batch = WeightedMoments(self.keys)
+        batch.n = X.shape[0]
+        batch.sum_weights = weights.sum()
+        batch.sum_squared_weights = (weights**2).sum()
+        if batch.sum_weights > 0:
+            batch._mean = weights @ X / batch.sum_weights
+            deltas = X - batch._mean
+            batch._m2 = (deltas * weights[:, None]).T @ deltas
+        else:
+            batch._mean = np.zeros(X.shape[1])
+            batch._m2 = np.zeros((X.shape[1], X.shape[1]))
+        self.merge(batch)
+
+    def merge(self, other: "WeightedMoments"):
+        """
+        Merge the moments of another accumulator into this one.
+        """
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.keys = other.keys
+            self.n = other.n
+            self.sum_weights = other.sum_weights
+            self.sum_squared_weights = other.sum_squared_weights
+            self._mean = other._mean.copy()
+            self._m2 = other._m2.copy()
+            return
+        if (self.keys is not None and other.keys is not None
+                and self.keys != other.keys):
+            raise ValueError(
+                f"Cannot merge moments of different keys {self.keys} "
+                f"and {other.keys}.")
+
+        sum_weights = self.sum_weights + other.sum_weights
+        self.n += other.n
+        self.sum_squared_weights += other.sum_squared_weights
+        if sum_weights > 0:
+            delta = other._mean - self._mean
+            self._m2 += other._m2 + np.outer(delta, delta) \
+                * self.sum_weights * other.sum_weights / sum_weights
+            self._mean += delta * other.sum_weights / sum_weights
+        self.sum_weights = sum_weights
+
+    def __add__(self, other: "WeightedMoments") -> "WeightedMoments":
+        moments = WeightedMoments(self.keys)
+        moments.merge(self)
+        moments.merge(other)
+        return moments
+
+    @property
+    def mean(self) -> np.ndarray:
+        """
+        The weighted mean.
+        """
+        return self._mean
+
+    @property
+    def eff_sample_size(self) -> float:
+        """
+        The effective sample size, as ``1 / sum(w**2)`` for normalized
+        weights.
+        """
+        return self.sum_weights**2 / self.sum_squared_weights
+
+    def cov(self, keys=None) -> np.ndarray:
+        """
+        The weighted covariance, corresponding to
+        ``np.cov(X, aweights=w, rowvar=False)``. As for
+        :func:`pyabc.transition.util.smart_cov`, for a single point a
+        diagonal matrix of the absolute point entries is returned.
+
+        Parameters
+        ----------
+
+        keys: List[str], optional
+            If given, the dimensions are ordered according to these keys.
+        """
+        if self.n == 1:
+            cov = np.diag(np.absolute(self._mean))
+        else:
+            cov = self._m2 / (self.sum_weights
+                              - self.sum_squared_weights / self.sum_weights)
+        if keys is not None:
+            indices = [self.keys.index(key) for key in keys]
+            cov = cov[np.ix_(indices, indices)]
+        return cov
+
+    def _to_array(self, x) -> np.ndarray:
+        if hasattr(x, "keys"):
+            if self.keys is None:
+                self.keys = sorted(x.keys())
+            x = [x[key] for key in self.keys]
+        return np.asarray(x, dtype=float).ravel()
+
+
+class WeightedQuantileSketch:
+    """
+    Mergeable sketch of a weighted one-dimensional distribution in
+    bounded memory, for approximate weighted quantiles.
+
+    Points are buffered, and whenever more than ``max_size`` points are
+    held, they are sorted and merged into ``max_size // 2`` bins of equal
+    weight, each represented by the weighted mean of its points and its
+    total weight. The sketch thus holds at most ``max_size`` weighted
+    points, and resolves quantiles up to a probability mass of about
+    ``2 / max_size``. The total weight and the weighted mean are
+    preserved exactly. Sketches filled independently (e.g. on different
+    workers) can be merged.
+
+    Parameters
+    ----------
+
+    max_size: int, optional (default = 1000)
+        The maximum number of weighted points held.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self.n = 0
+        self._points = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer_points = []
+        self._buffer_weights = []
+
+    def update(self, point: float, weight: float = 1.):
+        """
+        Add a single point.
+        """
+        self.n += 1
+        self._buffer_points.append(point)
+        self._buffer_weights.append(weight)
+        if len(self._points) + len(self._buffer_points) > self.max_size:
+            self._flush()
+
+    def update_batch(self, points: np.ndarray, weights: np.ndarray = None):
+        """
+        Add a batch of points. If no weights are given, all points have
+        weight 1.
+        """
+        points = np.asarray(points, dtype=float).ravel()
+        if weights is None:
+            weights = np.ones_like(points)
+        weights = np.asarray(weights, dtype=float).ravel()
+        self.n += len(points)
+        self._flush(points, weights)
+
+    def merge(self, other: "WeightedQuantileSketch"):
+        """
+        Merge the points of another sketch into this one.
+        """
+        self.n += other.n
+        self._flush(other.points, other.weights)
+
+    def __add__(self, other: "WeightedQuantileSketch") \
+            -> "WeightedQuantileSketch":
+        sketch = WeightedQuantileSketch(self.max_size)
+        sketch.merge(self)
+        sketch.merge(other)
+        return sketch
+
+    @property
+    def points(self) -> np.ndarray:
+        """
+        The (merged) points held by the sketch.
+        """
+        self._flush()
+        return self._points
+
+    @property
+    def weights(self) -> np.ndarray:
+        """
+        The (unnormalized) weights of the points held by the sketch.
+        """
+        self._flush()
+        return self._weights
+
+    @property
+    def sum_weights(self) -> float:
+        """
+        The total weight of all points added.
+        """
+        return self.weights.sum()
+
+    def quantile(self, alpha: float = 0.5) -> float:
+        """
+        Approximate weighted alpha-quantile, as ``weighted_quantile`` of
+        all points added.
+        """
+        points, weights = self.points, self.weights
+        sum_weights = weights.sum()
+        if sum_weights <= 0:
+            return np.nan
+        return weighted_quantile(points, weights / sum_weights, alpha=alpha)
+
+    def _flush(self, points: np.ndarray = None, weights: np.ndarray = None):
+        """
+        Add the buffered and the passed points to the held points, and
+        compress if necessary.
+        """
+        if self._buffer_points:
+            self._points = np.concatenate(
+                (self._points, np.asarray(self._buffer_points, dtype=float)))
+            self._weights = np.concatenate(
+                (self._weights,
+                 np.asarray(self._buffer_weights, dtype=float)))
+            self._buffer_points, self._buffer_weights = [], []
+        if points is not None and len(points) > 0:
+            self._points = np.concatenate((self._points, points))
+            self._weights = np.concatenate((self._weights, weights))
+        if len(self._points) > self.max_size:
+            self._compress()
+
+    def _compress(self):
+        """
+        Merge the sorted points into bins of equal weight. Points of
+        weight zero are dropped.
+        """
+        n_bins = max(self.max_size // 2, 1)
+        positive = self._weights > 0
+        order = np.argsort(self._points[positive], kind="mergesort")
+        points = self._points[positive][order]
+        weights = self._weights[positive][order]
+        if len(points) <= self.max_size:
+            self._points, self._weights = points, weights
+            return
+
+        cum_weights = np.cumsum(weights)
+        bins = ((cum_weights - .5 * weights) / cum_weights[-1]
+                * n_bins).astype(int)
+        bins = np.clip(bins, 0, n_bins - 1)
+
+        bin_weights = np.bincount(bins, weights, n_bins)
+        nonempty = bin_weights > 0
+        self._points = (np.bincount(bins, weights * points, n_bins)[nonempty]
+                        / bin_weights[nonempty])
+        self._weights = bin_weights[nonempty]
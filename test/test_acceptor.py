@@ -0,0 +1,32 @@
+import numpy as np
+from pyabc import (AdaptivePNormDistance, ListEpsilon, SimpleAcceptor,
+                   accept_use_complete_history)
+
+
+def test_accept_use_complete_history():
+    samples = [{"a": a, "b": b} for a, b in np.random.randn(100, 2)]
+    x_0 = {"a": 0, "b": 0}
+    dist_f = AdaptivePNormDistance()
+    dist_f.handle_x_0(x_0)
+    for t in range(4):
+        dist_f.update(t, [{"a": sample["a"] * (t + 1), "b": sample["b"]}
+                          for sample in samples])
+    eps = ListEpsilon([2, 1.5, 1, 0.8])
+
+    for x in samples:
+        d, accept = accept_use_complete_history(3, dist_f, eps, x, x_0)
+        assert d == dist_f(3, x, x_0)
+        expected = all(dist_f(t, x, x_0) <= eps(t) for t in range(4))
+        assert accept == expected
+
+    # acceptors keep their own cache of the previous epsilons
+    acceptors = [SimpleAcceptor(accept_use_complete_history)
+                 for _ in range(2)]
+    epsilons = [eps, ListEpsilon([0.5, 1.5, 1, 0.8])]
+    for x in samples:
+        for acceptor, eps in zip(acceptors, epsilons):
+            _, accept = acceptor(3, dist_f, eps, x, x_0)
+            expected = all(dist_f(t, x, x_0) <= eps(t) for t in range(4))
+            assert accept == expected
+    assert acceptors[0]._criteria_cache["eps"] is epsilons[0]
+    assert acceptors[1]._criteria_cache["eps"] is epsilons[1]
@@ -0,0 +1,68 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from pyabc import (ABCSMC, RV, Distribution, DiscreteRandomWalkTransition,
+                   PNormDistance, SimpleModel, SimulationCache)
+from pyabc.sampler import SingleCoreSampler
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache(request, tmp_path):
+    entry_size = len(pickle.dumps({"y": 0.}))
+    path = None if request.param == "memory" else str(tmp_path / "cache.db")
+    return SimulationCache(max_bytes=3 * entry_size, path=path)
+
+
+def test_simulation_cache_lru(cache):
+    keys = [SimulationCache.key(0, {"a": a, "b": 1}) for a in range(4)]
+    assert keys[0] == SimulationCache.key(0, {"b": 1, "a": 0})
+    assert keys[0] != SimulationCache.key(1, {"a": 0, "b": 1})
+
+    for j, key in enumerate(keys[:3]):
+        cache.put(key, {"y": float(j)})
+    assert cache.get(keys[0]) == {"y": 0.}
+
+    # the least recently used entry is evicted
+    cache.put(keys[3], {"y": 3.})
+    assert len(cache) == 3
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"y": 0.}
+    assert cache.get(keys[3]) == {"y": 3.}
+
+    # entries larger than the cache are not stored
+    cache.put(keys[1], {"y": np.zeros(100)})
+    assert cache.get(keys[1]) is None
+
+    # pickled caches do not share the connection
+    loaded = pickle.loads(pickle.dumps(cache))
+    assert loaded.get(keys[3]) == {"y": 3.}
+
+
+def test_cached_run(db_path):
+    n_simulations = []
+
+    def model(pars):
+        n_simulations.append(1)
+        return {"y": pars["k"] ** 2}
+
+    abc = ABCSMC(SimpleModel(model, deterministic=True),
+                 Distribution(k=RV("randint", 0, 10)),
+                 PNormDistance(),
+                 population_size=30,
+                 transitions=DiscreteRandomWalkTransition(),
+                 sampler=SingleCoreSampler(),
+                 simulation_cache=SimulationCache())
+    abc.new(db_path, {"y": 9})
+    history = abc.run(minimum_epsilon=0, max_nr_populations=3)
+
+    counters = history.get_population_counters().reindex(
+        columns=["cache_hits", "cache_misses"]).fillna(0)
+    samples = history.get_all_populations().set_index("t")["samples"]
+    assert np.all(counters["cache_hits"] > 0)
+    assert np.all(counters["cache_hits"] + counters["cache_misses"]
+                  == samples[counters.index])
+    # each of the 10 parameters is simulated at most once, also in the
+    # calibration
+    assert len(n_simulations) <= 10
@@ -1,8 +1,13 @@
+import pickle
+
+import numpy as np
 import scipy as sp
 from pyabc import (PercentileDistanceFunction,
                    MinMaxDistanceFunction,
                    PNormDistance,
-                   AdaptivePNormDistance)
+                   AdaptivePNormDistance,
+                   ZScoreDistanceFunction,
+                   PCADistanceFunction)
 
 
 from pyabc.distance_functions import (
@@ -15,7 +20,9 @@ from pyabc.distance_functions import (
     mean_absolute_deviation_to_observation,
     combined_median_absolute_deviation,
     combined_mean_absolute_deviation,
-    standard_deviation_to_observation)
+    standard_deviation_to_observation,
+    StreamingScaleEstimator)
+from pyabc.sampler import SingleCoreSampler
 
 
 class MockABC:
@@ -113,3 +120,234 @@ def test_adaptivepnormdistance():
         dist_f.handle_x_0(x_0)
         dist_f.initialize(0, abc.sample_from_prior())
         dist_f(0, abc.sample_from_prior()[0], abc.sample_from_prior()[1])
+
+
+def test_pnormdistance_array_valued_sum_stats():
+    x_0 = {'s1': 1, 's2': sp.array([0, 1, 2]), 's3': sp.array([[1, 2]])}
+    x = {'s1': 2, 's2': sp.array([1, 1, 0]), 's3': sp.array([[0, 0]])}
+    w = {0: {'s1': 1, 's2': 2, 's3': 0.5}}
+
+    dist_f = PNormDistance(p=2, w=w)
+    expected = sp.sqrt(1**2 + 2**2 * (1 + 0 + 4) + 0.5**2 * (1 + 4))
+    assert sp.isclose(dist_f(0, x, x_0), expected)
+
+    dist_f = PNormDistance(p=sp.inf, w=w)
+    assert dist_f(0, x, x_0) == 4
+
+    dist_f = PNormDistance(p=1, w=w)
+    # statistics missing in x do not contribute
+    assert dist_f(0, {'s1': 3}, x_0) == 2
+    # weights for later time points are taken from the last time point
+    assert dist_f(5, {'s1': 3}, x_0) == 2
+
+
+def test_batch_distances():
+    samples = [{"a": a, "b": b, "c": c}
+               for a, b, c in np.random.randn(20, 3)]
+    x_0 = {"a": 0.5, "b": 0, "c": -1}
+    for dist_f in [PNormDistance(p=1), PNormDistance(p=2),
+                   PNormDistance(p=np.inf), PNormDistance(p=3),
+                   AdaptivePNormDistance(),
+                   ZScoreDistanceFunction(measures_to_use=["a", "b", "c"]),
+                   PCADistanceFunction(measures_to_use=["a", "c"]),
+                   MinMaxDistanceFunction(measures_to_use=["a", "b"]),
+                   PercentileDistanceFunction(measures_to_use=["c"])]:
+        dist_f.handle_x_0(x_0)
+        if dist_f.require_initialize:
+            dist_f.initialize(0, samples)
+        distances = dist_f.batch(0, samples, x_0)
+        expected = [dist_f(0, x, x_0) for x in samples]
+        assert distances.shape == (20,)
+        assert np.allclose(distances, expected)
+        assert dist_f.batch(0, [], x_0).shape == (0,)
+
+
+def test_adaptivepnormdistance_column_wise_scales():
+    samples = [{"a": a, "b": b, "c": c}
+               for a, b, c in np.random.randn(30, 3)]
+    # missing and constant summary statistics
+    for sample in samples[:10]:
+        del sample["b"]
+    for sample in samples:
+        sample["d"] = 1.
+    x_0 = {"a": 0.5, "b": 0, "c": -1, "d": 1., "e": 2.}
+
+    for scale_function in [median_absolute_deviation,
+                           mean_absolute_deviation,
+                           standard_deviation,
+                           bias,
+                           root_mean_square_deviation,
+                           median_absolute_deviation_to_observation,
+                           mean_absolute_deviation_to_observation,
+                           combined_median_absolute_deviation,
+                           combined_mean_absolute_deviation,
+                           standard_deviation_to_observation,
+                           lambda **kwargs: standard_deviation(**kwargs)]:
+        dist_f = AdaptivePNormDistance(scale_function=scale_function,
+                                       normalize_weights=False)
+        dist_f.handle_x_0(x_0)
+        dist_f.initialize(0, samples)
+
+        for key in ["a", "b", "c"]:
+            data = [sample[key] for sample in samples if key in sample]
+            expected = 1 / scale_function(data=data, x_0=x_0[key])
+            assert np.isclose(dist_f.w[0][key], expected)
+        # constant and missing summary statistics are ignored
+        assert dist_f.w[0]["d"] == 0
+        assert dist_f.w[0]["e"] == 0
+
+
+def test_streaming_scale_estimator():
+    samples = [{"a": a, "b": b} for a, b in np.random.randn(3000, 2)]
+    for sample in samples[:1000]:
+        del sample["b"]
+    x_0 = {"a": 0.5, "b": -1, "c": 0}
+
+    # fill two estimators and merge
+    estimator_1 = StreamingScaleEstimator(x_0.keys(), x_0, sketch_size=200)
+    estimator_2 = StreamingScaleEstimator(x_0.keys(), x_0, sketch_size=200)
+    for sample in samples[:500]:
+        estimator_1.update(sample)
+    for sample in samples[500:]:
+        estimator_2.update(sample)
+    estimator = estimator_1 + estimator_2
+    assert np.array_equal(estimator.n, [3000, 2000, 0])
+
+    for scale_function, atol in [
+            (standard_deviation, 1e-10),
+            (bias, 1e-10),
+            (root_mean_square_deviation, 1e-10),
+            (mean_absolute_deviation_to_observation, 1e-10),
+            (standard_deviation_to_observation, 1e-10),
+            (median_absolute_deviation, 0.05),
+            (mean_absolute_deviation, 0.05),
+            (median_absolute_deviation_to_observation, 0.05),
+            (combined_median_absolute_deviation, 0.1),
+            (combined_mean_absolute_deviation, 0.05)]:
+        scales = estimator.scales(scale_function)
+        for j, key in enumerate(["a", "b"]):
+            data = [sample[key] for sample in samples if key in sample]
+            assert np.isclose(scales[j],
+                              scale_function(data=data, x_0=x_0[key]),
+                              atol=atol)
+        assert np.isnan(scales[2])
+
+
+def test_streaming_scale_estimator_pickle():
+    keys = [f"s{j}" for j in range(200)]
+    x_0 = dict.fromkeys(keys, 0.)
+    rows = [dict(zip(keys, row)) for row in np.random.randn(3000, 200)]
+
+    # few buffered rows are pickled about as compactly as the raw values
+    estimator = StreamingScaleEstimator(keys, x_0)
+    for row in rows[:20]:
+        estimator.update(row)
+    raw_size = len(pickle.dumps([list(row.values()) for row in rows[:20]]))
+    assert len(pickle.dumps(estimator)) < raw_size + 5000
+
+    # the size is bounded by the sketches for many rows
+    estimator = StreamingScaleEstimator(keys, x_0, sketch_size=50)
+    for row in rows:
+        estimator.update(row)
+    assert len(pickle.dumps(estimator)) < 200 * 50 * 2 * 8 + 20000
+
+    loaded = pickle.loads(pickle.dumps(estimator))
+    for row in rows[:10]:
+        loaded.update(row)
+        estimator.update(row)
+    assert np.array_equal(loaded.n, estimator.n)
+    for scale_function in [standard_deviation, median_absolute_deviation]:
+        assert np.allclose(loaded.scales(scale_function),
+                           estimator.scales(scale_function))
+
+
+def test_adaptivepnormdistance_streaming():
+    samples = [{"a": a, "b": b} for a, b in np.random.randn(100, 2)]
+    x_0 = {"a": 0, "b": 1}
+
+    dist_f = AdaptivePNormDistance(streaming=True)
+    dist_f.handle_x_0(x_0)
+    sampler = SingleCoreSampler()
+    dist_f.configure_sampler(sampler)
+    assert not sampler.sample_factory.record_rejected
+
+    estimator = sampler.sample_factory().sum_stats_estimator
+    for sample in samples:
+        estimator.update(sample)
+    dist_f.update(1, [], sum_stats_estimator=estimator)
+
+    expected = AdaptivePNormDistance()
+    expected.handle_x_0(x_0)
+    expected.update(1, samples)
+    for key in x_0:
+        assert np.isclose(dist_f.w[1][key], expected.w[1][key])
+
+
+def test_pnormdistance_at_times():
+    x_0 = {"a": 0, "b": 1, "c": 2}
+    x = {"a": 1, "b": -1, "c": 2.5}
+    w = {t: {key: weight for key, weight in zip(x_0, np.random.rand(3))}
+         for t in range(4)}
+    for p in [1, 2, 3, np.inf]:
+        dist_f = PNormDistance(p=p, w=w)
+        ts = [0, 2, 3, 5]
+        distances = dist_f.at_times(ts, x, x_0)
+        assert np.allclose(distances, [dist_f(t, x, x_0) for t in ts])
+        # cached layout
+        assert np.allclose(dist_f.at_times(ts, x, x_0), distances)
+
+
+def test_pca_distance_cached_x_0():
+    samples = [{"a": a, "b": b} for a, b in np.random.randn(50, 2)]
+    x_0 = {"a": 0.5, "b": -1}
+    x = {"a": 1, "b": 2}
+    dist_f = PCADistanceFunction(measures_to_use=["a", "b"])
+    for scale in [1, 10]:
+        scaled_samples = [{key: scale * value for key, value in sample.items()}
+                          for sample in samples]
+        dist_f.initialize(0, scaled_samples)
+        whitening = dist_f._whitening_transformation_matrix
+        expected = np.linalg.norm(whitening.dot([0.5, 3]))
+        assert np.isclose(dist_f(0, x, x_0), expected)
+        assert np.isclose(dist_f.batch(0, [x], x_0)[0], expected)
+
+
+def test_pnormdistance_lower_bound():
+    x_0 = {"a": 0, "b": 1, "c": np.array([2, 3])}
+    x = {"a": 1, "b": -1, "c": np.array([2.5, 3])}
+    for dist_f in [PNormDistance(p=1), PNormDistance(p=2),
+                   PNormDistance(p=np.inf), AdaptivePNormDistance()]:
+        dist_f.handle_x_0(x_0)
+        bounds = [dist_f.lower_bound(0, {key: x[key] for key in keys}, x_0)
+                  for keys in [[], ["a"], ["a", "c"], ["a", "b", "c"]]]
+        assert bounds[0] == 0
+        assert np.all(np.diff(bounds) >= 0)
+        assert np.isclose(bounds[-1], dist_f(0, x, x_0))
+        # weights are initialized for all summary statistics
+        assert set(dist_f.w[0]) == set(x_0)
+
+    # other distance functions have the trivial bound
+    dist_f = PercentileDistanceFunction(measures_to_use=["a"])
+    assert dist_f.lower_bound(0, {"a": 10}, {"a": 0}) == 0
+
+
+def test_batch_reuses_stacked_sum_stats():
+    samples = [{"a": a, "b": b} for a, b in np.random.randn(50, 2)]
+    x_0 = {"a": 0, "b": 1}
+    dist_f = AdaptivePNormDistance()
+    dist_f.handle_x_0(x_0)
+    dist_f.initialize(0, samples)
+
+    distances = dist_f.batch(0, samples, x_0)
+    stacked = dist_f._stacked[3]
+    dist_f.update(1, [{"a": 2 * x["a"], "b": x["b"]} for x in samples])
+    distances_1 = dist_f.batch(1, samples, x_0)
+    # the same summary statistics are stacked only once
+    assert dist_f._stacked[3] is stacked
+    assert np.allclose(distances, [dist_f(0, x, x_0) for x in samples])
+    assert np.allclose(distances_1, [dist_f(1, x, x_0) for x in samples])
+
+    # a new list is stacked anew, and the matrix is not pickled
+    dist_f.batch(1, list(samples), x_0)
+    assert dist_f._stacked[3] is not stacked
+    assert pickle.loads(pickle.dumps(dist_f))._stacked is None
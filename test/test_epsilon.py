@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from pyabc import QuantileEpsilon, Parameter
+from pyabc.population import Particle
+from pyabc.sampler import SingleCoreSampler
+
+
+def test_quantile_epsilon_sketch():
+    distances = np.random.rand(2000)
+    weights = np.random.rand(2000)
+
+    eps = QuantileEpsilon(alpha=0.3, sketch_size=1000)
+    sampler = SingleCoreSampler()
+    eps.configure_sampler(sampler)
+
+    # fill two samples and merge
+    samples = [sampler.sample_factory(), sampler.sample_factory()]
+    for j, (distance, weight) in enumerate(zip(distances, weights)):
+        samples[j % 2].append(Particle(
+            m=0, parameter=Parameter({"a": 1}), weight=weight,
+            accepted_sum_stats=[{}], accepted_distances=[distance]))
+    sample = samples[0] + samples[1]
+
+    weighted_distances = pd.DataFrame(
+        {'distance': distances, 'w': weights / weights.sum()})
+    eps.update(1, None, distance_sketch=sample.distance_sketch)
+    eps.update(2, weighted_distances)
+    assert np.isclose(eps(1), eps(2), atol=0.01)
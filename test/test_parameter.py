@@ -20,3 +20,13 @@ def test_pickle():
     loaded = pickle.loads(s)
     assert loaded is not par
     assert loaded == par
+
+
+def test_nested_and_flat():
+    nested = Parameter({"a": 1, "b": {"c": 2, "d": {"e": 3}}})
+    assert nested == {"a": 1, "b.c": 2, "b.d.e": 3}
+    flat = Parameter({"a": 1, "b": 2})
+    assert flat == {"a": 1, "b": 2}
+    assert flat.copy() == flat and flat.copy() is not flat
+    assert flat + flat == {"a": 2, "b": 4}
+    assert not hasattr(flat, "__dict__")
@@ -0,0 +1,117 @@
+import numpy as np
+from pyabc import Parameter, PNormDistance
+from pyabc.population import Particle, Population
+
+
+def create_population():
+    particles = [
+        Particle(m=m, parameter=Parameter({"a": a}), weight=weight,
+                 accepted_sum_stats=[{"s": a + j} for j in range(n_sum_stats)],
+                 accepted_distances=[a + j for j in range(n_sum_stats)])
+        for m, a, weight, n_sum_stats in [(0, 1., 1., 1), (0, 2., 3., 2),
+                                          (1, 3., 2., 1)]]
+    return Population(particles)
+
+
+def test_weighted_distances():
+    population = create_population()
+    weighted_distances = population.get_weighted_distances()
+    assert list(weighted_distances.columns) == ["distance", "w"]
+    assert np.array_equal(weighted_distances.distance, [1, 2, 3, 3])
+    assert np.allclose(weighted_distances.w,
+                       [1 / 6, 3 / 6, 3 / 6, 2 / 6])
+
+
+def test_update_distances_batch():
+    population = create_population()
+    distance = PNormDistance(p=1)
+    x_0 = {"s": 2.5}
+
+    def distances_to_ground_truth(sum_stats):
+        return distance.batch(0, sum_stats, x_0)
+
+    population.update_distances_batch(distances_to_ground_truth)
+    assert [particle.accepted_distances
+            for particle in population.get_list()] == \
+        [[1.5], [.5, .5], [.5]]
+    assert np.array_equal(population.get_accepted_distances(),
+                          [1.5, .5, .5, .5])
+
+
+def test_population_arrays_and_views():
+    particles = [
+        Particle(m=m, parameter=Parameter(parameter), weight=weight,
+                 accepted_sum_stats=[{"s": 1.}], accepted_distances=[1.])
+        for m, parameter, weight in [(1, {"a": 1., "b": 2.}, 1.),
+                                     (0, {"c": 3.}, 1.),
+                                     (1, {"a": 4., "b": 5.}, 3.)]]
+    population = Population(particles)
+    assert len(population) == 3
+    assert population.get_model_probabilities() == {1: 0.8, 0: 0.2}
+
+    parameters, weights = population.get_parameters(1)
+    assert list(parameters.columns) == ["a", "b"]
+    assert np.array_equal(parameters.values, [[1, 2], [4, 5]])
+    assert np.allclose(weights, [.25, .75])
+    parameters, weights = population.get_parameters(0)
+    assert list(parameters.columns) == ["c"]
+    assert np.array_equal(weights, [1])
+
+    views = population.get_list()
+    assert [particle.m for particle in views] == [1, 0, 1]
+    assert [dict(particle.parameter) for particle in views] == \
+        [{"a": 1, "b": 2}, {"c": 3}, {"a": 4, "b": 5}]
+    assert [particle.weight for particle in views] == [.25, 1, .75]
+    store = population.to_dict()
+    assert list(store) == [1, 0]
+    assert [len(store[m]) for m in store] == [2, 1]
+
+
+def test_normalize_log_weights():
+    particles = [
+        Particle(m=m, parameter=Parameter({"a": 1.}), weight=0.,
+                 accepted_sum_stats=[{}], accepted_distances=[1.],
+                 log_weight=log_weight)
+        for m, log_weight in [(0, -1000.), (0, -1000. + np.log(3)),
+                              (1, -1000.)]]
+    population = Population(particles)
+    assert np.allclose(list(population.get_model_probabilities().values()),
+                       [.8, .2])
+    assert np.allclose([particle.weight
+                        for particle in population.get_list()],
+                       [.25, .75, 1])
+    assert np.allclose([particle.log_weight
+                        for particle in population.get_list()],
+                       np.log([.25, .75, 1]))
+
+
+def test_views_keep_counters_and_integers():
+    particles = [
+        Particle(m=m, parameter=Parameter(parameter), weight=1.,
+                 accepted_sum_stats=[{}], accepted_distances=[1.],
+                 counters=counters)
+        for m, parameter, counters in [
+            (0, {"n": 1, "x": .5}, {"evals": 2}),
+            (0, {"n": np.int64(2), "x": 1}, None),
+            (1, {"k": 3}, {"evals": 1})]]
+    views = Population(particles).get_list()
+    assert [dict(particle.parameter) for particle in views] == \
+        [{"n": 1, "x": .5}, {"n": 2, "x": 1.}, {"k": 3}]
+    assert [type(particle.parameter["n"]) for particle in views[:2]] == \
+        [int, int]
+    assert type(views[1].parameter["x"]) is float
+    assert type(views[2].parameter["k"]) is int
+    assert [particle.counters for particle in views] == \
+        [{"evals": 2}, None, {"evals": 1}]
+
+
+def test_get_parameters_as_history():
+    particles = [
+        Particle(m=0, parameter=Parameter({"b": b, "a": a}), weight=weight,
+                 accepted_sum_stats=[{}], accepted_distances=[1.])
+        for a, b, weight in [(1., 2., 1.), (3., 4., 3.)]]
+    parameters, weights = Population(particles).get_parameters(0)
+    # columns are sorted, as in History.get_distribution
+    assert list(parameters.columns) == ["a", "b"]
+    assert np.array_equal(parameters.values, [[1, 2], [3, 4]])
+    assert np.allclose(weights, [.25, .75])
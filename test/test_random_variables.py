@@ -0,0 +1,137 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as st
+
+from pyabc import RV, Distribution, LowerBoundDecorator, Parameter
+from pyabc.native_rvs import NativeNorm, NativeRV
+from pyabc.smc import _sample_from_prior
+
+
+@pytest.fixture
+def distribution():
+    return Distribution(b=RV("uniform", -1, 2),
+                        a=RV("norm", 0, 1),
+                        k=RV("randint", 0, 4),
+                        c=LowerBoundDecorator(RV("norm", 0, 1), .5))
+
+
+def test_rvs_size(distribution):
+    assert distribution.get_column_names() == ["a", "b", "c", "k"]
+    X = distribution.rvs(size=500)
+    assert X.shape == (500, 4)
+    assert np.all((X[:, 1] >= -1) & (X[:, 1] <= 1))
+    assert np.all(X[:, 2] > .5)
+    assert set(np.unique(X[:, 3])) <= {0, 1, 2, 3}
+
+    parameters = distribution.rvs_parameters(3)
+    assert len(parameters) == 3
+    assert all(isinstance(parameter, Parameter) for parameter in parameters)
+    assert isinstance(parameters[0]["k"], int)
+
+
+def test_pdf_matrix(distribution):
+    X = distribution.rvs(size=100)
+    names = distribution.get_column_names()
+    expected = np.array([distribution.pdf(dict(zip(names, x))) for x in X])
+    assert np.allclose(distribution.pdf(X), expected)
+    assert np.allclose(distribution.logpdf(X), np.log(expected))
+
+    df = pd.DataFrame(X, columns=names)[["k", "c", "b", "a"]]
+    assert np.allclose(distribution.pdf(df), expected)
+
+    # outside of the support
+    X[0, 2] = 0
+    assert distribution.pdf(X)[0] == 0
+    assert distribution.logpdf(X)[0] == -np.inf
+
+    with pytest.raises(Exception):
+        distribution.pdf(X[:, :3])
+
+
+def test_pdf_single(distribution):
+    parameter = distribution.rvs()
+    assert np.isclose(distribution.pdf(parameter),
+                      distribution.pdf(pd.Series(dict(parameter))))
+    assert np.isclose(distribution.logpdf(parameter),
+                      np.log(distribution.pdf(parameter)))
+    with pytest.raises(Exception):
+        distribution.pdf({"a": 0})
+
+
+def test_logpdf_no_underflow():
+    distribution = Distribution(
+        **{f"p{j}": LowerBoundDecorator(RV("norm", 0, 1), -1)
+           for j in range(500)})
+    X = np.full((3, 500), 3.)
+    assert np.all(distribution.pdf(X) == 0)
+    log_densities = distribution.logpdf(X)
+    expected = 500 * (RV("norm", 0, 1).logpdf(3)
+                      - np.log(RV("norm", 0, 1).sf(-1)))
+    assert np.allclose(log_densities, expected)
+    parameter = Parameter(dict(zip(distribution.get_column_names(), X[0])))
+    assert np.isclose(distribution.logpdf(parameter), expected)
+
+
+@pytest.mark.parametrize("name, args, kwargs", [
+    ("uniform", (-1, 3), {}),
+    ("norm", (1,), {"scale": 2}),
+    ("lognorm", (.5,), {"loc": 1, "scale": 2}),
+    ("beta", (2, 3), {}),
+    ("beta", (.5, 1), {"loc": -1, "scale": 2}),
+    ("gamma", (2.5,), {"scale": .5})])
+def test_native_rv(name, args, kwargs):
+    rv = RV(name, *args, **kwargs)
+    assert rv.native is not None
+    reference = getattr(st, name)(*args, **kwargs)
+
+    x = np.linspace(-3, 5, 81)
+    with np.errstate(divide="ignore"):
+        assert np.allclose(rv.pdf(x), reference.pdf(x))
+        assert np.allclose(rv.logpdf(x), reference.logpdf(x))
+    assert np.allclose(rv.cdf(x), reference.cdf(x))
+    assert np.isclose(rv.pdf(x[50]), reference.pdf(x[50]))
+
+    samples = rv.rvs(size=10000)
+    assert samples.shape == (10000,)
+    assert np.isclose(samples.mean(), reference.mean(),
+                      atol=5 * reference.std() / 100)
+
+    # serialization
+    loaded = pickle.loads(pickle.dumps(rv))
+    assert loaded.native is not None
+    assert loaded.pdf(x[50]) == rv.pdf(x[50])
+    from_dictionary = RV.from_dictionary(
+        {"type": name, "args": args, "kwargs": kwargs})
+    assert from_dictionary.pdf(x[50]) == rv.pdf(x[50])
+
+
+def test_native_rv_fallback():
+    # invalid arguments and other distributions use scipy.stats
+    assert RV("norm", 0, -1).native is None
+    assert RV("poisson", 2).native is None
+    assert RV("randint", 0, 3).native is None
+    assert RV("uniform", 0, 1).native is not None
+
+
+def test_native_rv_abstract():
+    with pytest.raises(TypeError):
+        NativeRV()
+    np.random.seed(0)
+    samples = NativeNorm(1, 2)._standard_rvs(10000)
+    assert abs(samples.mean()) < .05 and abs(samples.std() - 1) < .05
+
+
+def test_sample_from_prior_without_rvs_parameters(distribution):
+    class Prior:
+        def rvs(self):
+            return Parameter(a=np.random.randint(3))
+
+    parameters = _sample_from_prior(Prior(), 5)
+    assert len(parameters) == 5
+    assert all(parameter["a"] in range(3) for parameter in parameters)
+    parameters = _sample_from_prior(distribution, 5)
+    assert [sorted(parameter) for parameter in parameters] == \
+        [["a", "b", "c", "k"]] * 5
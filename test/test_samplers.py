@@ -1,4 +1,6 @@
+import itertools
 import multiprocessing
+import pickle
 import pytest
 import numpy as np
 import scipy as sp
@@ -7,9 +9,10 @@ from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pyabc import (ABCSMC, RV, Distribution,
                    MedianEpsilon,
                    PercentileDistanceFunction, SimpleModel,
+                   StreamingModel, AdaptivePNormDistance,
                    ConstantPopulationSize,
-                   History)
-from pyabc.sampler import (SingleCoreSampler,
+                   History, Parameter)
+from pyabc.sampler import (Sample, SingleCoreSampler,
                            MappingSampler,
                            MulticoreParticleParallelSampler,
                            DaskDistributedSampler,
@@ -225,3 +228,223 @@ def test_redis_multiprocess():
     sample = sampler.sample_until_n_accepted(10, simulate_one)
     assert 10 == len(sample.get_accepted_population())
     sampler.cleanup()
+
+
+@pytest.mark.parametrize("sampler_class", [SingleCoreSampler,
+                                           MulticoreEvalParallelSampler])
+def test_batch_sampling(sampler_class):
+    sampler = sampler_class(batch_size=7)
+
+    def simulate_one():
+        raise AssertionError("Batches should be simulated.")
+
+    # every other particle is accepted, starting with a rejection
+    counter = itertools.count()
+
+    def simulate_batch(size):
+        assert 1 <= size <= 7
+        particles = []
+        for _ in range(size):
+            j = next(counter)
+            particles.append(Particle(0, Parameter(j=j), 0.1, [], [],
+                                      accepted=j % 2 == 1))
+        return particles
+
+    simulate_one.simulate_batch = simulate_batch
+    sample = sampler.sample_until_n_accepted(10, simulate_one)
+    population = sample.get_accepted_population().get_list()
+    assert 10 == len(population)
+    assert all(particle.parameter["j"] % 2 == 1 for particle in population)
+    assert sampler.nr_evaluations_ > 10
+
+    # with all_accepted, e.g. from the prior, exactly n particles are
+    # simulated
+    sizes = multiprocessing.Manager().list()
+
+    def simulate_accepted_batch(size):
+        sizes.append(size)
+        return [Particle(0, Parameter(), 0.1, [], [], accepted=True)
+                for _ in range(size)]
+
+    simulate_one.simulate_batch = simulate_accepted_batch
+    sample = sampler.sample_until_n_accepted(10, simulate_one,
+                                             all_accepted=True)
+    assert 10 == len(sample.get_accepted_population())
+    assert sampler.nr_evaluations_ == 10
+    assert sum(sizes) == 10 and max(sizes) <= 7
+
+    if sampler_class is SingleCoreSampler:
+        # the sampler relies on all_accepted and stops after n simulations
+        simulate_one.simulate_batch = simulate_batch
+        with pytest.raises(AssertionError):
+            sampler.sample_until_n_accepted(10, simulate_one,
+                                            all_accepted=True)
+        assert sampler.nr_evaluations_ == 10
+
+
+def test_batch_model(db_path):
+    batch_sizes = []
+
+    def model(pars):
+        raise AssertionError("The batch function should be used.")
+
+    def model_batch(pars):
+        batch_sizes.append(len(pars))
+        ys = pars["x"].values + 0.1 * np.random.randn(len(pars))
+        return [{"y": y} for y in ys]
+
+    abc = ABCSMC(SimpleModel(model, sample_batch_function=model_batch),
+                 Distribution(x=RV("uniform", -1, 2)),
+                 PercentileDistanceFunction(measures_to_use=["y"]),
+                 population_size=50,
+                 sampler=SingleCoreSampler(batch_size=20))
+    abc.new(db_path, {"y": 0.3})
+    history = abc.run(minimum_epsilon=0, max_nr_populations=3)
+
+    assert history.max_t == 2
+    assert max(batch_sizes) == 20
+    df, w = history.get_distribution(0)
+    assert abs(np.sum(df["x"].values * w) - 0.3) < 0.2
+
+
+class UniformPrior:
+    """
+    A prior which is not a Distribution, only sampling and evaluating
+    single parameters.
+    """
+
+    def rvs(self):
+        return Parameter(x=np.random.uniform(-1, 1))
+
+    def pdf(self, parameter):
+        return float(-1 <= parameter["x"] <= 1) / 2
+
+
+def test_duck_typed_prior(db_path):
+    def model(pars):
+        return {"y": pars["x"] + 0.1 * np.random.randn()}
+
+    abc = ABCSMC(model, UniformPrior(),
+                 PercentileDistanceFunction(measures_to_use=["y"]),
+                 population_size=50, sampler=SingleCoreSampler())
+    abc.new(db_path, {"y": 0.3})
+    history = abc.run(minimum_epsilon=0, max_nr_populations=3)
+
+    assert history.max_t == 2
+    df, w = history.get_distribution(0)
+    assert np.all(np.isfinite(w)) and np.isclose(w.sum(), 1)
+    assert abs(np.sum(df["x"].values * w) - 0.3) < 0.2
+
+
+class ChunkedGaussian(StreamingModel):
+    def sample_stream(self, pars):
+        for j in range(self.n_chunks):
+            yield {f"y{j}": pars["x"] + 0.5 * np.random.randn()}
+
+
+class RecordingDistance(AdaptivePNormDistance):
+    def __init__(self):
+        super().__init__(p=1)
+        self.updated_sum_stats = []
+
+    def update(self, t, all_sum_stats, **kwargs):
+        self.updated_sum_stats.extend(all_sum_stats)
+        return super().update(t, all_sum_stats, **kwargs)
+
+
+def test_streaming_model(db_path):
+    n_chunks = 5
+    distance = RecordingDistance()
+    abc = ABCSMC(ChunkedGaussian(n_chunks=n_chunks),
+                 Distribution(x=RV("uniform", -2, 4)),
+                 distance,
+                 population_size=50,
+                 sampler=SingleCoreSampler())
+    abc.new(db_path, {f"y{j}": 0.5 for j in range(n_chunks)})
+    history = abc.run(minimum_epsilon=0, max_nr_populations=3)
+
+    counters = history.get_population_counters()
+    assert list(counters.index) == [0, 1, 2]
+    populations = history.get_all_populations().set_index("t")
+    for t in counters.index:
+        n_samples = populations.loc[t, "samples"]
+        assert 0 < counters.loc[t, "stream_aborted"] < n_samples
+        assert counters.loc[t, "stream_chunks"] < n_chunks * n_samples
+        assert counters.loc[t, "stream_chunks"] \
+            + counters.loc[t, "stream_chunks_saved"] \
+            == n_chunks * n_samples
+
+    # the accepted particles are completely simulated
+    for sum_stats in history.get_weighted_sum_stats(t=2)[1]:
+        assert len(sum_stats) == n_chunks
+
+    # the scales are only estimated from complete simulations
+    assert len(distance.updated_sum_stats) > 0
+    for sum_stats in distance.updated_sum_stats:
+        assert len(sum_stats) == n_chunks
+
+
+def failing_first_map(f, x):
+    # the first task fails, later results are returned in reverse order
+    results = [f(task) for task in x]
+    return [ValueError("Task failed.")] + results[:0:-1]
+
+
+def test_mapping_sampler_chunks():
+    # every other particle is accepted, starting with a rejection, such
+    # that task k simulates the particles 6k, ..., 6k + 5
+    counter = itertools.count()
+
+    def simulate_one():
+        j = next(counter)
+        return Particle(0, Parameter(j=j), 0.1, [], [], accepted=j % 2 == 1)
+
+    # the simulation function is not pickled to share the counter
+    sampler = MappingSampler(failing_first_map, mapper_pickles=True,
+                             acceptances_per_task=3, over_submission=0.5)
+    sample = sampler.sample_until_n_accepted(10, simulate_one)
+    population = sample.get_accepted_population().get_list()
+    # the first 10 acceptances of the tasks 1 to 5 in submission order
+    assert sorted(particle.parameter["j"] for particle in population) \
+        == list(range(7, 27, 2))
+    # all simulations of the 5 successful tasks count
+    assert sampler.nr_evaluations_ == 30
+
+    # without over-submission, the failed task leaves too few acceptances
+    sampler = MappingSampler(failing_first_map, mapper_pickles=True,
+                             acceptances_per_task=3)
+    with pytest.raises(RuntimeError, match="task 0: ValueError"):
+        sampler.sample_until_n_accepted(10, simulate_one)
+
+    def simulate_random():
+        return Particle(0, {}, 0.1, [], [], accepted=np.random.rand() < 0.5)
+
+    with multiprocessing.Pool(2) as pool:
+        sampler = MappingSampler(pool.imap_unordered,
+                                 acceptances_per_task=4,
+                                 over_submission=0.3)
+        sample = sampler.sample_until_n_accepted(10, simulate_random)
+    assert 10 == len(sample.get_accepted_population())
+    assert sampler.nr_evaluations_ >= 10
+
+    # the state sent to the workers is complete
+    loaded = pickle.loads(pickle.dumps(sampler))
+    assert (loaded.acceptances_per_task, loaded.over_submission) == (4, 0.3)
+
+
+def test_sample_accepted_moments():
+    sample = Sample()
+    for m, parameter, weight in [(0, {"a": 1.}, 1.), (0, {"a": 5.}, 0.),
+                                 (0, {"a": 3.}, 1.), (1, {"s": "x"}, 1.)]:
+        sample.append(Particle(m, Parameter(parameter), weight, [], [],
+                               accepted=True))
+    # zero weights are skipped, non-numeric parameters disable the moments
+    assert sample.accepted_moments[0].n == 2
+    assert np.allclose(sample.accepted_moments[0].mean, [2.])
+    assert sample.accepted_moments[1] is None
+
+    other = Sample()
+    other.append(Particle(1, Parameter(s=2.), 1., [], [], accepted=True))
+    merged = other + sample
+    assert merged.accepted_moments[0].n == 2
+    assert merged.accepted_moments[1] is None
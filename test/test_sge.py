@@ -1,4 +1,15 @@
-from pyabc.sge import SGE
+import os
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from pyabc.sge import SGE, LocalSGE
+from pyabc.sge.db import SQLiteJobDB
+from pyabc.sge.result_stream import (
+    FileResultStream, SocketResultStream, result_stream_factory)
 
 
 def test_sge_setup():
@@ -8,3 +19,104 @@ def test_sge_setup():
     # on the test system first).
     sge = SGE(priority=-500, memory="1G", name="test", time_h=1)
     repr(sge)
+
+
+@pytest.mark.parametrize("stream_class",
+                         [FileResultStream, SocketResultStream])
+def test_result_stream(stream_class, tmpdir):
+    tmp_dir = str(tmpdir)
+    os.mkdir(os.path.join(tmp_dir, "results"))
+    stream = stream_class(tmp_dir)
+    stream.open()
+    try:
+        assert stream.receive(0) == []
+        # the tasks find the stream opened by the mapper
+        task_stream = result_stream_factory(tmp_dir)
+        assert type(task_stream) is stream_class
+        task_stream.send(2, [4, ValueError("3")])
+        task_stream.send(1, [1])
+        received = stream.receive(5)
+        received += stream.receive(1) if len(received) < 2 else []
+        assert sorted(nr for nr, _ in received) == [1, 2]
+        assert dict(received)[2][0] == 4
+        assert stream.receive(0) == []
+    finally:
+        stream.close()
+    assert not any(name.endswith(".tmp")
+                   for name in os.listdir(os.path.join(tmp_dir, "results")))
+
+
+def test_socket_result_stream_broken_tasks(tmpdir):
+    tmp_dir = str(tmpdir)
+    stream = SocketResultStream(tmp_dir)
+    stream.TIMEOUT = 2
+    stream.open()
+    try:
+        address = (stream.host, stream.port)
+        # a task stalling after sending part of its result
+        stalled = socket.create_connection(address)
+        stalled.sendall(struct.pack("!Q", 100) + b"x")
+        # a task disconnecting in the middle of sending
+        with socket.create_connection(address) as broken:
+            broken.sendall(struct.pack("!Q", 100) + b"x")
+        # the results of the other tasks are not delayed
+        start = time.time()
+        result_stream_factory(tmp_dir).send(1, [1])
+        assert stream.receive(10) == [(1, [1])]
+        assert time.time() - start < 1
+        # the stalled connection is dropped after its deadline
+        assert stream.receive(3) == []
+        assert stream._connections == {}
+        stalled.close()
+    finally:
+        stream.close()
+
+
+def test_sqlite_job_db(tmpdir):
+    job_db = SQLiteJobDB(str(tmpdir))
+    job_db.create(4)
+    job_db.start(1)
+    job_db.finish(1)
+    job_db.start(3)
+    assert job_db.progress() == {"pending": 2, "started": 1, "finished": 1}
+    assert job_db.pending(1) == [2, 3, 4]
+    assert [job_db.wait_for_job(ID, 1) for ID in range(1, 5)] \
+        == [False, True, True, True]
+    # started jobs time out
+    assert job_db.pending(0) == [2, 4]
+    assert not job_db.wait_for_job(3, 0)
+
+
+def square(x):
+    if x == 3:
+        raise ValueError("three")
+    return x ** 2
+
+
+@pytest.mark.parametrize("result_stream", ["file", "socket"])
+def test_local_sge(result_stream, tmpdir, monkeypatch):
+    home = tmpdir.mkdir("home")
+    home.join(".parallel").write("[BROKER]\nTYPE=SQLITE\n")
+    monkeypatch.setenv("HOME", str(home))
+    sge = LocalSGE(n_procs=2, tmp_directory=str(tmpdir.mkdir("jobs")),
+                   chunk_size=2, result_stream=result_stream)
+    results = sge.map(square, range(7))
+    assert results[:3] == [0, 1, 4]
+    assert isinstance(results[3], ValueError)
+    assert results[4:] == [16, 25, 36]
+    # the job directory is removed after success
+    assert os.listdir(sge.config["DIRECTORIES"]["TMP"]) == []
+
+
+def test_local_sge_failing_task(tmpdir, monkeypatch):
+    home = tmpdir.mkdir("home")
+    home.join(".parallel").write("[BROKER]\nTYPE=SQLITE\n")
+    monkeypatch.setenv("HOME", str(home))
+    sge = LocalSGE(n_procs=2, tmp_directory=str(tmpdir.mkdir("jobs")))
+    sge.STATUS_CHECK_INTERVAL = 1
+    # the results cannot be sent, so the tasks fail outside of the function
+    start = time.time()
+    results = sge.map(lambda x: threading.Lock(), range(2))
+    assert time.time() - start < 30
+    assert len(results) == 2
+    assert all("No result received" in str(result) for result in results)
@@ -1,12 +1,18 @@
-from pyabc.transition import NotEnoughParticles, LocalTransition, Transition
+from pyabc.transition import (NotEnoughParticles, LocalTransition, Transition,
+                              scott_rule_of_thumb, silverman_rule_of_thumb)
 from pyabc import MultivariateNormalTransition
 import pandas as pd
 import numpy as np
 import pytest
-from pyabc import GridSearchCV
+from pyabc import GridSearchCV, DiscreteRandomWalkTransition
+from pyabc import GaussianMixtureTransition
+from pyabc.weighted_statistics import WeightedMoments
+from pyabc.transition.randomwalk import (
+    calculate_single_random_walk_probability)
 
 
-@pytest.fixture(params=[LocalTransition, MultivariateNormalTransition])
+@pytest.fixture(params=[LocalTransition, MultivariateNormalTransition,
+                        GaussianMixtureTransition])
 def transition(request):
     return request.param()
 
@@ -39,6 +45,17 @@ def test_pdf_return_types(transition: Transition):
     assert multiple.shape == (20,)
 
 
+def test_logpdf(transition: Transition):
+    df, w = data(20)
+    transition.fit(df, w)
+    single = transition.logpdf(df.iloc[0])
+    assert isinstance(single, float)
+    assert np.isclose(single, np.log(transition.pdf(df.iloc[0])))
+    assert np.allclose(transition.logpdf(df), np.log(transition.pdf(df)))
+    # far outside the support, the log-density does not underflow
+    assert np.isfinite(transition.logpdf(df.iloc[0] + 100))
+
+
 def test_many_particles_single_par(transition: Transition):
     df, w = data_single(20)
     transition.fit(df, w)
@@ -201,3 +218,155 @@ def test_mean_coefficient_of_variation_sample_not_full_rank(
     w = np.ones(len(df)) / len(df)
     transition.fit(df, w)
     transition.mean_cv()
+
+
+def test_rvs_size_return_type(transition: Transition):
+    df, w = data(20)
+    transition.fit(df, w)
+    samples = transition.rvs(size=10)
+    assert isinstance(samples, pd.DataFrame)
+    assert samples.shape == (10, 2)
+    assert (samples.columns == pd.Index(["a", "b"])).all()
+
+
+def test_rvs_array(transition: Transition):
+    df, w = data(20)
+    transition.fit(df, w)
+    samples = transition.rvs_array(15)
+    assert isinstance(samples, np.ndarray)
+    assert samples.shape == (15, 2)
+
+
+def test_rvs_array_no_parameters(transition: Transition):
+    df = pd.DataFrame(index=[0, 1, 2, 3])
+    w = np.array([1, 1, 1, 1]) / 4
+    transition.fit(df, w)
+    assert transition.rvs_array(5).shape == (5, 0)
+    assert transition.rvs(size=5).shape == (5, 0)
+
+
+def test_discrete_random_walk_rvs():
+    df = pd.DataFrame({"a": [0, 2, 5], "b": [1, 1, 3]})
+    w = np.array([.2, .3, .5])
+    transition = DiscreteRandomWalkTransition(n_steps=2)
+    transition.fit(df, w)
+    samples = transition.rvs(size=100)
+    assert samples.shape == (100, 2)
+    assert (samples.columns == pd.Index(["a", "b"])).all()
+    assert np.allclose(samples.values, samples.values.astype(int))
+    # all samples are reachable from some support point
+    assert (transition.pdf(samples) > 0).all()
+
+
+def test_discrete_random_walk_pdf():
+    df = pd.DataFrame({"a": [0, 2, 5, 5], "b": [1, 1, 3, -2]})
+    w = np.array([.1, .2, .3, .4])
+    transition = DiscreteRandomWalkTransition(
+        n_steps=3, p_l=.2, p_r=.5, p_c=.3)
+    transition.fit(df, w)
+    x = pd.DataFrame({"a": [0, 1, 4, 8, 20], "b": [0, 3, 1, 0, 1]})
+
+    # compare to explicit summation over the support points
+    expected = np.array([
+        sum(weight * calculate_single_random_walk_probability(
+                start, x_, 3, p_l=.2, p_r=.5, p_c=.3)
+            for start, weight in zip(df.values, w))
+        for x_ in x.values])
+    assert np.allclose(transition.pdf(x), expected)
+    assert np.isclose(transition.pdf(x.iloc[1]), expected[1])
+    assert transition.pdf(x.iloc[4]) == 0
+
+    # normalization over a grid covering all reachable points
+    grid = np.array(np.meshgrid(np.arange(-4, 10), np.arange(-6, 8)))
+    grid = pd.DataFrame(grid.reshape(2, -1).T, columns=["a", "b"])
+    assert np.isclose(transition.pdf(grid).sum(), 1)
+
+
+def test_grid_search_scaling_shared_distances():
+    """
+    The scaling search reusing the distance computations should give the
+    same scores as refitting the transition for each scaling.
+    """
+    df, w = data(30)
+    scalings = np.logspace(-2, 0.5, 6)
+    m_grid = GridSearchCV(MultivariateNormalTransition(),
+                          {"scaling": scalings}, cv=3, n_jobs=1)
+    m_grid.fit(df, w)
+
+    splits = np.array_split(np.arange(len(df)), 3)
+    for k, scaling in enumerate(scalings):
+        scores = []
+        for test in splits:
+            train = np.setdiff1d(np.arange(len(df)), test)
+            m = MultivariateNormalTransition(scaling=scaling)
+            m.fit(df.iloc[train], w[train].copy())
+            scores.append(m.score(df.iloc[test], w[test]))
+        assert np.isclose(m_grid.cv_results_["mean_test_score"][k],
+                          np.mean(scores))
+    assert m_grid.best_params_["scaling"] == scalings[
+        np.argmax(m_grid.cv_results_["mean_test_score"])]
+    assert m_grid.best_estimator_.scaling == m_grid.best_params_["scaling"]
+
+
+def test_grid_search_warm_start():
+    scalings = np.logspace(-3, 1, 9)
+    m_grid = GridSearchCV(MultivariateNormalTransition(),
+                          {"scaling": scalings}, n_jobs=1, warm_start=1)
+    df, w = data(50)
+    m_grid.fit(df, w)
+    assert len(m_grid.cv_results_["params"]) == 9
+    best = m_grid.best_params_["scaling"]
+
+    m_grid.fit(df, w)
+    evaluated = [p["scaling"] for p in m_grid.cv_results_["params"]]
+    assert best in evaluated
+    assert 2 <= len(evaluated) <= 3
+    assert len(m_grid.param_grid["scaling"]) == 9
+
+
+def test_multivariate_normal_fit_from_moments():
+    df, w = data(30)
+    moments = WeightedMoments()
+    for _, row in df[["b", "a"]].iterrows():
+        moments.update(dict(row), 1.)
+
+    with_moments = MultivariateNormalTransition()
+    with_moments.fit(df, w, moments=moments)
+    without_moments = MultivariateNormalTransition()
+    without_moments.fit(df, w)
+    assert np.allclose(with_moments.cov, without_moments.cov)
+
+
+def test_gaussian_mixture_components():
+    # two well separated clusters
+    df = pd.DataFrame({"a": np.concatenate([np.random.normal(-5, .5, 200),
+                                            np.random.normal(5, .5, 200)]),
+                       "b": np.random.normal(0, 1, 400)})
+    w = np.ones(len(df)) / len(df)
+    transition = GaussianMixtureTransition(max_components=4)
+    transition.fit(df, w)
+    assert transition.n_components_ >= 2
+    assert transition.pdf(pd.Series({"a": 5, "b": 0})) \
+        > 10 * transition.pdf(pd.Series({"a": 0, "b": 0}))
+
+    transition = GaussianMixtureTransition(n_components=3)
+    transition.fit(df, w)
+    assert transition.n_components_ == 3
+    assert np.isclose(transition.weights_.sum(), 1)
+    samples = transition.rvs(size=1000)
+    assert (np.abs(samples.a) > 2).mean() > .9
+
+
+def test_grid_search_warm_start_non_numeric():
+    scalings = np.logspace(-3, 1, 9)
+    selectors = [silverman_rule_of_thumb, scott_rule_of_thumb]
+    m_grid = GridSearchCV(MultivariateNormalTransition(),
+                          {"scaling": scalings,
+                           "bandwidth_selector": selectors},
+                          n_jobs=1, warm_start=1)
+    df, w = data(50)
+    m_grid.fit(df, w)
+    m_grid.fit(df, w)
+    evaluated = m_grid.cv_results_["params"]
+    assert {p["bandwidth_selector"] for p in evaluated} == set(selectors)
+    assert 2 <= len({p["scaling"] for p in evaluated}) <= 3
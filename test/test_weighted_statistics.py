@@ -37,3 +37,60 @@ def test_weighted_std():
     std_ = np.sqrt(np.sum(weights * (points - m_)**2))
 
     assert std == std_
+
+
+def test_weighted_moments():
+    X = np.random.randn(50, 3)
+    w = np.random.rand(50)
+    cov = np.cov(X, aweights=w, rowvar=False)
+    mean = (X * w[:, None]).sum(axis=0) / w.sum()
+
+    # single updates
+    moments = ws.WeightedMoments()
+    for x, weight in zip(X, w):
+        moments.update(x, weight)
+    assert np.allclose(moments.mean, mean)
+    assert np.allclose(moments.cov(), cov)
+    assert np.isclose(moments.eff_sample_size, w.sum()**2 / (w**2).sum())
+
+    # merged batches
+    moments_1 = ws.WeightedMoments()
+    moments_1.update_batch(X[:20], w[:20])
+    moments_2 = ws.WeightedMoments()
+    moments_2.update_batch(X[20:], w[20:])
+    merged = moments_1 + moments_2
+    assert merged.n == 50
+    assert np.allclose(merged.mean, mean)
+    assert np.allclose(merged.cov(), cov)
+
+
+def test_weighted_moments_keys():
+    moments = ws.WeightedMoments()
+    points = [{"b": 1., "a": 3.}, {"a": 2., "b": 5.}, {"b": 0., "a": 0.}]
+    for point in points:
+        moments.update(point)
+    assert moments.keys == ["a", "b"]
+    X = np.array([[p["b"], p["a"]] for p in points])
+    assert np.allclose(moments.cov(keys=["b", "a"]),
+                       np.cov(X, rowvar=False))
+
+
+def test_weighted_quantile_sketch():
+    X = np.random.randn(5000)
+    w = np.random.rand(5000)
+
+    sketch_1 = ws.WeightedQuantileSketch(max_size=200)
+    for x, weight in zip(X[:1000], w[:1000]):
+        sketch_1.update(x, weight)
+    sketch_2 = ws.WeightedQuantileSketch(max_size=200)
+    sketch_2.update_batch(X[1000:], w[1000:])
+    sketch = sketch_1 + sketch_2
+
+    assert sketch.n == 5000
+    assert len(sketch.points) <= 200
+    assert np.isclose(sketch.sum_weights, w.sum())
+    assert np.isclose((sketch.points * sketch.weights).sum(), (X * w).sum())
+    for alpha in [0.1, 0.5, 0.9]:
+        assert np.isclose(sketch.quantile(alpha),
+                          ws.weighted_quantile(X, w / w.sum(), alpha=alpha),
+                          atol=0.05)
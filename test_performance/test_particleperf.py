@@ -0,0 +1,148 @@
+import pickle
+import time
+from collections import UserDict
+
+import numpy as np
+
+from pyabc import Parameter
+from pyabc.population import Particle
+
+
+N_PARTICLES = 20000
+
+
+class LegacyParameter(UserDict):
+    """
+    The parameter before it became a dict subclass: a UserDict, which
+    always flattens its values.
+    """
+
+    @staticmethod
+    def flatten_dict(dict_: dict):
+        new_dict = {}
+        for key, value in dict_.items():
+            if isinstance(value, dict):
+                flattened = LegacyParameter.flatten_dict(value)
+                for key_flat, value_flat in flattened.items():
+                    new_dict.update({str(key) + "." + key_flat: value_flat})
+            else:
+                new_dict.update({key: value})
+        return new_dict
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > 0:
+            flattened = LegacyParameter.flatten_dict(args[0])
+        else:
+            flattened = LegacyParameter.flatten_dict(kwargs)
+        super().__init__(flattened)
+
+    def __add__(self, other):
+        return LegacyParameter(**{key: self[key] + other[key]
+                                  for key in self})
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state):
+        self.data = state
+
+    def copy(self):
+        return LegacyParameter(**self)
+
+
+class LegacyParticle:
+    """
+    The particle before it had slots, pickled with its instance
+    dictionary.
+    """
+
+    def __init__(self, m, parameter, weight, accepted_sum_stats,
+                 accepted_distances, rejected_sum_stats=None,
+                 rejected_distances=None, accepted=True):
+        self.m = m
+        self.parameter = parameter
+        self.weight = weight
+        self.accepted_sum_stats = accepted_sum_stats
+        self.accepted_distances = accepted_distances
+        self.rejected_sum_stats = rejected_sum_stats or []
+        self.rejected_distances = rejected_distances or []
+        self.accepted = accepted
+
+
+def create_particles(n_particles: int, particle_class=Particle,
+                     parameter_class=Parameter):
+    values = np.random.randn(n_particles, 3).tolist()
+    return [particle_class(m=0,
+                           parameter=parameter_class({"a": a, "b": b, "c": c}),
+                           weight=1.,
+                           accepted_sum_stats=[{"y": a + b}],
+                           accepted_distances=[abs(c)])
+            for a, b, c in values]
+
+
+def measure_particles(n_particles: int = N_PARTICLES,
+                      particle_class=Particle, parameter_class=Parameter):
+    """
+    Measure the number of particles created per second, and the number of
+    bytes per particle when pickled one by one, as done when sending them
+    back from the workers.
+
+    Returns
+    -------
+
+    objects_per_second, bytes_per_particle: float, float
+    """
+    start = time.perf_counter()
+    particles = create_particles(n_particles, particle_class,
+                                 parameter_class)
+    objects_per_second = n_particles / (time.perf_counter() - start)
+
+    pickled = [pickle.dumps(particle) for particle in particles]
+    bytes_per_particle = sum(map(len, pickled)) / n_particles
+
+    loaded = [pickle.loads(string) for string in pickled]
+    assert loaded[0].parameter == particles[0].parameter
+    return objects_per_second, bytes_per_particle
+
+
+def test_particle_creation_and_pickling():
+    objects_per_second, bytes_per_particle = measure_particles()
+    print(f"\n{objects_per_second:.0f} particles/s, "
+          f"{bytes_per_particle:.0f} bytes per pickled particle")
+
+
+def measure_parameter_operations(parameter_class=Parameter):
+    """
+    Measure the number of parameter additions and copies per second, as
+    done when perturbing parameters.
+    """
+    parameters = [parameter_class({"a": a, "b": b})
+                  for a, b in np.random.randn(N_PARTICLES, 2).tolist()]
+    start = time.perf_counter()
+    for parameter in parameters:
+        (parameter + parameter).copy()
+    return N_PARTICLES / (time.perf_counter() - start)
+
+
+def test_parameter_operations():
+    operations_per_second = measure_parameter_operations()
+    print(f"\n{operations_per_second:.0f} parameter additions and copies/s")
+
+
+def test_compare_legacy_particles():
+    """
+    Compare to the UserDict parameter and the particle with an instance
+    dictionary they replaced.
+    """
+    before = measure_particles(particle_class=LegacyParticle,
+                               parameter_class=LegacyParameter)
+    after = measure_particles()
+    operations_before = measure_parameter_operations(LegacyParameter)
+    operations_after = measure_parameter_operations()
+    print(f"\nparticle creation: {before[0]:.0f}/s before, "
+          f"{after[0]:.0f}/s after"
+          f"\npickled particle size: {before[1]:.0f} B before, "
+          f"{after[1]:.0f} B after"
+          f"\nparameter add/copy: {operations_before:.0f}/s before, "
+          f"{operations_after:.0f}/s after")
+    assert after[1] < before[1]
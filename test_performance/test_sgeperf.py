@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+import pytest
+
+from pyabc import (ABCSMC, RV, Distribution, PNormDistance,
+                   ConstantPopulationSize)
+from pyabc.sampler import MappingSampler, MulticoreEvalParallelSampler
+from pyabc.sge import LocalSGE
+
+
+N_PROCS = 2
+POPULATION_SIZE = 100
+N_POPULATIONS = 3
+
+
+def model(parameter):
+    return {"y": parameter["x"] + .1 * np.random.randn()}
+
+
+@pytest.fixture
+def sqlite_broker(tmpdir, monkeypatch):
+    # the local mapper should not depend on a Redis server
+    home = tmpdir.mkdir("home")
+    home.join(".parallel").write("[BROKER]\nTYPE=SQLITE\n")
+    monkeypatch.setenv("HOME", str(home))
+    return str(tmpdir.mkdir("jobs"))
+
+
+def measure_run(sampler, db_path):
+    """
+    Measure the wall time per population of a short ABC-SMC run.
+    """
+    abc = ABCSMC(model, Distribution(x=RV("uniform", -1, 2)),
+                 PNormDistance(),
+                 ConstantPopulationSize(POPULATION_SIZE), sampler=sampler)
+    abc.new(db_path, {"y": .5})
+    start = time.perf_counter()
+    abc.run(0, max_nr_populations=N_POPULATIONS)
+    return (time.perf_counter() - start) / N_POPULATIONS
+
+
+@pytest.mark.parametrize("result_stream", ["file", "socket"])
+def test_local_sge_overhead(sqlite_broker, tmpdir, result_stream):
+    db_path = "sqlite:///" + str(tmpdir.join("abc.db"))
+    multicore = measure_run(MulticoreEvalParallelSampler(N_PROCS), db_path)
+    for acceptances_per_task in [1, 10]:
+        sge = LocalSGE(n_procs=N_PROCS, tmp_directory=sqlite_broker,
+                       result_stream=result_stream)
+        sampler = MappingSampler(
+            sge.map, acceptances_per_task=acceptances_per_task)
+        local_sge = measure_run(sampler, db_path)
+        print(f"\n{result_stream}, {acceptances_per_task} acceptances per "
+              f"task: {local_sge:.2f} s per population with LocalSGE, "
+              f"{multicore:.2f} s with MulticoreEvalParallelSampler")
+
+
+def test_local_sge_map_overhead(sqlite_broker):
+    sge = LocalSGE(n_procs=N_PROCS, tmp_directory=sqlite_broker)
+    for chunk_size in [1, 10]:
+        sge.chunk_size = chunk_size
+        start = time.perf_counter()
+        results = sge.map(abs, range(-500, 0))
+        seconds_per_element = (time.perf_counter() - start) / len(results)
+        assert results == list(range(500, 0, -1))
+        print(f"\nchunk size {chunk_size}: "
+              f"{1000 * seconds_per_element:.2f} ms per element")